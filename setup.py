@@ -73,6 +73,9 @@ setup(
             "docker>=5.0",
             "docker-compose>=1.29",
         ],
+        "async": [
+            "aiohttp>=3.8",
+        ],
         "all": [
             "pytest>=6.0",
             "pytest-cov>=2.0",
@@ -83,6 +86,7 @@ setup(
             "pre-commit>=2.0",
             "docker>=5.0",
             "docker-compose>=1.29",
+            "aiohttp>=3.8",
         ]
     },
     entry_points={
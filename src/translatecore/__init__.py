@@ -18,6 +18,11 @@ Author: Emil Rokossovskiy
 License: MIT
 """
 
+import logging
+
+# The library stays quiet until the application configures the 'translatecore' logger
+logging.getLogger(__name__).addHandler(logging.NullHandler())
+
 from .enhanced_translator import EnhancedTranslator
 from .offline_translator import OfflineTranslator
 from .config_loader import APIConfigLoader
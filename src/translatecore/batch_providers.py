@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Пакетные запросы к сервисам перевода
+Сервисы, принимающие несколько текстов за один запрос (LibreTranslate, DeepL, Microsoft),
+переводят промахи кеша пачками в пределах своих ограничений на размер запроса.
+Microsoft также переводит текст сразу на несколько языков одним запросом.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+import requests
+
+
+@dataclass
+class BatchLimits:
+    """Ограничения одного пакетного запроса"""
+    max_items: int = 50      # Текстов в запросе
+    max_chars: int = 10000   # Символов во всех текстах запроса
+
+
+# Ограничения по умолчанию (переопределяются 'batch_size' и 'batch_chars' в service_settings)
+DEFAULT_BATCH_LIMITS: Dict[str, BatchLimits] = {
+    'libre': BatchLimits(max_items=100, max_chars=10000),
+    'deepl': BatchLimits(max_items=50, max_chars=100000),
+    'microsoft': BatchLimits(max_items=1000, max_chars=50000),
+    'offline': BatchLimits(max_items=100, max_chars=10000),
+}
+
+REQUEST_TIMEOUT = 30
+
+
+def split_batches(texts: List[str], limits: BatchLimits) -> List[List[int]]:
+    """
+    Делит тексты на пачки в пределах ограничений
+
+    Текст длиннее max_chars уходит отдельной пачкой.
+
+    Returns:
+        List[List[int]]: Индексы текстов каждой пачки
+    """
+    batches: List[List[int]] = []
+    current: List[int] = []
+    chars = 0
+    for i, text in enumerate(texts):
+        if current and (len(current) >= limits.max_items or chars + len(text) > limits.max_chars):
+            batches.append(current)
+            current, chars = [], 0
+        current.append(i)
+        chars += len(text)
+    if current:
+        batches.append(current)
+    return batches
+
+
+def _check_response(response: requests.Response, service: str):
+    if response.status_code != 200:
+        raise requests.HTTPError(f"{service}: пакетный запрос вернул {response.status_code}", response=response)
+
+
+def libre_translate_batch(translator: Any, texts: List[str]) -> List[str]:
+    """LibreTranslate: поле 'q' принимает список текстов"""
+    payload = {'q': texts, 'source': translator._source, 'target': translator._target, 'format': 'text'}
+    if getattr(translator, 'api_key', None):
+        payload['api_key'] = translator.api_key
+    response = requests.post(translator._base_url + 'translate', json=payload, timeout=REQUEST_TIMEOUT)
+    _check_response(response, 'libre')
+    return response.json()['translatedText']
+
+
+def deepl_translate_batch(translator: Any, texts: List[str]) -> List[str]:
+    """DeepL: несколько параметров 'text' в одном запросе"""
+    data = [('source_lang', translator._source), ('target_lang', translator._target)]
+    data.extend(('text', text) for text in texts)
+    response = requests.post(
+        translator._base_url + 'translate',
+        data=data,
+        headers={'Authorization': f"DeepL-Auth-Key {translator.api_key}"},
+        timeout=REQUEST_TIMEOUT
+    )
+    _check_response(response, 'deepl')
+    return [item['text'] for item in response.json()['translations']]
+
+
+def microsoft_translate_batch(translator: Any, texts: List[str]) -> List[str]:
+    """Microsoft Translator: тело запроса - массив текстов"""
+    params = dict(translator._url_params)
+    params.update({'from': translator._source, 'to': translator._target})
+    response = requests.post(
+        translator._base_url,
+        params=params,
+        headers=translator.headers,
+        json=[{'text': text} for text in texts],
+        proxies=translator.proxies,
+        timeout=REQUEST_TIMEOUT
+    )
+    _check_response(response, 'microsoft')
+    return ['\n'.join(t['text'] for t in item['translations']) for item in response.json()]
+
+
+def microsoft_translate_multi(translator: Any, text: str, targets: List[str]) -> Dict[str, str]:
+    """
+    Microsoft Translator: несколько параметров 'to' в одном запросе
+
+    Args:
+        translator: Переводчик deep-translator (задает исходный язык и ключ)
+        text: Текст для перевода
+        targets: Коды целевых языков Microsoft
+
+    Returns:
+        Dict[str, str]: Переводы по кодам целевых языков
+    """
+    params = [(name, value) for name, value in translator._url_params.items() if name not in ('from', 'to')]
+    params.append(('from', translator._source))
+    params.extend(('to', target) for target in targets)
+    response = requests.post(
+        translator._base_url,
+        params=params,
+        headers=translator.headers,
+        json=[{'text': text}],
+        proxies=translator.proxies,
+        timeout=REQUEST_TIMEOUT
+    )
+    _check_response(response, 'microsoft')
+    # Сервис возвращает коды в своем регистре (zh-Hans), ключи результата - запрошенные коды
+    requested = {target.lower(): target for target in targets}
+    return {requested.get(item['to'].lower(), item['to']): item['text']
+            for item in response.json()[0]['translations']}
+
+
+# Сервисы, переводящие текст на несколько языков одним запросом
+NATIVE_MULTI_TARGET_TRANSLATORS: Dict[str, Callable[[Any, str, List[str]], Dict[str, str]]] = {
+    'microsoft': microsoft_translate_multi,
+}
+
+
+NATIVE_BATCH_TRANSLATORS: Dict[str, Callable[[Any, List[str]], List[str]]] = {
+    'libre': libre_translate_batch,
+    'deepl': deepl_translate_batch,
+    'microsoft': microsoft_translate_batch,
+}
+
+
+def get_batch_limits(service: str, settings: Optional[Dict[str, Any]] = None) -> BatchLimits:
+    """Ограничения пакета сервиса с учетом 'batch_size' и 'batch_chars' из настроек"""
+    limits = DEFAULT_BATCH_LIMITS.get(service, BatchLimits())
+    settings = settings or {}
+    return BatchLimits(
+        max_items=max(1, int(settings.get('batch_size', limits.max_items))),
+        max_chars=max(1, int(settings.get('batch_chars', limits.max_chars)))
+    )
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Переносимые пакеты (bundles) кеша переводов
+Экспорт записей общего хранилища с фильтрами и слияние пакетов с разрешением конфликтов
+"""
+
+import gzip
+import json
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, IO, Iterable, Iterator, List, Optional, Tuple
+
+try:
+    from .cache_store import CacheStore, unpack_value
+except ImportError:
+    from cache_store import CacheStore, unpack_value
+
+
+BUNDLE_FORMAT = 'translatecore-cache-bundle'
+BUNDLE_VERSION = 1
+
+# Стратегии разрешения конфликтов при импорте
+CONFLICT_STRATEGIES = ('confidence', 'priority', 'newer', 'keep', 'replace')
+
+
+@dataclass
+class BundleFilter:
+    """Фильтр записей при экспорте"""
+    source_lang: Optional[str] = None
+    target_lang: Optional[str] = None
+    namespace: Optional[str] = None
+    services: Optional[List[str]] = None  # Сервисы ('google' включает 'google' и 'google_*')
+    max_age: Optional[float] = None       # Максимальный возраст записи в секундах
+
+    def matches(self, key: str, value: Any, now: float) -> bool:
+        parts = split_cache_key(key)
+        if parts is None:
+            return False
+        namespace, source_lang, target_lang = parts
+        if self.namespace and namespace != self.namespace:
+            return False
+        if self.source_lang and source_lang != self.source_lang:
+            return False
+        if self.target_lang and target_lang != self.target_lang:
+            return False
+
+        if self.services is None and self.max_age is None:
+            return True
+
+        record = unpack_value(value)
+        if self.services is not None:
+            service = record.get('service', 'unknown')
+            if service not in self.services and service.split('_')[0] not in self.services:
+                return False
+        if self.max_age is not None:
+            # Записи без времени создания нельзя считать свежими
+            created = record.get('created')
+            if created is None or now - created > self.max_age:
+                return False
+        return True
+
+
+def split_cache_key(key: str) -> Optional[Tuple[str, str, str]]:
+    """Разбирает ключ общего кеша на (пространство имен, исходный язык, целевой язык)"""
+    parts = key.split('|', 3)
+    if len(parts) != 4:
+        return None
+    return parts[0], parts[1], parts[2]
+
+
+def _open_bundle(path: Path, mode: str) -> IO[str]:
+    if path.suffix == '.gz':
+        return gzip.open(path, mode + 't', encoding='utf-8')
+    return open(path, mode, encoding='utf-8')
+
+
+def write_bundle(entries: Iterable[Tuple[str, Any]], path: str) -> int:
+    """
+    Записывает пакет кеша (JSON Lines, сжатый gzip для файлов *.gz)
+
+    Returns:
+        int: Количество записанных записей
+    """
+    path = Path(path)
+    count = 0
+    with _open_bundle(path, 'w') as f:
+        header = {'format': BUNDLE_FORMAT, 'version': BUNDLE_VERSION, 'created': time.time()}
+        f.write(json.dumps(header) + '\n')
+        for key, value in entries:
+            f.write(json.dumps({'k': key, 'v': value}, ensure_ascii=False, separators=(',', ':')) + '\n')
+            count += 1
+    return count
+
+
+def read_bundle(path: str) -> Iterator[Tuple[str, Any]]:
+    """Читает записи пакета кеша"""
+    path = Path(path)
+    with _open_bundle(path, 'r') as f:
+        header = json.loads(f.readline() or '{}')
+        if header.get('format') != BUNDLE_FORMAT:
+            raise ValueError(f"{path} не является пакетом кеша TranslateCore")
+        if header.get('version', 0) > BUNDLE_VERSION:
+            raise ValueError(f"Неподдерживаемая версия пакета кеша: {header.get('version')}")
+        for line in f:
+            if line.strip():
+                record = json.loads(line)
+                yield record['k'], record['v']
+
+
+def export_bundle(store: CacheStore, path: str, bundle_filter: Optional[BundleFilter] = None) -> int:
+    """
+    Экспортирует записи хранилища в пакет
+
+    Args:
+        store: Хранилище кеша
+        path: Файл пакета
+        bundle_filter: Фильтр по паре языков, сервису и возрасту
+
+    Returns:
+        int: Количество экспортированных записей
+    """
+    bundle_filter = bundle_filter or BundleFilter()
+    prefix = ''
+    if bundle_filter.namespace and bundle_filter.source_lang and bundle_filter.target_lang:
+        prefix = f"{bundle_filter.namespace}|{bundle_filter.source_lang}|{bundle_filter.target_lang}|"
+
+    now = time.time()
+    return write_bundle(
+        ((key, value) for key, value in store.items(prefix) if bundle_filter.matches(key, value, now)),
+        path
+    )
+
+
+def prefer_incoming(existing: Any, incoming: Any, strategy: str = 'confidence',
+                    service_priority: Optional[Dict[str, int]] = None) -> bool:
+    """
+    Решает, заменить ли существующую запись входящей
+
+    Args:
+        existing: Значение в хранилище
+        incoming: Значение из пакета
+        strategy: 'confidence' - выше уверенность, 'priority' - приоритетнее сервис
+                  (меньшее число в service_priority), 'newer' - новее запись,
+                  'keep' - оставить существующую, 'replace' - взять из пакета
+        service_priority: Приоритеты сервисов для стратегии 'priority'
+
+    Returns:
+        bool: True, если нужно взять входящую запись (при равенстве остается существующая)
+    """
+    if strategy not in CONFLICT_STRATEGIES:
+        raise ValueError(f"Неизвестная стратегия разрешения конфликтов: {strategy}")
+    if strategy == 'keep':
+        return False
+    if strategy == 'replace':
+        return True
+
+    old, new = unpack_value(existing), unpack_value(incoming)
+    if strategy == 'confidence':
+        return new.get('confidence', 0.0) > old.get('confidence', 0.0)
+    if strategy == 'newer':
+        return new.get('created', 0) > old.get('created', 0)
+
+    priority = service_priority or {}
+    lowest = max(priority.values(), default=0) + 1
+
+    def rank(record: Dict[str, Any]) -> int:
+        service = record.get('service', 'unknown')
+        return priority.get(service, priority.get(service.split('_')[0], lowest))
+
+    return rank(new) < rank(old)
+
+
+def import_bundles(store: CacheStore, paths: Iterable[str], strategy: str = 'confidence',
+                   service_priority: Optional[Dict[str, int]] = None,
+                   batch_size: int = 1000) -> Dict[str, int]:
+    """
+    Сливает пакеты кеша в хранилище
+
+    Args:
+        store: Хранилище кеша
+        paths: Файлы пакетов (применяются по порядку)
+        strategy: Стратегия разрешения конфликтов (см. prefer_incoming)
+        service_priority: Приоритеты сервисов для стратегии 'priority'
+        batch_size: Размер пачки записей для set_many
+
+    Returns:
+        Dict[str, int]: Счетчики 'added', 'replaced', 'kept'
+    """
+    if strategy not in CONFLICT_STRATEGIES:
+        raise ValueError(f"Неизвестная стратегия разрешения конфликтов: {strategy}")
+
+    counters = {'added': 0, 'replaced': 0, 'kept': 0}
+    # Записи, уже выбранные в этом импорте, сравниваются между собой до записи в хранилище
+    batch: Dict[str, Any] = {}
+
+    for path in paths:
+        for key, value in read_bundle(path):
+            existing = batch.get(key)
+            if existing is None:
+                existing = store.get(key)
+            if existing is None:
+                counters['added'] += 1
+            elif prefer_incoming(existing, value, strategy, service_priority):
+                counters['replaced'] += 1
+            else:
+                counters['kept'] += 1
+                continue
+
+            batch[key] = value
+            if len(batch) >= batch_size:
+                store.set_many(batch.items())
+                batch.clear()
+
+    if batch:
+        store.set_many(batch.items())
+    store.flush()
+    return counters
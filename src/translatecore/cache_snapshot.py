@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Бинарные снапшоты кеша переводов только для чтения
+Файл отображается в память (mmap) и читается по мере обращения, без загрузки всего кеша.
+Несколько рабочих процессов разделяют одну копию файла в страничном кеше ОС.
+
+Формат файла:
+    заголовок   - магия, версия, число записей, смещения индекса и кучи строк
+    индекс      - отсортированный по 64-битному хешу ключа массив записей
+                  (хеш, смещение в куче, длина ключа, длина значения)
+    куча строк  - ключ в UTF-8, за ним значение в JSON (UTF-8)
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import struct
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple
+
+
+SNAPSHOT_MAGIC = b'TCSNAP01'
+SNAPSHOT_VERSION = 1
+
+_HEADER = struct.Struct('<8sIIQQ')   # магия, версия, число записей, смещение индекса, смещение кучи
+_ENTRY = struct.Struct('<QQII')      # хеш ключа, смещение в куче, длина ключа, длина значения
+
+
+def _key_hash(key: str) -> int:
+    return int.from_bytes(hashlib.blake2b(key.encode('utf-8'), digest_size=8).digest(), 'little')
+
+
+def compile_snapshot(entries: Iterable[Tuple[str, Any]], path: str) -> int:
+    """
+    Компилирует записи кеша в файл снапшота (атомарно)
+
+    Args:
+        entries: Пары (ключ, значение), значения должны сериализоваться в JSON
+        path: Путь к файлу снапшота
+
+    Returns:
+        int: Количество записанных записей
+    """
+    path = Path(path)
+    records = []
+    heap = bytearray()
+    for key, value in entries:
+        key_bytes = key.encode('utf-8')
+        value_bytes = json.dumps(value, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        records.append((_key_hash(key), len(heap), len(key_bytes), len(value_bytes)))
+        heap += key_bytes
+        heap += value_bytes
+    records.sort()
+
+    index_offset = _HEADER.size
+    heap_offset = index_offset + _ENTRY.size * len(records)
+
+    fd, tmp_path = tempfile.mkstemp(prefix=f".{path.name}.", suffix='.tmp', dir=str(path.parent))
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, len(records), index_offset, heap_offset))
+            for record in records:
+                f.write(_ENTRY.pack(*record))
+            f.write(heap)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+    return len(records)
+
+
+class CacheSnapshot:
+    """Снапшот кеша, отображенный в память, с поиском по хеш-индексу"""
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        with open(self.path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            if size < _HEADER.size:
+                raise ValueError(f"Файл снапшота поврежден: {self.path}")
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, count, index_offset, heap_offset = _HEADER.unpack_from(self._mm, 0)
+        if magic != SNAPSHOT_MAGIC or version != SNAPSHOT_VERSION:
+            self._mm.close()
+            raise ValueError(f"Неподдерживаемый формат снапшота: {self.path}")
+
+        self._count = count
+        self._index_offset = index_offset
+        self._heap_offset = heap_offset
+
+    def _entry(self, position: int) -> Tuple[int, int, int, int]:
+        return _ENTRY.unpack_from(self._mm, self._index_offset + position * _ENTRY.size)
+
+    def _lower_bound(self, key_hash: int) -> int:
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            if self._entry(middle)[0] < key_hash:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def get(self, key: str) -> Optional[Any]:
+        """Возвращает значение по ключу или None"""
+        key_hash = _key_hash(key)
+        key_bytes = key.encode('utf-8')
+        position = self._lower_bound(key_hash)
+
+        # Несколько ключей могут иметь одинаковый хеш - сравниваем сами ключи
+        while position < self._count:
+            entry_hash, offset, key_len, value_len = self._entry(position)
+            if entry_hash != key_hash:
+                break
+            start = self._heap_offset + offset
+            if key_len == len(key_bytes) and self._mm[start:start + key_len] == key_bytes:
+                return json.loads(self._mm[start + key_len:start + key_len + value_len])
+            position += 1
+        return None
+
+    def items(self, prefix: str = '') -> Iterator[Tuple[str, Any]]:
+        """Перебирает записи снапшота (только ключи с указанным префиксом)"""
+        for position in range(self._count):
+            _, offset, key_len, value_len = self._entry(position)
+            start = self._heap_offset + offset
+            key = self._mm[start:start + key_len].decode('utf-8')
+            if key.startswith(prefix):
+                yield key, json.loads(self._mm[start + key_len:start + key_len + value_len])
+
+    def close(self):
+        if not self._mm.closed:
+            self._mm.close()
+
+    def __contains__(self, key: str) -> bool:
+        return self.get(key) is not None
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+_snapshots: Dict[Tuple[int, str], CacheSnapshot] = {}
+_snapshots_lock = threading.Lock()
+
+
+def open_snapshot(path: str) -> CacheSnapshot:
+    """Возвращает общий для процесса экземпляр снапшота"""
+    resolved = str(Path(path).resolve())
+    registry_key = (os.getpid(), resolved)
+    with _snapshots_lock:
+        snapshot = _snapshots.get(registry_key)
+        if snapshot is None:
+            snapshot = CacheSnapshot(resolved)
+            _snapshots[registry_key] = snapshot
+    return snapshot
+
+
+def main():
+    """Компиляция снапшота из хранилища кеша"""
+    import argparse
+
+    try:
+        from .cache_store import open_cache_store, CACHE_BACKENDS, DEFAULT_CACHE_BACKEND
+    except ImportError:
+        from cache_store import open_cache_store, CACHE_BACKENDS, DEFAULT_CACHE_BACKEND
+
+    parser = argparse.ArgumentParser(description="Компиляция снапшота кеша переводов")
+    parser.add_argument('--store', default=None,
+                        help='Файл хранилища кеша (по умолчанию - общее хранилище)')
+    parser.add_argument('--backend', choices=list(CACHE_BACKENDS), default=DEFAULT_CACHE_BACKEND,
+                        help='Бэкенд хранилища')
+    parser.add_argument('--output', '-o', required=True,
+                        help='Файл снапшота')
+    parser.add_argument('--prefix', default='',
+                        help='Включить только ключи с префиксом (например, enhanced|russian|english|)')
+
+    args = parser.parse_args()
+
+    with open_cache_store(args.store, args.backend) as store:
+        count = compile_snapshot(store.items(args.prefix), args.output)
+    print(f"✅ Снапшот {args.output}: {count} записей")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,893 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Постоянные хранилища кеша переводов
+Каждая новая запись сохраняется отдельно, без перезаписи всего файла кеша
+"""
+
+import atexit
+import base64
+import hashlib
+import json
+import logging
+import lzma
+import os
+import sqlite3
+import tempfile
+import threading
+import unicodedata
+import weakref
+import zlib
+from dataclasses import dataclass
+from functools import partial
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows: блокировка журнала между процессами недоступна
+    fcntl = None
+
+logger = logging.getLogger('translatecore.cache')
+
+# Доступные бэкенды хранилища и расширения их файлов
+CACHE_BACKENDS = {
+    'sqlite': '.db',
+    'append': '.jsonl',
+    'json': '.json',
+}
+
+DEFAULT_CACHE_BACKEND = 'sqlite'
+
+# Общее хранилище для всех языковых пар, сервисов и процессов
+DEFAULT_SHARED_CACHE_FILE = 'translatecore_cache.db'
+
+# Верхняя граница диапазона ключей с заданным префиксом
+_PREFIX_END = '\U0010ffff'
+
+# Короткие имена полей записи кеша
+_RECORD_FIELDS = {
+    'translated': 't',
+    'service': 's',
+    'confidence': 'c',
+    'alternatives': 'a',
+    'created': 'at',
+}
+_RECORD_NAMES = {short: name for name, short in _RECORD_FIELDS.items()}
+
+# Методы сжатия длинных переводов: (сжатие, распаковка)
+COMPRESSION_METHODS = {
+    'zlib': (zlib.compress, zlib.decompress),
+    'lzma': (lzma.compress, lzma.decompress),
+}
+
+# Переводы короче этого размера (в байтах UTF-8) не сжимаются
+DEFAULT_COMPRESSION_THRESHOLD = 512
+
+
+def cache_key_prefix(source_lang: str, target_lang: str, namespace: str) -> str:
+    """Префикс ключей одной языковой пары в одном пространстве имен"""
+    return f"{namespace}|{source_lang}|{target_lang}|"
+
+
+def make_cache_key(text: str, source_lang: str, target_lang: str, namespace: str) -> str:
+    """
+    Строит ключ общего кеша: (пространство имен, пара языков, хеш текста)
+
+    Пространство имен отделяет результаты разных слоев и версий сервисов
+    (например, 'enhanced' или 'offline'), чтобы они не смешивались в одном файле.
+    Хеш - 128-битный blake2b от пары и NFC-нормализованного текста (22 символа base64).
+    """
+    prefix = cache_key_prefix(source_lang, target_lang, namespace)
+    normalized = unicodedata.normalize('NFC', text)
+    digest = hashlib.blake2b(f"{source_lang}|{target_lang}|{normalized}".encode('utf-8'),
+                             digest_size=16).digest()
+    return prefix + base64.urlsafe_b64encode(digest).rstrip(b'=').decode('ascii')
+
+
+def split_legacy_key(key: str) -> Optional[Tuple[str, str, str]]:
+    """Разбирает ключ старого формата 'текст|source|target'"""
+    parts = key.rsplit('|', 2)
+    if len(parts) != 3:
+        return None
+    return parts[0], parts[1], parts[2]
+
+
+def check_compression(compression: Optional[str]):
+    """Проверяет название метода сжатия"""
+    if compression is not None and compression not in COMPRESSION_METHODS:
+        raise ValueError(f"Неизвестный метод сжатия: {compression}. "
+                         f"Доступные: {', '.join(COMPRESSION_METHODS)}")
+
+
+def pack_value(record: Dict[str, Any], compression: Optional[str] = None,
+               threshold: int = DEFAULT_COMPRESSION_THRESHOLD) -> Dict[str, Any]:
+    """
+    Упаковывает запись кеша в компактное значение хранилища
+
+    Исходный текст и языковая пара не сохраняются: они известны из запроса и ключа.
+    Пустые поля опускаются, длинный перевод можно сжать.
+
+    Args:
+        record: Поля записи ('translated', 'service', 'confidence', 'alternatives', 'created')
+        compression: Метод сжатия ('zlib', 'lzma') или None
+        threshold: Минимальный размер перевода для сжатия (байт)
+
+    Returns:
+        Dict[str, Any]: Значение для записи в хранилище
+    """
+    value = {}
+    for name, short in _RECORD_FIELDS.items():
+        field = record.get(name)
+        if field is not None and field != []:
+            value[short] = field
+
+    if compression is not None:
+        data = value['t'].encode('utf-8')
+        if len(data) >= threshold:
+            packed = base64.b64encode(COMPRESSION_METHODS[compression][0](data)).decode('ascii')
+            if len(packed) < len(data):
+                value['t'] = packed
+                value['z'] = compression
+    return value
+
+
+def unpack_value(value: Any) -> Dict[str, Any]:
+    """
+    Распаковывает значение хранилища в запись кеша
+
+    Понимает компактные значения, словари прежнего формата ('original', 'translated', ...)
+    и голые строки перевода из старых JSON кешей.
+    """
+    if isinstance(value, str):
+        return {'translated': value}
+    if 'translated' in value:
+        return {name: value[name] for name in _RECORD_FIELDS if value.get(name) is not None}
+
+    record = {_RECORD_NAMES[short]: field for short, field in value.items() if short in _RECORD_NAMES}
+    compression = value.get('z')
+    if compression:
+        data = COMPRESSION_METHODS[compression][1](base64.b64decode(record['translated']))
+        record['translated'] = data.decode('utf-8')
+    return record
+
+
+def _dumps(value: Any) -> str:
+    """Компактная JSON сериализация значения хранилища"""
+    return json.dumps(value, ensure_ascii=False, separators=(',', ':'))
+
+
+def _atomic_write_text(path: Path, data: str):
+    """Атомарно записывает файл: временный файл + os.replace"""
+    fd, tmp_path = tempfile.mkstemp(prefix=f".{path.name}.", suffix='.tmp',
+                                    dir=str(path.parent))
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+class CacheStore:
+    """Базовый интерфейс постоянного хранилища кеша"""
+
+    backend = None
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self._lock = threading.RLock()
+
+    def get(self, key: str) -> Optional[Any]:
+        """Возвращает значение по ключу или None"""
+        raise NotImplementedError
+
+    def set(self, key: str, value: Any):
+        """Сохраняет одну запись"""
+        raise NotImplementedError
+
+    def set_many(self, items: Iterable[Tuple[str, Any]]):
+        """Сохраняет несколько записей"""
+        for key, value in items:
+            self.set(key, value)
+
+    def delete(self, key: str):
+        """Удаляет запись"""
+        raise NotImplementedError
+
+    def items(self, prefix: str = '') -> Iterator[Tuple[str, Any]]:
+        """Перебирает записи хранилища (только ключи с указанным префиксом)"""
+        raise NotImplementedError
+
+    def clear(self, prefix: str = ''):
+        """Удаляет записи с указанным префиксом (служебные метаданные сохраняются)"""
+        raise NotImplementedError
+
+    def count(self, prefix: str = '') -> int:
+        """Количество записей с указанным префиксом"""
+        raise NotImplementedError
+
+    def get_meta(self, name: str) -> Optional[str]:
+        """Возвращает служебное значение хранилища"""
+        raise NotImplementedError
+
+    def set_meta(self, name: str, value: str):
+        """Сохраняет служебное значение хранилища"""
+        raise NotImplementedError
+
+    def flush(self):
+        """Сбрасывает буферы на диск"""
+
+    def close(self):
+        """Закрывает хранилище"""
+
+    def pending_writes(self) -> int:
+        """Количество записей, еще не переданных на диск"""
+        return 0
+
+    def __len__(self) -> int:
+        return self.count()
+
+    def __contains__(self, key: str) -> bool:
+        return self.get(key) is not None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class SQLiteCacheStore(CacheStore):
+    """
+    Хранилище на SQLite в режиме WAL: каждая запись - отдельная транзакция.
+    У каждого потока свое соединение, поэтому чтение не блокируется записью,
+    а одновременные писатели из разных процессов упорядочиваются самим SQLite.
+    """
+
+    backend = 'sqlite'
+
+    def __init__(self, path: str, timeout: float = 30.0):
+        super().__init__(path)
+        self.timeout = timeout
+        self._pid = os.getpid()
+        self._local = threading.local()
+        self._connections = []
+
+        conn = self._connection()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value TEXT NOT NULL)"
+        )
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT NOT NULL)"
+        )
+
+    def _connection(self) -> sqlite3.Connection:
+        """Возвращает соединение текущего потока"""
+        if os.getpid() != self._pid:
+            # После fork соединения родительского процесса использовать нельзя
+            self._pid = os.getpid()
+            self._local = threading.local()
+            self._connections = []
+
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(str(self.path), timeout=self.timeout,
+                                   isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            with self._lock:
+                self._connections.append(conn)
+        return conn
+
+    @staticmethod
+    def _prefix_clause(prefix: str) -> Tuple[str, Tuple[str, ...]]:
+        if not prefix:
+            return '', ()
+        return ' WHERE key >= ? AND key < ?', (prefix, prefix + _PREFIX_END)
+
+    def get(self, key: str) -> Optional[Any]:
+        row = self._connection().execute("SELECT value FROM cache WHERE key = ?", (key,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def set(self, key: str, value: Any):
+        data = _dumps(value)
+        self._connection().execute("INSERT OR REPLACE INTO cache (key, value) VALUES (?, ?)", (key, data))
+
+    def set_many(self, items: Iterable[Tuple[str, Any]]):
+        rows = [(key, _dumps(value)) for key, value in items]
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.executemany("INSERT OR REPLACE INTO cache (key, value) VALUES (?, ?)", rows)
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def delete(self, key: str):
+        self._connection().execute("DELETE FROM cache WHERE key = ?", (key,))
+
+    def items(self, prefix: str = '') -> Iterator[Tuple[str, Any]]:
+        where, params = self._prefix_clause(prefix)
+        for key, data in self._connection().execute(f"SELECT key, value FROM cache{where}", params):
+            yield key, json.loads(data)
+
+    def clear(self, prefix: str = ''):
+        where, params = self._prefix_clause(prefix)
+        self._connection().execute(f"DELETE FROM cache{where}", params)
+
+    def count(self, prefix: str = '') -> int:
+        where, params = self._prefix_clause(prefix)
+        return self._connection().execute(f"SELECT COUNT(*) FROM cache{where}", params).fetchone()[0]
+
+    def get_meta(self, name: str) -> Optional[str]:
+        row = self._connection().execute("SELECT value FROM meta WHERE name = ?", (name,)).fetchone()
+        return row[0] if row else None
+
+    def set_meta(self, name: str, value: str):
+        self._connection().execute("INSERT OR REPLACE INTO meta (name, value) VALUES (?, ?)", (name, value))
+
+    def close(self):
+        with self._lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections = []
+            self._local = threading.local()
+
+
+class CacheStoreLockedError(RuntimeError):
+    """Журнал кеша уже открыт другим экземпляром хранилища"""
+
+
+class AppendOnlyCacheStore(CacheStore):
+    """
+    Хранилище в виде журнала JSON Lines: новые записи дописываются в конец файла.
+    В памяти хранится только индекс ключ → смещение строки в файле.
+    Оборванная последняя строка (сбой во время записи) отбрасывается при открытии,
+    устаревшие записи удаляются периодическим уплотнением журнала.
+
+    Индекс не видит чужих записей, а уплотнение заменяет файл, поэтому журнал
+    открывается только одним экземпляром: пока хранилище открыто, оно держит
+    эксклюзивную блокировку (fcntl) файла <журнал>.lock. Для записи из нескольких
+    процессов используйте бэкенд 'sqlite'.
+    """
+
+    backend = 'append'
+
+    def __init__(self, path: str, compact_ratio: float = 1.0,
+                 compact_min_records: int = 1000, fsync: bool = False):
+        """
+        Args:
+            path: Путь к файлу журнала
+            compact_ratio: Уплотнять, когда устаревших записей больше, чем live * ratio
+            compact_min_records: Минимальное число устаревших записей для уплотнения
+            fsync: Вызывать fsync после каждой записи
+        """
+        super().__init__(path)
+        self.compact_ratio = compact_ratio
+        self.compact_min_records = compact_min_records
+        self.fsync = fsync
+        self._index: Dict[str, Tuple[int, int]] = {}
+        self._meta: Dict[str, str] = {}
+        self._stale = 0
+        self._lock_file = self._acquire_file_lock()
+        try:
+            self._load_index()
+            self._file = open(self.path, 'ab')
+        except Exception:
+            self._release_file_lock()
+            raise
+
+    def _acquire_file_lock(self):
+        """Эксклюзивная блокировка журнала на время жизни хранилища"""
+        if fcntl is None:
+            return None
+        lock_file = open(self.path.with_name(self.path.name + '.lock'), 'ab')
+        try:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.close()
+            raise CacheStoreLockedError(
+                f"Журнал кеша {self.path} уже открыт другим процессом или экземпляром хранилища; "
+                f"для записи из нескольких процессов используйте бэкенд 'sqlite'"
+            )
+        return lock_file
+
+    def _release_file_lock(self):
+        if self._lock_file is not None:
+            # Закрытие файла снимает блокировку flock
+            self._lock_file.close()
+            self._lock_file = None
+
+    def _load_index(self):
+        """Строит индекс по журналу и отрезает оборванный хвост"""
+        if not self.path.exists():
+            return
+
+        valid_end = 0
+        with open(self.path, 'rb') as f:
+            offset = 0
+            for line in f:
+                length = len(line)
+                try:
+                    if not line.endswith(b'\n'):
+                        raise ValueError("incomplete record")
+                    record = json.loads(line)
+                except ValueError:
+                    # Оборванная запись: всё после неё считается мусором
+                    break
+                self._apply_record(record, offset, length)
+                offset += length
+                valid_end = offset
+
+        if valid_end < self.path.stat().st_size:
+            with open(self.path, 'r+b') as f:
+                f.truncate(valid_end)
+
+    def _apply_record(self, record: Dict[str, Any], offset: int, length: int):
+        if 'm' in record:
+            if record['m'] in self._meta:
+                self._stale += 1
+            self._meta[record['m']] = record['v']
+        elif record.get('d'):
+            if self._index.pop(record['k'], None) is not None:
+                self._stale += 1
+            self._stale += 1
+        else:
+            if record['k'] in self._index:
+                self._stale += 1
+            self._index[record['k']] = (offset, length)
+
+    def _append(self, record: Dict[str, Any]) -> Tuple[int, int]:
+        line = (_dumps(record) + '\n').encode('utf-8')
+        offset = self._file.tell()
+        # Одна операция write на запись: при сбое страдает только последняя строка
+        self._file.write(line)
+        self._file.flush()
+        if self.fsync:
+            os.fsync(self._file.fileno())
+        return offset, len(line)
+
+    def _read_record(self, position: Tuple[int, int]) -> Dict[str, Any]:
+        offset, length = position
+        with open(self.path, 'rb') as f:
+            f.seek(offset)
+            return json.loads(f.read(length))
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            position = self._index.get(key)
+            if position is None:
+                return None
+            return self._read_record(position)['v']
+
+    def set(self, key: str, value: Any):
+        with self._lock:
+            if key in self._index:
+                self._stale += 1
+            self._index[key] = self._append({'k': key, 'v': value})
+            self._maybe_compact()
+
+    def delete(self, key: str):
+        with self._lock:
+            if self._index.pop(key, None) is None:
+                return
+            self._append({'k': key, 'd': 1})
+            self._stale += 2
+            self._maybe_compact()
+
+    def items(self, prefix: str = '') -> Iterator[Tuple[str, Any]]:
+        with self._lock:
+            positions = [(key, position) for key, position in self._index.items()
+                         if key.startswith(prefix)]
+            with open(self.path, 'rb') as f:
+                records = []
+                for key, (offset, length) in positions:
+                    f.seek(offset)
+                    records.append((key, json.loads(f.read(length))['v']))
+        return iter(records)
+
+    def clear(self, prefix: str = ''):
+        with self._lock:
+            remaining = [(key, value) for key, value in self.items() if not key.startswith(prefix)] if prefix else []
+            self._rewrite(remaining)
+
+    def count(self, prefix: str = '') -> int:
+        with self._lock:
+            if not prefix:
+                return len(self._index)
+            return sum(1 for key in self._index if key.startswith(prefix))
+
+    def get_meta(self, name: str) -> Optional[str]:
+        with self._lock:
+            return self._meta.get(name)
+
+    def set_meta(self, name: str, value: str):
+        with self._lock:
+            if name in self._meta:
+                self._stale += 1
+            self._meta[name] = value
+            self._append({'m': name, 'v': value})
+
+    def _maybe_compact(self):
+        live = len(self._index)
+        if self._stale >= self.compact_min_records and self._stale > live * self.compact_ratio:
+            self.compact()
+
+    def compact(self):
+        """Переписывает журнал, оставляя только актуальные записи"""
+        with self._lock:
+            self._rewrite(list(self.items()))
+
+    def _rewrite(self, entries):
+        lines = [_dumps({'m': name, 'v': value}) + '\n'
+                 for name, value in self._meta.items()]
+        data_start = sum(len(line.encode('utf-8')) for line in lines)
+
+        index = {}
+        offset = data_start
+        for key, value in entries:
+            line = _dumps({'k': key, 'v': value}) + '\n'
+            length = len(line.encode('utf-8'))
+            index[key] = (offset, length)
+            offset += length
+            lines.append(line)
+
+        self._file.close()
+        _atomic_write_text(self.path, ''.join(lines))
+        self._file = open(self.path, 'ab')
+        self._index = index
+        self._stale = 0
+
+    def flush(self):
+        with self._lock:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+    def close(self):
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+            self._release_file_lock()
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._index
+
+
+class JSONCacheStore(CacheStore):
+    """
+    Прежний формат: весь кеш в одном JSON файле.
+    Оставлен для совместимости, каждая запись перезаписывает файл целиком (атомарно).
+    Служебные метки хранятся рядом, в файле <кеш>.meta, чтобы не смешиваться с записями.
+    """
+
+    backend = 'json'
+
+    def __init__(self, path: str):
+        super().__init__(path)
+        self._data: Dict[str, Any] = {}
+        if self.path.exists():
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self._data = json.load(f)
+        self._meta_path = self.path.with_name(self.path.name + '.meta')
+        self._meta: Dict[str, str] = {}
+        if self._meta_path.exists():
+            with open(self._meta_path, 'r', encoding='utf-8') as f:
+                self._meta = json.load(f)
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            return self._data.get(key)
+
+    def set(self, key: str, value: Any):
+        with self._lock:
+            self._data[key] = value
+            self._write()
+
+    def set_many(self, items: Iterable[Tuple[str, Any]]):
+        with self._lock:
+            self._data.update(items)
+            self._write()
+
+    def delete(self, key: str):
+        with self._lock:
+            if self._data.pop(key, None) is not None:
+                self._write()
+
+    def items(self, prefix: str = '') -> Iterator[Tuple[str, Any]]:
+        with self._lock:
+            return iter([(key, value) for key, value in self._data.items() if key.startswith(prefix)])
+
+    def clear(self, prefix: str = ''):
+        with self._lock:
+            if prefix:
+                self._data = {key: value for key, value in self._data.items() if not key.startswith(prefix)}
+                self._write()
+            else:
+                self._data = {}
+                if self.path.exists():
+                    os.remove(self.path)
+
+    def count(self, prefix: str = '') -> int:
+        with self._lock:
+            if not prefix:
+                return len(self._data)
+            return sum(1 for key in self._data if key.startswith(prefix))
+
+    def get_meta(self, name: str) -> Optional[str]:
+        with self._lock:
+            return self._meta.get(name)
+
+    def set_meta(self, name: str, value: str):
+        with self._lock:
+            self._meta[name] = value
+            _atomic_write_text(self._meta_path, json.dumps(self._meta, ensure_ascii=False, indent=2))
+
+    def _write(self):
+        _atomic_write_text(self.path, json.dumps(self._data, ensure_ascii=False, indent=2))
+
+
+@dataclass
+class WriteBehindConfig:
+    """Настройки отложенной записи кеша"""
+    max_pending: int = 100                  # Сбрасывать, когда накопилось столько записей
+    flush_interval: Optional[float] = 5.0   # Сбрасывать не реже, чем раз в N секунд (None - только по размеру)
+
+
+def _flush_at_exit(ref: 'weakref.ref[WriteBehindCacheStore]'):
+    store = ref()
+    if store is not None:
+        store.flush()
+
+
+def _flush_periodically(ref: 'weakref.ref[WriteBehindCacheStore]', stop: threading.Event,
+                        wakeup: threading.Event, interval: float):
+    """Фоновый сброс; поток не удерживает обертку, удаленная обертка завершает его"""
+    while not stop.is_set():
+        wakeup.wait(interval)
+        wakeup.clear()
+        store = ref()
+        if store is None:
+            return
+        store.flush()
+        del store
+
+
+class WriteBehindCacheStore(CacheStore):
+    """
+    Обертка с отложенной записью: новые записи копятся в памяти и пачкой
+    передаются в нижележащее хранилище по размеру или по времени, а также
+    при flush()/close() и при завершении процесса (atexit).
+
+    Переводчики одного процесса получают общую обертку через get_shared_cache_store(),
+    так что на одно хранилище приходится один фоновый поток сброса.
+    """
+
+    def __init__(self, store: CacheStore, config: Optional[WriteBehindConfig] = None):
+        super().__init__(str(store.path))
+        self.store = store
+        self.backend = store.backend
+        self.config = config or WriteBehindConfig()
+        self._pending: Dict[str, Any] = {}
+        self._inflight: Dict[str, Any] = {}
+        self._flush_lock = threading.Lock()
+        self._closed = False
+        self._stop = threading.Event()
+        self._wakeup = threading.Event()
+        self._flusher = None
+
+        if self.config.flush_interval:
+            self._flusher = threading.Thread(target=_flush_periodically,
+                                             args=(weakref.ref(self), self._stop, self._wakeup,
+                                                   self.config.flush_interval),
+                                             name='translatecore-cache-flush', daemon=True)
+            self._flusher.start()
+        # Слабая ссылка: обработчик atexit не продлевает жизнь обертки
+        self._atexit_hook = partial(_flush_at_exit, weakref.ref(self))
+        atexit.register(self._atexit_hook)
+
+    def _after_write(self):
+        """Запускает сброс при переполнении очереди, не блокируя вызывающий поток"""
+        with self._lock:
+            full = len(self._pending) >= self.config.max_pending
+        if not full:
+            return
+        if self._flusher is not None:
+            self._wakeup.set()
+        else:
+            self.flush()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            if key in self._pending:
+                return self._pending[key]
+            if key in self._inflight:
+                return self._inflight[key]
+        return self.store.get(key)
+
+    def set(self, key: str, value: Any):
+        with self._lock:
+            self._pending[key] = value
+        self._after_write()
+
+    def set_many(self, items: Iterable[Tuple[str, Any]]):
+        with self._lock:
+            self._pending.update(items)
+        self._after_write()
+
+    def delete(self, key: str):
+        with self._lock:
+            self._pending.pop(key, None)
+        self.store.delete(key)
+
+    def items(self, prefix: str = '') -> Iterator[Tuple[str, Any]]:
+        self.flush()
+        return self.store.items(prefix)
+
+    def clear(self, prefix: str = ''):
+        with self._lock:
+            self._pending = {key: value for key, value in self._pending.items()
+                             if prefix and not key.startswith(prefix)}
+        self.store.clear(prefix)
+
+    def count(self, prefix: str = '') -> int:
+        with self._lock:
+            unsaved = [key for key in list(self._pending) + list(self._inflight) if key.startswith(prefix)]
+        return self.store.count(prefix) + sum(1 for key in set(unsaved) if key not in self.store)
+
+    def get_meta(self, name: str) -> Optional[str]:
+        return self.store.get_meta(name)
+
+    def set_meta(self, name: str, value: str):
+        self.store.set_meta(name, value)
+
+    def pending_writes(self) -> int:
+        with self._lock:
+            return len(self._pending) + len(self._inflight)
+
+    def flush(self):
+        """Передает накопленные записи в хранилище одной пачкой"""
+        with self._flush_lock:
+            with self._lock:
+                if not self._pending:
+                    return
+                batch, self._pending = self._pending, {}
+                self._inflight = batch
+
+            try:
+                self.store.set_many(batch.items())
+            except Exception as e:
+                # Не теряем записи: вернем их в очередь, более новые значения важнее
+                with self._lock:
+                    batch.update(self._pending)
+                    self._pending = batch
+                logger.warning("Ошибка отложенной записи кеша: %s", e)
+                return
+            finally:
+                with self._lock:
+                    self._inflight = {}
+
+            self.store.flush()
+
+    def close(self):
+        """Сбрасывает записи и останавливает фоновый поток (общее хранилище не закрывается)"""
+        if self._closed:
+            return
+        self._closed = True
+        self._stop.set()
+        self._wakeup.set()
+        self.flush()
+        atexit.unregister(self._atexit_hook)
+
+
+STORE_CLASSES = {
+    'sqlite': SQLiteCacheStore,
+    'append': AppendOnlyCacheStore,
+    'json': JSONCacheStore,
+}
+
+
+_shared_stores: Dict[Tuple[int, str, str], CacheStore] = {}
+_shared_write_behind: Dict[Tuple[int, str, str], WriteBehindCacheStore] = {}
+_shared_stores_lock = threading.Lock()
+
+
+def import_json_cache(store: CacheStore, json_path: str,
+                      convert: Optional[Callable[[str, Any], Optional[Tuple[str, Any]]]] = None) -> int:
+    """
+    Однократно импортирует кеш старого JSON формата в хранилище
+
+    Args:
+        store: Хранилище назначения
+        json_path: Путь к JSON файлу кеша
+        convert: Преобразование (ключ, значение) → (новый ключ, новое значение) или None для пропуска
+
+    Returns:
+        int: Количество импортированных записей (0, если импорт уже выполнялся)
+    """
+    json_path = Path(json_path)
+    marker = f"imported:{json_path.resolve()}"
+    if not json_path.exists() or store.get_meta(marker):
+        return 0
+
+    with open(json_path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+
+    entries = []
+    for key, value in data.items():
+        converted = convert(key, value) if convert else (key, value)
+        if converted is not None and converted[0] not in store:
+            entries.append(converted)
+
+    store.set_many(entries)
+    store.set_meta(marker, str(json_path.stat().st_mtime))
+    logger.info("Импортировано записей кеша из %s: %d", json_path, len(entries))
+    return len(entries)
+
+
+def resolve_store_path(cache_file: Optional[str] = None, backend: str = DEFAULT_CACHE_BACKEND) -> Path:
+    """
+    Определяет путь к файлу хранилища
+
+    Без явного файла используется общее хранилище (переменная окружения
+    TRANSLATECORE_CACHE_FILE или translatecore_cache.db). Расширение .json
+    заменяется на расширение выбранного бэкенда.
+    """
+    if backend not in STORE_CLASSES:
+        raise ValueError(f"Неизвестный бэкенд кеша: {backend}. Доступны: {', '.join(STORE_CLASSES)}")
+
+    cache_path = Path(cache_file or os.getenv('TRANSLATECORE_CACHE_FILE', DEFAULT_SHARED_CACHE_FILE))
+    if cache_path.suffix in ('', '.json'):
+        cache_path = cache_path.with_suffix(CACHE_BACKENDS[backend])
+    return cache_path
+
+
+def open_cache_store(cache_file: Optional[str] = None, backend: str = DEFAULT_CACHE_BACKEND) -> CacheStore:
+    """Открывает отдельный экземпляр хранилища"""
+    return STORE_CLASSES[backend](str(resolve_store_path(cache_file, backend)))
+
+
+def get_shared_cache_store(cache_file: Optional[str] = None,
+                           backend: str = DEFAULT_CACHE_BACKEND,
+                           write_behind: Optional[WriteBehindConfig] = None) -> CacheStore:
+    """
+    Возвращает общий для процесса экземпляр хранилища
+
+    Все переводчики процесса, работающие с одним файлом, получают один и тот же
+    объект. После fork дочерний процесс открывает собственный экземпляр.
+    Для записи из нескольких процессов используйте бэкенд 'sqlite'.
+
+    С write_behind возвращается общая обертка с отложенной записью. Настройки задает
+    первый переводчик: вторая обертка над тем же хранилищем не создается.
+
+    Args:
+        cache_file: Путь к файлу кеша (по умолчанию - общее хранилище)
+        backend: Бэкенд хранилища ('sqlite', 'append', 'json')
+        write_behind: Настройки отложенной записи (None - запись сразу)
+
+    Returns:
+        CacheStore: Хранилище
+    """
+    path = resolve_store_path(cache_file, backend).resolve()
+    registry_key = (os.getpid(), str(path), backend)
+    with _shared_stores_lock:
+        store = _shared_stores.get(registry_key)
+        if store is None:
+            store = STORE_CLASSES[backend](str(path))
+            _shared_stores[registry_key] = store
+        if write_behind is None:
+            return store
+
+        wrapper = _shared_write_behind.get(registry_key)
+        if wrapper is None or wrapper._closed:
+            wrapper = _shared_write_behind[registry_key] = WriteBehindCacheStore(store, write_behind)
+        elif wrapper.config != write_behind:
+            logger.warning("%s: отложенная запись %s не применена, хранилище уже использует %s",
+                           path, write_behind, wrapper.config)
+        return wrapper
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Предохранители сервисов перевода
+После серии ошибок сервис исключается из цепочки на время остывания,
+затем пропускает пробные запросы и по их результату закрывается или снова размыкается.
+"""
+
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+@dataclass
+class CircuitBreakerConfig:
+    """Настройки предохранителей сервисов"""
+    enabled: bool = True
+    failure_threshold: int = 5     # Подряд идущих ошибок до размыкания
+    cooldown: float = 30.0         # Секунд в разомкнутом состоянии до пробных запросов
+    half_open_requests: int = 1    # Одновременных пробных запросов в полуоткрытом состоянии
+
+
+class CircuitBreaker:
+    """
+    Предохранитель одного сервиса: closed -> open -> half_open -> closed
+
+    В состоянии closed запросы проходят, подряд идущие ошибки считаются;
+    open - запросы отклоняются до конца остывания; half_open - проходят
+    пробные запросы, успех закрывает предохранитель, ошибка снова размыкает его.
+    """
+
+    def __init__(self, config: Optional[CircuitBreakerConfig] = None):
+        self.config = config or CircuitBreakerConfig()
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trials = 0
+        self.stats = {
+            'opened': 0,
+            'rejected': 0,
+            'last_error': None
+        }
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._current_state()
+
+    def _current_state(self) -> str:
+        if self._state == OPEN and time.time() - self._opened_at >= self.config.cooldown:
+            self._state = HALF_OPEN
+            self._trials = 0
+        return self._state
+
+    def allow_request(self) -> bool:
+        """Можно ли отправить запрос сервису (в полуоткрытом состоянии занимает слот пробного запроса)"""
+        with self._lock:
+            state = self._current_state()
+            if state == CLOSED:
+                return True
+            if state == HALF_OPEN and self._trials < self.config.half_open_requests:
+                self._trials += 1
+                return True
+            self.stats['rejected'] += 1
+            return False
+
+    def release(self):
+        """
+        Возвращает слот пробного запроса, завершившегося без ответа сервиса (отмена, пропуск по лимиту)
+
+        После учтенного успеха или ошибки предохранитель уже не в полуоткрытом состоянии,
+        поэтому вызов ничего не меняет.
+        """
+        with self._lock:
+            if self._current_state() == HALF_OPEN and self._trials > 0:
+                self._trials -= 1
+
+    def record_success(self):
+        """Учитывает ответ сервиса"""
+        with self._lock:
+            self._failures = 0
+            self._state = CLOSED
+            self._trials = 0
+
+    def record_failure(self, error: Optional[Exception] = None):
+        """Учитывает ошибку сервиса"""
+        with self._lock:
+            self._failures += 1
+            if error is not None:
+                self.stats['last_error'] = str(error)
+            state = self._current_state()
+            if state == HALF_OPEN or (state == CLOSED and self._failures >= self.config.failure_threshold):
+                self._state = OPEN
+                self._opened_at = time.time()
+                self.stats['opened'] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Возвращает состояние предохранителя"""
+        with self._lock:
+            state = self._current_state()
+            retry_in = None
+            if state == OPEN:
+                retry_in = max(0.0, self.config.cooldown - (time.time() - self._opened_at))
+            return {
+                'state': state,
+                'consecutive_failures': self._failures,
+                'retry_in': retry_in,
+                'failure_threshold': self.config.failure_threshold,
+                'cooldown': self.config.cooldown,
+                **self.stats
+            }
@@ -8,6 +8,7 @@ TranslateCore CLI - Продвинутая утилита командной с
 import argparse
 import sys
 import json
+import logging
 import os
 from pathlib import Path
 from typing import List, Dict, Optional, Any
@@ -21,6 +22,8 @@ try:
     from .enhanced_translator import EnhancedTranslator
     from .offline_translator import OfflineTranslator
     from .config_loader import APIConfigLoader, ConfigurationError
+    from .cache_store import open_cache_store, CACHE_BACKENDS, DEFAULT_CACHE_BACKEND, WriteBehindConfig
+    from .cache_bundle import BundleFilter, export_bundle, import_bundles, CONFLICT_STRATEGIES
 except ImportError as e:
     # Fallback для запуска из корневой директории
     try:
@@ -28,6 +31,10 @@ except ImportError as e:
         from src.translatecore.enhanced_translator import EnhancedTranslator
         from src.translatecore.offline_translator import OfflineTranslator
         from src.translatecore.config_loader import APIConfigLoader, ConfigurationError
+        from src.translatecore.cache_store import (open_cache_store, CACHE_BACKENDS,
+                                                   DEFAULT_CACHE_BACKEND, WriteBehindConfig)
+        from src.translatecore.cache_bundle import (BundleFilter, export_bundle, import_bundles,
+                                                    CONFLICT_STRATEGIES)
     except ImportError:
         print(f"❌ Ошибка импорта модулей: {e}")
         print("💡 Убедитесь, что вы запускаете из правильной директории")
@@ -79,12 +86,36 @@ def print_info(message: str):
     """Печать информации"""
     colored_print(f"💡 {message}", Colors.BLUE)
 
+def configure_logging(level: int = logging.WARNING):
+    """Выводит сообщения библиотеки (логгер translatecore) в stderr"""
+    handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter('%(levelname)s %(name)s: %(message)s'))
+    library_logger = logging.getLogger('translatecore')
+    library_logger.addHandler(handler)
+    library_logger.setLevel(level)
+
+def print_circuit_breakers(breakers: Dict[str, Dict[str, Any]], only_tripped: bool = False):
+    """Печать состояния предохранителей сервисов"""
+    icons = {'closed': '🟢', 'half_open': '🟡', 'open': '🔴'}
+    for service, breaker in breakers.items():
+        if only_tripped and breaker['state'] == 'closed':
+            continue
+        line = f"   • {icons.get(breaker['state'], '•')} {service}: {breaker['state']}"
+        if breaker['retry_in'] is not None:
+            line += f" (повтор через {breaker['retry_in']:.0f}с)"
+        if breaker['consecutive_failures']:
+            line += f", ошибок подряд: {breaker['consecutive_failures']}"
+        if 'failure_threshold' in breaker:
+            line += f" [порог {breaker['failure_threshold']}, пауза {breaker['cooldown']:.0f}с]"
+        print(line)
+
 class TranslateCLI:
     """Основной класс CLI утилиты"""
     
     def __init__(self):
         self.config_file = "translation_api_config.json"
         self.translator = None
+        self.translators: Dict[tuple, EnhancedTranslator] = {}
         self.history_file = Path.home() / ".translate_history.json"
         self.settings_file = Path.home() / ".translate_settings.json"
         self.settings = self.load_settings()
@@ -171,13 +202,8 @@ class TranslateCLI:
         start_time = time.time()
         
         try:
-            # Создаем переводчик
-            translator = EnhancedTranslator(
-                source_lang=source_lang,
-                target_lang=target_lang,
-                config_file=self.config_file,
-                service_config_name=service_config
-            )
+            # Переводчик создается один раз на направление и конфигурацию в пределах сессии
+            translator = self.get_translator(source_lang, target_lang, service_config)
             
             # Переводим
             result = translator.translate(text)
@@ -206,6 +232,18 @@ class TranslateCLI:
                 'original': text
             }
     
+    def get_translator(self, source_lang: str, target_lang: str, service_config: str) -> EnhancedTranslator:
+        """Возвращает переводчик сессии (состояние сервисов и предохранителей сохраняется между переводами)"""
+        key = (source_lang, target_lang, service_config)
+        if key not in self.translators:
+            self.translators[key] = EnhancedTranslator(
+                source_lang=source_lang,
+                target_lang=target_lang,
+                config_file=self.config_file,
+                service_config_name=service_config
+            )
+        return self.translators[key]
+    
     def save_to_history(self, original: str, translated: str, source_lang: str, 
                        target_lang: str, service: str):
         """Сохраняет перевод в историю"""
@@ -310,6 +348,7 @@ class TranslateCLI:
                     if result['stats'] and self.settings['show_stats']:
                         stats = result['stats']
                         colored_print(f"📊 Статистика: {stats['total_requests']} запросов", Colors.BLUE)
+                        print_circuit_breakers(stats.get('circuit_breakers', {}), only_tripped=True)
                 else:
                     print_error(f"Ошибка перевода: {result['error']}")
                 
@@ -407,6 +446,8 @@ class TranslateCLI:
                 colored_print(f"🔧 Доступные оффлайн методы: {', '.join(methods)}", Colors.GREEN)
             except Exception as e:
                 colored_print(f"❌ Оффлайн методы: {e}", Colors.FAIL)
+        except Exception as e:
+            colored_print(f"❌ Оффлайн методы: {e}", Colors.FAIL)
         
         # Проверяем конфигурации
         try:
@@ -423,6 +464,24 @@ class TranslateCLI:
         except Exception as e:
             colored_print(f"❌ Конфигурации: {e}", Colors.FAIL)
         
+        # Предохранители сервисов переводчиков этой сессии. Их состояние хранится в памяти процесса,
+        # поэтому в новом процессе (--stats) показываем настроенные сервисы конфигурации по умолчанию
+        if not self.translators:
+            colored_print("🔌 Состояние предохранителей не сохраняется между запусками: "
+                          "в новом процессе все предохранители замкнуты", Colors.BLUE)
+            try:
+                self.get_translator(self.settings['default_source'], self.settings['default_target'],
+                                    self.settings['default_service_config'])
+            except Exception as e:
+                colored_print(f"❌ Предохранители: {e}", Colors.FAIL)
+        for (source_lang, target_lang, service_config), translator in self.translators.items():
+            colored_print(f"🔌 Предохранители ({source_lang} → {target_lang}, {service_config}):", Colors.BLUE)
+            breakers = translator.get_stats()['circuit_breakers']
+            if breakers:
+                print_circuit_breakers(breakers)
+            else:
+                print("   • предохранители отключены")
+        
         # История
         if self.history_file.exists():
             try:
@@ -484,6 +543,160 @@ class TranslateCLI:
         colored_print("\n🎉 Настройка завершена!", Colors.GREEN, bold=True)
         print_info("Теперь вы можете использовать 'translate-cli' или 'translate-cli -i' для интерактивного режима")
 
+    def cache_export(self, args):
+        """Экспортирует кеш переводов в переносимый пакет"""
+        bundle_filter = BundleFilter(
+            source_lang=args.source,
+            target_lang=args.target,
+            namespace=args.namespace,
+            services=args.service,
+            max_age=args.max_age * 86400 if args.max_age is not None else None
+        )
+        with open_cache_store(args.cache_file, args.backend) as store:
+            count = export_bundle(store, args.output, bundle_filter)
+        print_success(f"Экспортировано записей: {count} → {args.output}")
+    
+    def cache_import(self, args):
+        """Сливает пакеты кеша в хранилище"""
+        if args.service_priority:
+            service_priority = {name: i for i, name in enumerate(args.service_priority)}
+        else:
+            service_priority = {name: info['priority']
+                                for name, info in EnhancedTranslator.AVAILABLE_SERVICES.items()}
+        
+        with open_cache_store(args.cache_file, args.backend) as store:
+            counters = import_bundles(store, args.bundles, args.prefer, service_priority)
+        print_success(f"Добавлено: {counters['added']}, заменено: {counters['replaced']}, "
+                      f"оставлено без изменений: {counters['kept']}")
+    
+    def load_seed_corpus(self, path: Optional[str], source_lang: Optional[str],
+                         target_lang: Optional[str]) -> Dict[tuple, List[str]]:
+        """
+        Загружает корпус для прогрева кеша, сгруппированный по парам языков
+        
+        JSON файл читается в формате истории CLI, остальные - построчно
+        (для них нужны исходный и целевой языки).
+        """
+        path = Path(path) if path else self.history_file
+        corpus: Dict[tuple, List[str]] = {}
+        
+        if path.suffix == '.json':
+            with open(path, 'r', encoding='utf-8') as f:
+                entries = json.load(f)
+            for entry in entries:
+                pair = (source_lang or entry['source_lang'], target_lang or entry['target_lang'])
+                corpus.setdefault(pair, []).append(entry['original'])
+        else:
+            if not source_lang or source_lang == 'auto' or not target_lang:
+                raise ValueError("Для текстового корпуса укажите --source и --target")
+            with open(path, 'r', encoding='utf-8') as f:
+                corpus[(source_lang, target_lang)] = [line.strip() for line in f if line.strip()]
+        
+        # Повторы переводить незачем
+        return {pair: list(dict.fromkeys(texts)) for pair, texts in corpus.items()}
+    
+    def cache_warm(self, args):
+        """Прогревает кеш переводом корпуса перед развертыванием"""
+        corpus = self.load_seed_corpus(args.corpus, args.source, args.target)
+        if not corpus:
+            print_info("Корпус для прогрева пуст")
+            return
+        
+        service_config = args.config or self.settings['default_service_config']
+        for (source_lang, target_lang), texts in corpus.items():
+            colored_print(f"\n🔥 {source_lang} → {target_lang}: {len(texts)} текстов", Colors.HEADER, bold=True)
+            # Отложенная запись: кеш сбрасывается пачками и при закрытии переводчика
+            with EnhancedTranslator(
+                source_lang=source_lang,
+                target_lang=target_lang,
+                config_file=self.config_file,
+                service_config_name=service_config,
+                cache_file=args.cache_file,
+                cache_backend=args.backend,
+                write_behind=WriteBehindConfig()
+            ) as translator:
+                translator.translate_batch(texts, show_progress=not args.quiet)
+                cached = translator.stats['cache_hits']
+            print_success(f"Уже в кеше: {cached}, переведено: {len(texts) - cached}")
+
+def create_cache_parser() -> argparse.ArgumentParser:
+    """Создает парсер команд управления кешем (translate-cli cache ...)"""
+    parser = argparse.ArgumentParser(
+        prog='translate-cli cache',
+        description='Управление кешем переводов: экспорт, импорт и прогрев',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Примеры использования:
+  translate-cli cache export cache.jsonl.gz -s russian -t english --max-age 30
+  translate-cli cache import a.jsonl.gz b.jsonl.gz --prefer priority
+  translate-cli cache warm                       # Прогрев по истории переводов
+  translate-cli cache warm --corpus texts.txt -s russian -t english
+        """
+    )
+    parser.add_argument('--cache-file',
+                       help='Файл хранилища кеша (по умолчанию: общее хранилище)')
+    parser.add_argument('--backend',
+                       choices=list(CACHE_BACKENDS),
+                       default=DEFAULT_CACHE_BACKEND,
+                       help='Бэкенд хранилища кеша')
+    
+    commands = parser.add_subparsers(dest='command', required=True)
+    
+    export_parser = commands.add_parser('export', help='Экспортировать кеш в пакет')
+    export_parser.add_argument('output',
+                              help='Файл пакета (*.gz - со сжатием)')
+    export_parser.add_argument('-s', '--source',
+                              help='Только исходный язык')
+    export_parser.add_argument('-t', '--target',
+                              help='Только целевой язык')
+    export_parser.add_argument('--namespace',
+                              help='Только пространство имен (enhanced, offline, smart)')
+    export_parser.add_argument('--service', nargs='+',
+                              help='Только переводы указанных сервисов')
+    export_parser.add_argument('--max-age', type=float, metavar='DAYS',
+                              help='Только записи не старше DAYS дней')
+    
+    import_parser = commands.add_parser('import', help='Слить пакеты в кеш')
+    import_parser.add_argument('bundles', nargs='+',
+                              help='Файлы пакетов')
+    import_parser.add_argument('--prefer',
+                              choices=CONFLICT_STRATEGIES,
+                              default='confidence',
+                              help='Разрешение конфликтов (по умолчанию: confidence)')
+    import_parser.add_argument('--service-priority', nargs='+', metavar='SERVICE',
+                              help='Порядок сервисов для --prefer priority (по умолчанию: встроенный)')
+    
+    warm_parser = commands.add_parser('warm', help='Прогреть кеш переводом корпуса')
+    warm_parser.add_argument('--corpus',
+                            help='Корпус: JSON в формате истории или текст по строке (по умолчанию: история)')
+    warm_parser.add_argument('-s', '--source',
+                            help='Исходный язык')
+    warm_parser.add_argument('-t', '--target',
+                            help='Целевой язык')
+    warm_parser.add_argument('-c', '--config',
+                            help='Конфигурация сервисов (по умолчанию: из настроек)')
+    warm_parser.add_argument('--quiet', '-q',
+                            action='store_true',
+                            help='Не показывать прогресс')
+    
+    return parser
+
+def run_cache_command(cli: TranslateCLI, argv: List[str]):
+    """Выполняет команду управления кешем"""
+    args = create_cache_parser().parse_args(argv)
+    # Прогресс и итоги пакетов идут на уровне INFO
+    configure_logging(logging.WARNING if getattr(args, 'quiet', False) else logging.INFO)
+    handlers = {
+        'export': cli.cache_export,
+        'import': cli.cache_import,
+        'warm': cli.cache_warm,
+    }
+    try:
+        handlers[args.command](args)
+    except Exception as e:
+        print_error(f"Ошибка команды cache {args.command}: {e}")
+        sys.exit(1)
+
 def create_argument_parser(cli: TranslateCLI) -> argparse.ArgumentParser:
     """Создает парсер аргументов командной строки"""
     
@@ -499,6 +712,7 @@ def create_argument_parser(cli: TranslateCLI) -> argparse.ArgumentParser:
   translate-cli -c offline_only "Текст"         # Только оффлайн
   translate-cli --history                        # Показать историю
   translate-cli --setup                          # Мастер настройки
+  translate-cli cache export|import|warm ...     # Управление кешем (см. cache --help)
   
 Конфигурации:
   offline_only      - Полностью автономный оффлайн
@@ -595,8 +809,15 @@ def main():
     """Основная функция CLI"""
     
     cli = TranslateCLI()
+    
+    # Команды управления кешем разбираются отдельным парсером
+    if len(sys.argv) > 1 and sys.argv[1] == 'cache':
+        run_cache_command(cli, sys.argv[2:])
+        return
+    
     parser = create_argument_parser(cli)
     args = parser.parse_args()
+    configure_logging(logging.DEBUG if args.verbose else logging.ERROR if args.quiet else logging.WARNING)
     
     # Отключаем цвета если нужно
     if args.no_colors:
@@ -784,6 +1005,7 @@ def main():
                 if result['stats'] and cli.settings['show_stats'] and args.verbose:
                     stats = result['stats']
                     colored_print(f"📊 Статистика: {stats['total_requests']} запросов", Colors.BLUE)
+                    print_circuit_breakers(stats.get('circuit_breakers', {}), only_tripped=True)
                 
                 print("═" * 60)
         else:
@@ -6,11 +6,14 @@
 """
 
 import json
+import logging
 import os
 from pathlib import Path
 from typing import Dict, List, Optional, Any
 import sys
 
+logger = logging.getLogger('translatecore.config')
+
 
 class ConfigurationError(Exception):
     """Ошибка конфигурации"""
@@ -62,7 +65,7 @@ class APIConfigLoader:
                     f"💡 Замените YOUR_*_API_KEY_HERE на реальные API ключи в {self.config_file}"
                 )
                 
-            print(f"✅ Конфигурация загружена из {self.config_file}")
+            logger.info("Конфигурация загружена из %s", self.config_file)
             
         except json.JSONDecodeError as e:
             raise ConfigurationError(f"❌ Ошибка парсинга JSON в {self.config_file}: {e}")
@@ -143,7 +146,7 @@ class APIConfigLoader:
             env_value = os.getenv(env_var)
             if env_value and service not in api_keys:
                 api_keys[service] = env_value
-                print(f"🌍 Использован API ключ {service} из переменной окружения")
+                logger.info("Использован API ключ %s из переменной окружения", service)
         
         return api_keys
     
@@ -184,6 +187,32 @@ class APIConfigLoader:
         config = self.get_service_config(config_name)
         return config.get('services', [])
     
+    def get_service_settings(self, config_name: str = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Получает настройки сервисов (например, max_concurrency)
+        
+        Общие настройки из раздела 'service_settings' дополняются настройками
+        одноименного раздела указанной конфигурации.
+        
+        Args:
+            config_name: Название конфигурации
+            
+        Returns:
+            Словарь {сервис: настройки}
+        """
+        if not self.config_data:
+            raise ConfigurationError("Конфигурация не загружена")
+        
+        settings = {
+            service: dict(values)
+            for service, values in self.config_data.get('service_settings', {}).items()
+        }
+        if config_name:
+            overrides = self.get_service_config(config_name).get('service_settings', {})
+            for service, values in overrides.items():
+                settings.setdefault(service, {}).update(values)
+        return settings
+    
     def list_available_configs(self) -> Dict[str, Dict[str, Any]]:
         """
         Возвращает список всех доступных конфигураций
@@ -5,13 +5,64 @@
 Поддерживает множество сервисов перевода и расширенную функциональность
 """
 
+import copy
 import json
+import logging
 import os
+import threading
 import time
 from pathlib import Path
-from typing import List, Dict, Optional, Any
+from typing import Callable, List, Dict, Optional, Any
 import argparse
-from dataclasses import dataclass
+import asyncio
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED, TimeoutError as FutureTimeoutError
+from contextlib import contextmanager
+from dataclasses import dataclass, replace
+from functools import partial
+
+logger = logging.getLogger('translatecore.enhanced')
+
+# Импортируем хранилище кеша
+try:
+    from .cache_store import (get_shared_cache_store, import_json_cache, make_cache_key,
+                              cache_key_prefix, split_legacy_key, DEFAULT_CACHE_BACKEND,
+                              WriteBehindConfig,
+                              pack_value, unpack_value, check_compression)
+    from .memory_cache import MemoryCacheConfig
+    from .cache_snapshot import open_snapshot
+    from .tiered_cache import TieredCache
+    from .translation_memory import TranslationMemory, TranslationMemoryConfig, TranslationMemoryMatch
+    from .text_normalization import NormalizedText, collapse_whitespace, normalize_text
+    from .offline_backend import OfflineBackendManager, OfflineBackendConfig
+    from .batch_providers import (NATIVE_BATCH_TRANSLATORS, NATIVE_MULTI_TARGET_TRANSLATORS,
+                                  split_batches, get_batch_limits)
+    from .hedging import HedgingConfig, LatencyTracker
+    from .service_router import AdaptiveRouter, RouterConfig
+    from .circuit_breaker import CircuitBreaker, CircuitBreakerConfig
+    from .rate_limiter import RateLimit, TokenBucket, get_rate_limiter, rate_limit_from_settings
+    from .retry_policy import RetryConfig, Deadline, DeadlineExceeded, is_retryable, backoff_delay
+    from .text_segmenter import SegmentationConfig, Segment, split_text, join_segments
+    from .single_flight import SingleFlight
+except ImportError:
+    from cache_store import (get_shared_cache_store, import_json_cache, make_cache_key,
+                             cache_key_prefix, split_legacy_key, DEFAULT_CACHE_BACKEND,
+                             WriteBehindConfig,
+                             pack_value, unpack_value, check_compression)
+    from memory_cache import MemoryCacheConfig
+    from cache_snapshot import open_snapshot
+    from tiered_cache import TieredCache
+    from translation_memory import TranslationMemory, TranslationMemoryConfig, TranslationMemoryMatch
+    from text_normalization import NormalizedText, collapse_whitespace, normalize_text
+    from offline_backend import OfflineBackendManager, OfflineBackendConfig
+    from batch_providers import (NATIVE_BATCH_TRANSLATORS, NATIVE_MULTI_TARGET_TRANSLATORS,
+                                 split_batches, get_batch_limits)
+    from hedging import HedgingConfig, LatencyTracker
+    from service_router import AdaptiveRouter, RouterConfig
+    from circuit_breaker import CircuitBreaker, CircuitBreakerConfig
+    from rate_limiter import RateLimit, TokenBucket, get_rate_limiter, rate_limit_from_settings
+    from retry_policy import RetryConfig, Deadline, DeadlineExceeded, is_retryable, backoff_delay
+    from text_segmenter import SegmentationConfig, Segment, split_text, join_segments
+    from single_flight import SingleFlight
 
 # Импортируем загрузчик конфигурации
 try:
@@ -22,7 +73,7 @@ except ImportError:
         from config_loader import APIConfigLoader, ConfigurationError
         CONFIG_LOADER_AVAILABLE = True
     except ImportError:
-        print("⚠️ config_loader не найден, используется базовая конфигурация")
+        logger.warning("config_loader не найден, используется базовая конфигурация")
         CONFIG_LOADER_AVAILABLE = False
 
 # Импортируем оффлайн переводчик
@@ -34,7 +85,7 @@ except ImportError:
         from offline_translator import OfflineTranslator, OfflineTranslationResult
         OFFLINE_TRANSLATOR_AVAILABLE = True
     except ImportError:
-        print("⚠️ offline_translator не найден, оффлайн перевод недоступен")
+        logger.warning("offline_translator не найден, оффлайн перевод недоступен")
         OFFLINE_TRANSLATOR_AVAILABLE = False
 
 # Импортируем deep-translator
@@ -53,8 +104,7 @@ try:
     )
     DEEP_TRANSLATOR_AVAILABLE = True
 except ImportError as e:
-    print(f"❌ Ошибка импорта deep-translator: {e}")
-    print("Установите библиотеку: pip install deep-translator")
+    logger.error("Ошибка импорта deep-translator: %s. Установите библиотеку: pip install deep-translator", e)
     DEEP_TRANSLATOR_AVAILABLE = False
 
 
@@ -81,7 +131,7 @@ class EnhancedTranslator:
     LANGUAGE_MAPPINGS = {
         'russian': {'google': 'ru', 'libre': 'ru', 'mymemory': 'ru-RU'},
         'english': {'google': 'en', 'libre': 'en', 'mymemory': 'en-US'},
-        'chinese': {'google': 'zh-cn', 'libre': 'zh', 'mymemory': 'zh'},
+        'chinese': {'google': 'zh-cn', 'libre': 'zh', 'mymemory': 'zh', 'microsoft': 'zh-hans'},
         'japanese': {'google': 'ja', 'libre': 'ja', 'mymemory': 'ja'},
         'korean': {'google': 'ko', 'libre': 'ko', 'mymemory': 'ko'},
         'german': {'google': 'de', 'libre': 'de', 'mymemory': 'de'},
@@ -97,25 +147,57 @@ class EnhancedTranslator:
     
     # Доступные сервисы и их приоритеты
     AVAILABLE_SERVICES = {
-        'offline': {'class': None, 'priority': 0, 'free': True},  # Оффлайн переводчик - высший приоритет
-        'google': {'class': GoogleTranslator, 'priority': 1, 'free': True},
-        'libre': {'class': LibreTranslator, 'priority': 2, 'free': True},
-        'mymemory': {'class': MyMemoryTranslator, 'priority': 3, 'free': True},
+        'offline': {'class': None, 'priority': 0, 'free': True, 'max_concurrency': 1},  # Оффлайн переводчик - высший приоритет
+        'google': {'class': GoogleTranslator, 'priority': 1, 'free': True, 'max_chars': 5000},
+        'libre': {'class': LibreTranslator, 'priority': 2, 'free': True, 'max_chars': 5000},
+        'mymemory': {'class': MyMemoryTranslator, 'priority': 3, 'free': True, 'max_chars': 500},
         'pons': {'class': PonsTranslator, 'priority': 4, 'free': True},
         'linguee': {'class': LingueeTranslator, 'priority': 5, 'free': True},
-        'microsoft': {'class': MicrosoftTranslator, 'priority': 6, 'free': False},
-        'yandex': {'class': YandexTranslator, 'priority': 7, 'free': False},
-        'deepl': {'class': DeeplTranslator, 'priority': 8, 'free': False},
-        'chatgpt': {'class': ChatGptTranslator, 'priority': 9, 'free': False},
-        'papago': {'class': PapagoTranslator, 'priority': 10, 'free': False}
+        'microsoft': {'class': MicrosoftTranslator, 'priority': 6, 'free': False, 'max_chars': 10000},
+        'yandex': {'class': YandexTranslator, 'priority': 7, 'free': False, 'max_chars': 10000},
+        'deepl': {'class': DeeplTranslator, 'priority': 8, 'free': False, 'max_chars': 30000},
+        'chatgpt': {'class': ChatGptTranslator, 'priority': 9, 'free': False, 'max_chars': 4000},
+        'papago': {'class': PapagoTranslator, 'priority': 10, 'free': False, 'max_chars': 5000}
     }
     
+    # Одновременных запросов к сервису по умолчанию (переопределяется 'service_settings' в конфигурации)
+    DEFAULT_SERVICE_CONCURRENCY = 4
+    
+    # Размер части длинного текста, если у сервисов цепочки нет max_chars
+    DEFAULT_SEGMENT_CHARS = 5000
+    
+    # Во сколько раз перевод платного сервиса "дороже" бесплатного (политика кеша 'cost')
+    PAID_SERVICE_COST_WEIGHT = 10.0
+    
+    # Пространство имен записей переводчика в общем кеше
+    CACHE_NAMESPACE = 'enhanced'
+    
+    # Пространство имен сегментов памяти переводов в общем кеше
+    MEMORY_NAMESPACE = 'tm'
+    
     def __init__(self, source_lang: str, target_lang: str, 
                  preferred_services: List[str] = None,
                  cache_file: Optional[str] = None,
                  api_keys: Dict[str, str] = None,
                  config_file: Optional[str] = None,
-                 service_config_name: Optional[str] = None):
+                 service_config_name: Optional[str] = None,
+                 cache_backend: str = DEFAULT_CACHE_BACKEND,
+                 memory_cache: Optional[MemoryCacheConfig] = None,
+                 write_behind: Optional[WriteBehindConfig] = None,
+                 cache_snapshot: Optional[str] = None,
+                 cache_compression: Optional[str] = None,
+                 translation_memory: Optional[TranslationMemoryConfig] = None,
+                 normalize: bool = True,
+                 offline_backend: Optional[OfflineBackendConfig] = None,
+                 lazy_services: bool = True,
+                 max_workers: int = 8,
+                 service_concurrency: Optional[Dict[str, int]] = None,
+                 hedging: Optional[HedgingConfig] = None,
+                 routing: Optional[RouterConfig] = None,
+                 circuit_breaker: Optional[CircuitBreakerConfig] = None,
+                 rate_limits: Optional[Dict[str, RateLimit]] = None,
+                 retry: Optional[RetryConfig] = None,
+                 segmentation: Optional[SegmentationConfig] = None):
         """
         Инициализация переводчика
         
@@ -123,10 +205,27 @@ class EnhancedTranslator:
             source_lang: Исходный язык
             target_lang: Целевой язык
             preferred_services: Предпочтительные сервисы в порядке приоритета
-            cache_file: Файл кеша переводов
+            cache_file: Файл кеша переводов (по умолчанию - общее хранилище для всех пар и процессов)
             api_keys: API ключи для платных сервисов
             config_file: Путь к файлу конфигурации API ключей
             service_config_name: Название конфигурации сервиса из файла
+            cache_backend: Бэкенд хранилища кеша ('sqlite', 'append', 'json')
+            memory_cache: Настройки ограниченного кеша в памяти
+            write_behind: Настройки отложенной записи кеша (None - запись сразу)
+            cache_snapshot: Файл снапшота кеша только для чтения (см. cache_snapshot.py)
+            cache_compression: Сжатие длинных переводов в хранилище ('zlib', 'lzma' или None)
+            translation_memory: Настройки нечеткой памяти переводов (None - выключена)
+            normalize: Нормализовать текст перед поиском в кеше и переводом
+            offline_backend: Настройки жизненного цикла оффлайн бэкенда (прогрев, восстановление)
+            lazy_services: Создавать переводчики сервисов при первом обращении, а не в конструкторе
+            max_workers: Потоков для параллельного translate_batch
+            service_concurrency: Максимум одновременных запросов к сервисам (поверх конфигурации)
+            hedging: Настройки хеджирования запросов в translate() и translate_batch() (None - выключено)
+            routing: Настройки адаптивного порядка сервисов (None - порядок preferred_services)
+            circuit_breaker: Настройки предохранителей сервисов (по умолчанию включены)
+            rate_limits: Лимиты частоты запросов к сервисам (поверх конфигурации)
+            retry: Настройки повторов после временных ошибок (по умолчанию 3 попытки на сервис)
+            segmentation: Настройки разбиения длинных текстов на части (по умолчанию включено)
         """
         if not DEEP_TRANSLATOR_AVAILABLE:
             raise ImportError("deep-translator не установлен")
@@ -135,6 +234,7 @@ class EnhancedTranslator:
         self.target_lang = target_lang.lower()
         
         # Загружаем API ключи из конфигурационного файла, если указан
+        self.service_settings = {}
         if config_file and CONFIG_LOADER_AVAILABLE:
             try:
                 config_loader = APIConfigLoader(config_file)
@@ -142,16 +242,17 @@ class EnhancedTranslator:
                     # Загружаем конфигурацию сервисов и API ключи
                     self.preferred_services = config_loader.get_services_for_config(service_config_name)
                     loaded_api_keys = config_loader.get_api_keys(service_config_name)
-                    print(f"📋 Загружена конфигурация '{service_config_name}'")
-                    print(f"🔧 Сервисы: {', '.join(self.preferred_services)}")
+                    logger.info("Загружена конфигурация '%s', сервисы: %s",
+                                service_config_name, ', '.join(self.preferred_services))
                 else:
                     loaded_api_keys = config_loader.get_api_keys()
                 
                 # Объединяем загруженные ключи с переданными
                 self.api_keys = {**loaded_api_keys, **(api_keys or {})}
+                self.service_settings = config_loader.get_service_settings(service_config_name)
                 
             except ConfigurationError as e:
-                print(f"❌ Ошибка загрузки конфигурации: {e}")
+                logger.error("Ошибка загрузки конфигурации: %s", e)
                 self.api_keys = api_keys or {}
         else:
             self.api_keys = api_keys or {}
@@ -166,72 +267,225 @@ class EnhancedTranslator:
             else:
                 self.preferred_services = ['google', 'libre', 'mymemory', 'pons']
         
-        # Статистика (инициализируем раньше)
+        # Статистика (инициализируем раньше); обновляется из потоков translate_batch
+        self._stats_lock = threading.Lock()
         self.stats = {
             'total_requests': 0,
             'cache_hits': 0,
+            'normalized_hits': 0,
+            'memory_hits': 0,
+            'batch_texts': 0,
+            'batch_unique_texts': 0,
+            'hedge_candidates': 0,
+            'hedged_requests': 0,
+            'hedge_wins': 0,
+            'rate_limited': 0,
+            'retries': 0,
+            'deadline_exceeded': 0,
+            'segmented_requests': 0,
+            'segments': 0,
+            'coalesced': 0,
+            'multi_target_requests': 0,
             'service_usage': {},
             'errors': []
         }
         
-        # Инициализируем кеш
-        self.cache_file = cache_file or f"translation_cache_{self.source_lang}_{self.target_lang}.json"
+        # Инициализируем кеш: общее хранилище + ограниченный кеш в памяти
+        self.normalize = normalize
+        check_compression(cache_compression)
+        self.cache_compression = cache_compression
+        self.cache_backend = cache_backend
+        self.cache_store = get_shared_cache_store(cache_file, cache_backend)
+        self.cache_file = str(self.cache_store.path)
+        self._cache_prefix = cache_key_prefix(self.source_lang, self.target_lang, self.CACHE_NAMESPACE)
+        self.memory_cache_config = memory_cache
+        
+        # Однократно переносим кеш старого формата
+        if cache_file and cache_file.endswith('.json'):
+            self._import_legacy_cache(cache_file)
+        else:
+            self._import_legacy_cache(f"translation_cache_{self.source_lang}_{self.target_lang}.json")
+        
+        # Отложенная запись убирает дисковый ввод-вывод из translate(); обертка общая для процесса
+        self.write_behind = write_behind
+        if write_behind:
+            self.cache_store = get_shared_cache_store(cache_file, cache_backend, write_behind)
+        
+        # Снапшот отображается в память и разделяется между процессами
+        self.cache_snapshot_file = cache_snapshot
+        self.cache_snapshot = open_snapshot(cache_snapshot) if cache_snapshot else None
+        
+        # Один многоуровневый кеш на переводчик, его оффлайн переводчик и SmartCodeAwareTranslator
         self.cache = self._load_cache()
         
-        # Инициализируем переводчики
+        # Нечеткая память переводов рядом с точным кешем
+        self._memory_prefix = cache_key_prefix(self.source_lang, self.target_lang, self.MEMORY_NAMESPACE)
+        self.translation_memory = None
+        if translation_memory:
+            self.translation_memory = TranslationMemory(translation_memory)
+            self._load_translation_memory()
+        
+        # Оффлайн бэкенд создается один раз и живет вместе с переводчиком
+        self.offline_backend_config = offline_backend
+        self.offline_backend = None
+        
+        # Переводчики создаются при первом обращении к сервису
+        self.lazy_services = lazy_services
         self.translators = {}
+        self._service_locks: Dict[str, threading.Lock] = {}
+        self._service_semaphores: Dict[str, threading.BoundedSemaphore] = {}
+        self._failed_services = set()
+        self.circuit_breaker_config = circuit_breaker or CircuitBreakerConfig()
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self.rate_limits = rate_limits or {}
+        self.retry = retry or RetryConfig()
+        self.segmentation = segmentation or SegmentationConfig()
+        self._single_flight = SingleFlight()
+        self._target_translators: Dict[str, 'EnhancedTranslator'] = {}
+        self._rate_limiters: Dict[str, TokenBucket] = {}
+        self.max_workers = max_workers
+        self.service_concurrency = service_concurrency or {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._hedge_executor: Optional[ThreadPoolExecutor] = None
+        self._deadline_executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+        
+        # Хеджирование запросов по замеренным задержкам сервисов
+        self.hedging = hedging
+        self.latency = LatencyTracker()
+        
+        # Адаптивный порядок сервисов по задержкам и ошибкам
+        self._pair = f"{self.source_lang}-{self.target_lang}"
+        self.router = None
+        if routing:
+            paid_services = [name for name, info in self.AVAILABLE_SERVICES.items() if not info['free']]
+            self.router = AdaptiveRouter(routing, paid_services)
         self._init_translators()
     
-    def _load_cache(self) -> Dict[str, TranslationResult]:
-        """Загружает кеш переводов"""
-        cache_path = Path(self.cache_file)
-        if cache_path.exists():
+    def _load_cache(self) -> TieredCache:
+        """
+        Создает многоуровневый кеш переводов (память -> снапшот -> хранилище)
+        
+        Записи подгружаются из хранилища по мере обращения, а не все сразу при запуске
+        """
+        return TieredCache(
+            self.cache_store,
+            memory_cache=self.memory_cache_config,
+            snapshot=self.cache_snapshot,
+            compression=self.cache_compression,
+            cost=lambda record: self._cache_cost(record.get('service', 'unknown'))
+        )
+    
+    def _import_legacy_cache(self, json_path: str):
+        """Импортирует JSON кеш старого формата в общее хранилище"""
+        try:
+            import_json_cache(self.cache_store, json_path, self._convert_legacy_entry)
+        except Exception as e:
+            logger.warning("Ошибка импорта кеша %s: %s", json_path, e)
+    
+    def _load_translation_memory(self):
+        """Загружает сегменты памяти переводов своей языковой пары из хранилища"""
+        if not self.translation_memory.config.persist:
+            return
+        try:
+            for _, value in self.cache_store.items(self._memory_prefix):
+                self.translation_memory.add(value['o'], value['t'], value.get('s', 'unknown'))
+        except Exception as e:
+            logger.warning("Ошибка загрузки памяти переводов: %s", e)
+    
+    def _memory_add(self, result: TranslationResult):
+        """Добавляет перевод в память переводов"""
+        if self.translation_memory is None:
+            return
+        self.translation_memory.add(result.original, result.translated, result.service)
+        if self.translation_memory.config.persist:
+            key = make_cache_key(result.original, self.source_lang, self.target_lang, self.MEMORY_NAMESPACE)
             try:
-                with open(cache_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    # Конвертируем словари обратно в TranslationResult
-                    cache = {}
-                    for key, value in data.items():
-                        if isinstance(value, dict) and 'original' in value:
-                            cache[key] = TranslationResult(**value)
-                        else:
-                            # Старый формат кеша
-                            cache[key] = TranslationResult(
-                                original=key,
-                                translated=value,
-                                source_lang=self.source_lang,
-                                target_lang=self.target_lang,
-                                service='unknown'
-                            )
-                    return cache
+                self.cache_store.set(key, {'o': result.original, 't': result.translated, 's': result.service})
             except Exception as e:
-                print(f"Ошибка загрузки кеша: {e}")
+                logger.warning("Ошибка сохранения памяти переводов: %s", e)
+    
+    def find_similar(self, text: str, threshold: Optional[float] = None) -> Optional[TranslationMemoryMatch]:
+        """
+        Ищет похожий ранее переведенный сегмент в памяти переводов
         
-        return {}
+        Args:
+            text: Текст для поиска
+            threshold: Минимальное сходство (по умолчанию - из настроек памяти)
+            
+        Returns:
+            Optional[TranslationMemoryMatch]: Совпадение (можно принять или использовать как подсказку)
+        """
+        if self.translation_memory is None:
+            return None
+        return self.translation_memory.lookup(text, threshold)
+    
+    def _convert_legacy_entry(self, key: str, value: Any):
+        """Конвертирует запись 'текст|source|target' в ключ и значение общего кеша"""
+        parts = split_legacy_key(key)
+        if parts is None:
+            return None
+        text, source_lang, target_lang = parts
+        record = unpack_value(value)
+        record.setdefault('service', 'unknown')
+        return (make_cache_key(text, source_lang, target_lang, self.CACHE_NAMESPACE),
+                pack_value(record, self.cache_compression))
+    
+    def _cache_get(self, key: str, text: str) -> Optional[TranslationResult]:
+        """Ищет перевод в памяти, затем в снапшоте и в постоянном хранилище"""
+        try:
+            record = self.cache.get(key)
+        except Exception as e:
+            logger.warning("Ошибка загрузки кеша: %s", e)
+            return None
+        if record is None:
+            return None
+        return self._result_from_record(text, record)
+    
+    def _cache_put(self, key: str, result: TranslationResult, elapsed: float = 0.0):
+        """Сохраняет перевод в памяти и в постоянном хранилище"""
+        try:
+            self.cache.set(key, self._record_from_result(result),
+                           cost=self._cache_cost(result.service, elapsed))
+        except Exception as e:
+            logger.warning("Ошибка сохранения кеша: %s", e)
+        self._memory_add(result)
+    
+    def _cache_cost(self, service: str, elapsed: float = 0.0) -> float:
+        """Оценивает стоимость повторного получения перевода: платность сервиса и время запроса"""
+        service_info = self.AVAILABLE_SERVICES.get(service.split('_')[0], {})
+        weight = 1.0 if service_info.get('free', True) else self.PAID_SERVICE_COST_WEIGHT
+        return weight * (1.0 + elapsed)
+    
+    @staticmethod
+    def _record_from_result(result: TranslationResult) -> Dict[str, Any]:
+        """Запись кеша без исходного текста и языковой пары (они известны из запроса)"""
+        return {
+            'translated': result.translated,
+            'service': result.service,
+            'confidence': result.confidence,
+            'alternatives': result.alternatives,
+            'created': int(time.time())
+        }
+    
+    def _result_from_record(self, text: str, record: Dict[str, Any]) -> TranslationResult:
+        """Восстанавливает TranslationResult из записи кеша"""
+        return TranslationResult(
+            original=text,
+            translated=record['translated'],
+            source_lang=self.source_lang,
+            target_lang=self.target_lang,
+            service=record.get('service', 'unknown'),
+            confidence=record.get('confidence', 0.0),
+            alternatives=list(record.get('alternatives', []))
+        )
     
     def _save_cache(self):
-        """Сохраняет кеш переводов"""
+        """Сохраняет весь кеш переводов"""
         try:
-            # Конвертируем TranslationResult в словари для JSON
-            cache_data = {}
-            for key, result in self.cache.items():
-                if isinstance(result, TranslationResult):
-                    cache_data[key] = {
-                        'original': result.original,
-                        'translated': result.translated,
-                        'source_lang': result.source_lang,
-                        'target_lang': result.target_lang,
-                        'service': result.service,
-                        'confidence': result.confidence,
-                        'alternatives': result.alternatives
-                    }
-                else:
-                    cache_data[key] = result
-            
-            with open(self.cache_file, 'w', encoding='utf-8') as f:
-                json.dump(cache_data, f, ensure_ascii=False, indent=2)
+            self.cache.save()
         except Exception as e:
-            print(f"Ошибка сохранения кеша: {e}")
+            logger.warning("Ошибка сохранения кеша: %s", e)
     
     def _get_lang_code(self, lang: str, service: str) -> str:
         """Получает код языка для конкретного сервиса"""
@@ -241,218 +495,952 @@ class EnhancedTranslator:
         return lang
     
     def _init_translators(self):
-        """Инициализирует доступные переводчики"""
+        """Проверяет настроенные сервисы; при lazy_services=False сразу создает переводчики"""
         for service_name in self.preferred_services:
             if service_name not in self.AVAILABLE_SERVICES:
-                print(f"⚠️ Неизвестный сервис: {service_name}")
+                logger.warning("Неизвестный сервис: %s", service_name)
                 continue
+            self._service_locks[service_name] = threading.Lock()
+            self._service_semaphores[service_name] = threading.BoundedSemaphore(
+                self._get_service_concurrency(service_name)
+            )
+            if self.circuit_breaker_config.enabled:
+                self._breakers[service_name] = CircuitBreaker(self._get_breaker_config(service_name))
             
-            service_info = self.AVAILABLE_SERVICES[service_name]
-            translator_class = service_info['class']
+            # Корзина общая для всех переводчиков процесса с тем же API ключом
+            rate_limit = self._get_rate_limit(service_name)
+            if rate_limit is not None:
+                self._rate_limiters[service_name] = get_rate_limiter(
+                    service_name, self.api_keys.get(service_name), rate_limit
+                )
+        
+        if not self.lazy_services:
+            for service_name in self._service_locks:
+                self._get_translator(service_name)
+    
+    def _get_service_concurrency(self, service_name: str) -> int:
+        """Максимум одновременных запросов к сервису: аргумент, конфигурация, значение по умолчанию"""
+        if service_name in self.service_concurrency:
+            return max(1, self.service_concurrency[service_name])
+        settings = self.service_settings.get(service_name, {})
+        if 'max_concurrency' in settings:
+            return max(1, int(settings['max_concurrency']))
+        return self.AVAILABLE_SERVICES[service_name].get('max_concurrency', self.DEFAULT_SERVICE_CONCURRENCY)
+    
+    def _count(self, name: str, amount: int = 1):
+        """Потокобезопасно увеличивает счетчик статистики"""
+        with self._stats_lock:
+            self.stats[name] += amount
+    
+    def _record_usage(self, service_name: str):
+        with self._stats_lock:
+            self.stats['service_usage'][service_name] = self.stats['service_usage'].get(service_name, 0) + 1
+    
+    def _record_error(self, error_msg: str):
+        with self._stats_lock:
+            self.stats['errors'].append(error_msg)
+    
+    def _get_translator(self, service_name: str):
+        """
+        Возвращает переводчик сервиса, создавая его при первом обращении
+        
+        Returns:
+            Переводчик или None, если сервис не настроен или не инициализировался
+        """
+        translator = self.translators.get(service_name)
+        if translator is not None or service_name in self._failed_services:
+            return translator
+        
+        lock = self._service_locks.get(service_name)
+        if lock is None:
+            return None
+        
+        # Сервисы создаются параллельно, но каждый - только один раз
+        with lock:
+            translator = self.translators.get(service_name)
+            if translator is None and service_name not in self._failed_services:
+                translator = self._create_translator(service_name)
+                if translator is None:
+                    self._failed_services.add(service_name)
+                else:
+                    self.translators[service_name] = translator
+            return translator
+    
+    def _create_translator(self, service_name: str):
+        """Создает переводчик сервиса"""
+        service_info = self.AVAILABLE_SERVICES[service_name]
+        translator_class = service_info['class']
+        
+        try:
+            # Получаем коды языков для этого сервиса
+            source_code = self._get_lang_code(self.source_lang, service_name)
+            target_code = self._get_lang_code(self.target_lang, service_name)
             
-            try:
-                # Получаем коды языков для этого сервиса
-                source_code = self._get_lang_code(self.source_lang, service_name)
-                target_code = self._get_lang_code(self.target_lang, service_name)
-                
-                # Инициализируем переводчик в зависимости от типа
-                if service_name == 'google':
-                    translator = translator_class(source=source_code, target=target_code)
-                
-                elif service_name == 'libre':
-                    # LibreTranslator может требовать API ключ, попробуем бесплатный сервер
-                    api_key = self.api_keys.get('libre')
-                    base_url = self.api_keys.get('libre_url', 'https://libretranslate.de')
-                    if api_key:
-                        translator = translator_class(source=source_code, target=target_code, api_key=api_key, base_url=base_url)
-                    else:
-                        # Используем публичный сервер без ключа
-                        translator = translator_class(source=source_code, target=target_code, base_url=base_url)
-                
-                elif service_name == 'mymemory':
-                    translator = translator_class(source=source_code, target=target_code)
-                
-                elif service_name in ['pons', 'linguee']:
-                    # Для словарных переводчиков используем полные названия языков
-                    source_name = self.source_lang
-                    target_name = self.target_lang
-                    translator = translator_class(source=source_name, target=target_name)
-                
-                elif service_name == 'microsoft':
-                    api_key = self.api_keys.get('microsoft')
-                    if not api_key:
-                        print(f"⚠️ Microsoft Translator требует API ключ")
-                        continue
-                    translator = translator_class(api_key=api_key, target=target_code)
-                
-                elif service_name == 'yandex':
-                    api_key = self.api_keys.get('yandex')
-                    if not api_key:
-                        print(f"⚠️ Yandex Translator требует API ключ")
-                        continue
-                    translator = translator_class(api_key=api_key)
-                
-                elif service_name == 'deepl':
-                    api_key = self.api_keys.get('deepl')
-                    if not api_key:
-                        print(f"⚠️ DeepL требует API ключ")
-                        continue
-                    translator = translator_class(api_key=api_key, source=source_code, target=target_code)
-                
-                elif service_name == 'chatgpt':
-                    api_key = self.api_keys.get('openai') or os.getenv('OPENAI_API_KEY')
-                    if not api_key:
-                        print(f"⚠️ ChatGPT требует API ключ")
-                        continue
-                    translator = translator_class(api_key=api_key, target=target_code)
-                
-                elif service_name == 'papago':
-                    client_id = self.api_keys.get('papago_client_id')
-                    secret_key = self.api_keys.get('papago_secret_key')
-                    if not client_id or not secret_key:
-                        print(f"⚠️ Papago требует client_id и secret_key")
-                        continue
-                    translator = translator_class(client_id=client_id, secret_key=secret_key, 
-                                                source=source_code, target=target_code)
-                
-                elif service_name == 'offline':
-                    # Оффлайн переводчик
-                    if OFFLINE_TRANSLATOR_AVAILABLE:
-                        translator = OfflineTranslator(
+            # Инициализируем переводчик в зависимости от типа
+            if service_name == 'google':
+                translator = translator_class(source=source_code, target=target_code)
+            
+            elif service_name == 'libre':
+                # LibreTranslator может требовать API ключ, попробуем бесплатный сервер
+                api_key = self.api_keys.get('libre')
+                base_url = self.api_keys.get('libre_url', 'https://libretranslate.de')
+                if api_key:
+                    translator = translator_class(source=source_code, target=target_code, api_key=api_key, base_url=base_url)
+                else:
+                    # Используем публичный сервер без ключа
+                    translator = translator_class(source=source_code, target=target_code, base_url=base_url)
+            
+            elif service_name == 'mymemory':
+                translator = translator_class(source=source_code, target=target_code)
+            
+            elif service_name in ['pons', 'linguee']:
+                # Для словарных переводчиков используем полные названия языков
+                source_name = self.source_lang
+                target_name = self.target_lang
+                translator = translator_class(source=source_name, target=target_name)
+            
+            elif service_name == 'microsoft':
+                api_key = self.api_keys.get('microsoft')
+                if not api_key:
+                    logger.warning("Microsoft Translator требует API ключ")
+                    return None
+                translator = translator_class(api_key=api_key, target=target_code)
+            
+            elif service_name == 'yandex':
+                api_key = self.api_keys.get('yandex')
+                if not api_key:
+                    logger.warning("Yandex Translator требует API ключ")
+                    return None
+                translator = translator_class(api_key=api_key)
+            
+            elif service_name == 'deepl':
+                api_key = self.api_keys.get('deepl')
+                if not api_key:
+                    logger.warning("DeepL требует API ключ")
+                    return None
+                translator = translator_class(api_key=api_key, source=source_code, target=target_code)
+            
+            elif service_name == 'chatgpt':
+                api_key = self.api_keys.get('openai') or os.getenv('OPENAI_API_KEY')
+                if not api_key:
+                    logger.warning("ChatGPT требует API ключ")
+                    return None
+                translator = translator_class(api_key=api_key, target=target_code)
+            
+            elif service_name == 'papago':
+                client_id = self.api_keys.get('papago_client_id')
+                secret_key = self.api_keys.get('papago_secret_key')
+                if not client_id or not secret_key:
+                    logger.warning("Papago требует client_id и secret_key")
+                    return None
+                translator = translator_class(client_id=client_id, secret_key=secret_key, 
+                                            source=source_code, target=target_code)
+            
+            elif service_name == 'offline':
+                # Оффлайн переводчик
+                if OFFLINE_TRANSLATOR_AVAILABLE:
+                    offline_backend = OfflineBackendManager(
+                        lambda: OfflineTranslator(
                             source_lang=self.source_lang,
                             target_lang=self.target_lang,
-                            cache_file=f"offline_cache_{self.source_lang}_{self.target_lang}.json"
-                        )
-                    else:
-                        print(f"⚠️ Оффлайн переводчик недоступен")
-                        continue
-                
+                            cache=self.cache
+                        ),
+                        self.offline_backend_config
+                    )
+                    translator = offline_backend.start()
+                    self.offline_backend = offline_backend
                 else:
-                    print(f"⚠️ Переводчик {service_name} не реализован")
-                    continue
-                
-                self.translators[service_name] = translator
-                print(f"✅ Инициализирован переводчик: {service_name}")
-                
-            except Exception as e:
-                print(f"❌ Ошибка инициализации {service_name}: {e}")
-                self.stats['errors'].append(f"{service_name}: {str(e)}")
+                    logger.warning("Оффлайн переводчик недоступен")
+                    return None
+            
+            else:
+                logger.warning("Переводчик %s не реализован", service_name)
+                return None
+            
+            logger.info("Инициализирован переводчик: %s", service_name)
+            return translator
+            
+        except Exception as e:
+            logger.error("Ошибка инициализации %s: %s", service_name, e)
+            self._record_error(f"{service_name}: {str(e)}")
+            return None
     
-    def translate(self, text: str, use_cache: bool = True) -> TranslationResult:
+    def translate(self, text: str, use_cache: bool = True,
+                  timeout: Optional[float] = None) -> TranslationResult:
         """
         Переводит текст используя доступные сервисы
         
+        Текст длиннее ограничения сервисов (max_chars) делится по абзацам и предложениям,
+        части переводятся параллельно и собираются с исходными разделителями.
+        Одновременные запросы одного текста из разных потоков выполняются одним обращением к сервисам.
+        
         Args:
             text: Текст для перевода
             use_cache: Использовать кеш
+            timeout: Общий лимит времени на всю цепочку сервисов и повторов в секундах
             
         Returns:
             TranslationResult: Результат перевода
+            
+        Raises:
+            DeadlineExceeded: Если перевод не уложился в timeout
         """
-        self.stats['total_requests'] += 1
+        self._count('total_requests')
+        deadline = Deadline(timeout) if timeout is not None else None
+        
+        if not self.normalize:
+            return self._translate_text(text, use_cache, deadline=deadline)
         
+        # Варианты одной строки переводятся и кешируются один раз,
+        # снятые с краев пробелы и пунктуация возвращаются в перевод
+        normalized = normalize_text(text)
+        if normalized.core == text:
+            return self._translate_text(text, use_cache, deadline=deadline)
+        
+        result = self._translate_text(normalized.core, use_cache, normalized=True, deadline=deadline)
+        return self._restore_edges(text, normalized, result)
+    
+    def _translate_text(self, text: str, use_cache: bool = True, normalized: bool = False,
+                        deadline: Optional[Deadline] = None,
+                        segments: Optional[List[Segment]] = None) -> TranslationResult:
+        """
+        Переводит уже нормализованный текст
+        
+        Args:
+            text: Текст для перевода
+            use_cache: Использовать кеш
+            normalized: Текст получен нормализацией запроса (для статистики попаданий)
+            deadline: Общий срок перевода
+            segments: Готовое разбиение длинного текста (translate_multi делит текст один раз)
+            
+        Returns:
+            TranslationResult: Результат перевода
+        """
         # Проверяем кеш
-        cache_key = f"{text}|{self.source_lang}|{self.target_lang}"
-        if use_cache and cache_key in self.cache:
-            self.stats['cache_hits'] += 1
-            return self.cache[cache_key]
+        cache_key = self._cache_key(text)
+        if use_cache:
+            cached = self._lookup_cached(cache_key, text, normalized or self._key_text(text) != text)
+            if cached is not None:
+                return cached
+            return self._translate_coalesced(text, cache_key, deadline, segments)
         
-        # Пробуем переводчики по порядку приоритета
-        for service_name in self.preferred_services:
-            # Специальная обработка для оффлайн переводчика
-            if service_name == 'offline' and OFFLINE_TRANSLATOR_AVAILABLE:
+        return self._translate_uncached(text, cache_key, use_cache, deadline, segments)
+    
+    def _translate_coalesced(self, text: str, cache_key: str, deadline: Optional[Deadline] = None,
+                             segments: Optional[List[Segment]] = None,
+                             services: Optional[List[str]] = None) -> TranslationResult:
+        """Переводит промах кеша; одновременные запросы того же текста ждут первый вместо повторного обращения к сервисам"""
+        translate = partial(self._translate_uncached, text, cache_key, True, deadline, segments, services)
+        try:
+            result, shared = self._single_flight.do(cache_key, translate,
+                                                    timeout=deadline.remaining() if deadline else None)
+        except DeadlineExceeded:
+            # Истек срок первого запроса, а у этого запроса время еще есть
+            if deadline is not None and deadline.expired():
+                raise
+            return translate()
+        except TimeoutError:
+            self._count('deadline_exceeded')
+            raise DeadlineExceeded(f"Срок перевода {deadline.timeout}с истек")
+        if shared:
+            self._count('coalesced')
+            return replace(result)
+        return result
+    
+    def _key_text(self, text: str) -> str:
+        """Текст для ключа кеша: с нормализацией пробелы внутри схлопываются, сам текст уходит сервису как есть"""
+        return collapse_whitespace(text) if self.normalize else text
+    
+    def _cache_key(self, text: str) -> str:
+        return make_cache_key(self._key_text(text), self.source_lang, self.target_lang, self.CACHE_NAMESPACE)
+    
+    def _translate_uncached(self, text: str, cache_key: str, use_cache: bool,
+                            deadline: Optional[Deadline] = None,
+                            segments: Optional[List[Segment]] = None,
+                            services: Optional[List[str]] = None) -> TranslationResult:
+        """Переводит текст, которого нет в кеше, цепочкой сервисов (по умолчанию - всей цепочкой)"""
+        if services is None:
+            services = self._service_order()
+        try:
+            result = self._translate_chain(text, cache_key, services, use_cache, deadline, segments)
+        except DeadlineExceeded:
+            self._count('deadline_exceeded')
+            raise
+        return result if result is not None else self._fallback_result(text)
+    
+    def _translate_chain(self, text: str, cache_key: str, services: List[str], use_cache: bool = True,
+                         deadline: Optional[Deadline] = None,
+                         segments: Optional[List[Segment]] = None) -> Optional[TranslationResult]:
+        """
+        Переводит текст цепочкой сервисов, деля его на части только для сервисов с меньшим ограничением
+        
+        Текст целиком получают сервисы, в ограничение которых (max_chars) он укладывается.
+        Если ни один из них не перевел текст, он делится по наибольшему ограничению
+        оставшихся сервисов, и части переводятся всей цепочкой.
+        
+        Returns:
+            Optional[TranslationResult]: Результат или None, если текст не переведен
+        """
+        result = self._translate_with_services(text, cache_key, services, use_cache, deadline)
+        if result is not None:
+            return result
+        
+        segment_chars = self._split_chars(text, services)
+        if segment_chars is None:
+            return None
+        return self._translate_segmented(text, cache_key, segment_chars, use_cache, deadline, segments)
+    
+    def _service_chars(self, service_name: str) -> Optional[int]:
+        """Наибольшая длина текста в одном запросе к сервису (None - не ограничена)"""
+        # Словарные сервисы переводят только слова и в разбиении не участвуют
+        if not self.segmentation.enabled or service_name in ['pons', 'linguee']:
+            return None
+        if self.segmentation.max_chars:
+            return self.segmentation.max_chars
+        settings = self.service_settings.get(service_name, {})
+        limit = int(settings.get('max_chars', self.AVAILABLE_SERVICES[service_name].get('max_chars', 0)))
+        return limit if limit > 0 else self.DEFAULT_SEGMENT_CHARS
+    
+    def _fits_service(self, service_name: str, text: str) -> bool:
+        limit = self._service_chars(service_name)
+        return limit is None or len(text) <= limit
+    
+    def _split_chars(self, text: str, services: List[str]) -> Optional[int]:
+        """Размер частей для сервисов, не принимающих текст целиком (None - таких сервисов нет)"""
+        limits = [self._service_chars(name) for name in services if not self._fits_service(name, text)]
+        return max(limits) if limits else None
+    
+    def _segment_chars(self) -> Optional[int]:
+        """Длина, начиная с которой текст не принимает целиком ни один сервис цепочки (None - разбиение выключено)"""
+        if not self.segmentation.enabled:
+            return None
+        limits = [self._service_chars(name) for name in self._service_locks]
+        limits = [limit for limit in limits if limit is not None]
+        return max(limits) if limits else self.DEFAULT_SEGMENT_CHARS
+    
+    def _translate_segmented(self, text: str, cache_key: str, segment_chars: int, use_cache: bool,
+                             deadline: Optional[Deadline] = None,
+                             segments: Optional[List[Segment]] = None) -> TranslationResult:
+        """
+        Переводит длинный текст параллельно по частям и собирает его с исходными разделителями
+        
+        При cache_level='segments' в кеш попадает каждая часть, при 'whole' - только весь текст.
+        """
+        segments = segments or split_text(text, segment_chars)
+        self._count('segmented_requests')
+        self._count('segments', len(segments))
+        logger.debug("Текст разбит на %d частей до %d символов", len(segments), segment_chars)
+        
+        cache_segments = use_cache and self.segmentation.cache_level == 'segments'
+        
+        def translate_segment(segment):
+            part = segment[0]
+            if not part.strip():
+                return None
+            return self._translate_text(part, cache_segments, deadline=deadline)
+        
+        workers = self.segmentation.max_workers or self.max_workers
+        results = self._run_parallel(translate_segment, segments, workers)
+        return self._join_segment_results(text, cache_key, segments, results, use_cache)
+    
+    def _join_segment_results(self, text: str, cache_key: str, segments: List[Segment],
+                              results: List[Optional[TranslationResult]], use_cache: bool) -> TranslationResult:
+        """Собирает переводы частей (None - пустая часть) с исходными разделителями"""
+        translated_parts = [result.translated if result is not None else part
+                            for result, (part, _) in zip(results, segments)]
+        translated = [result for result in results if result is not None]
+        services = list(dict.fromkeys(result.service for result in translated))
+        result = TranslationResult(
+            original=text,
+            translated=join_segments(translated_parts, segments),
+            source_lang=self.source_lang,
+            target_lang=self.target_lang,
+            service='+'.join(services) if services else 'fallback',
+            confidence=min((result.confidence for result in translated), default=0.0)
+        )
+        
+        # Текст целиком кешируется, только если переведены все части
+        if use_cache and self.segmentation.cache_level == 'whole' and 'fallback' not in services:
+            self._cache_put(cache_key, result)
+        return result
+    
+    def _rate_allows(self, service_name: str) -> bool:
+        """Забирает маркер из корзины сервиса; False - лимит запросов исчерпан"""
+        bucket = self._rate_limiters.get(service_name)
+        if bucket is None or bucket.try_acquire():
+            return True
+        self._count('rate_limited')
+        return False
+    
+    def _get_rate_limit(self, service_name: str) -> Optional[RateLimit]:
+        """Лимит запросов к сервису: аргумент или 'rate_limit' и 'burst' из service_settings"""
+        if service_name in self.rate_limits:
+            return self.rate_limits[service_name]
+        return rate_limit_from_settings(self.service_settings.get(service_name))
+    
+    def _breaker_allows(self, service_name: str) -> bool:
+        """Пропускает ли предохранитель запрос к сервису"""
+        breaker = self._breakers.get(service_name)
+        return breaker is None or breaker.allow_request()
+    
+    @contextmanager
+    def _breaker_trial(self, service_name: str):
+        """
+        Запрос, пропущенный предохранителем
+        
+        При любом выходе, в том числе по отмене, сроку или лимиту запросов, возвращает
+        слот пробного запроса, если результат запроса не был учтен.
+        """
+        try:
+            yield
+        finally:
+            self._release_breaker(service_name)
+    
+    def _release_breaker(self, service_name: str):
+        """Возвращает слот пробного запроса, полученный в _breaker_allows, если запрос не состоялся"""
+        breaker = self._breakers.get(service_name)
+        if breaker is not None:
+            breaker.release()
+    
+    def _get_breaker_config(self, service_name: str) -> CircuitBreakerConfig:
+        """Настройки предохранителя сервиса с учетом 'failure_threshold' и 'cooldown' из service_settings"""
+        settings = self.service_settings.get(service_name, {})
+        overrides = {name: settings[name] for name in ('failure_threshold', 'cooldown') if name in settings}
+        return replace(self.circuit_breaker_config, **overrides)
+    
+    def _service_order(self) -> List[str]:
+        """Цепочка сервисов для очередного запроса (с адаптивным порядком, если он включен)"""
+        if self.router is None:
+            return list(self.preferred_services)
+        return self.router.order(self.preferred_services, self._pair)
+    
+    def _translate_with_services(self, text: str, cache_key: str, services: List[str],
+                                 use_cache: bool = True,
+                                 deadline: Optional[Deadline] = None) -> Optional[TranslationResult]:
+        """
+        Пробует сервисы по порядку, пока один из них не переведет текст
+        
+        С хеджированием запрос к сервису, не ответившему за задержку хеджирования,
+        дублируется следующему доступному сервису цепочки. Каждой попытке достается
+        только остаток общего срока.
+        
+        Returns:
+            Optional[TranslationResult]: Результат или None, если ни один сервис не перевел текст
+            
+        Raises:
+            DeadlineExceeded: Если общий срок истек
+        """
+        services = list(services)
+        rate_limited = []
+        while services:
+            if deadline is not None:
+                deadline.check()
+            service_name = services.pop(0)
+            if not self._fits_service(service_name, text) or self._get_translator(service_name) is None:
+                continue
+            # Предохранитель проверяется раньше лимита, чтобы не тратить маркеры на разомкнутый сервис
+            if not self._breaker_allows(service_name):
+                continue
+            
+            with self._breaker_trial(service_name):
+                if not self._rate_allows(service_name):
+                    # Лимит запросов исчерпан - не ждем, а переходим к следующему сервису
+                    rate_limited.append(service_name)
+                    continue
+                
+                if self.hedging is not None:
+                    backup = next((name for name in services
+                                   if self._fits_service(name, text) and self._get_translator(name) is not None),
+                                  None)
+                    if backup is not None:
+                        result, hedged = self._hedged_request(text, cache_key, service_name, backup,
+                                                              use_cache, deadline)
+                        if result is not None:
+                            return result
+                        if hedged:
+                            # Оба сервиса уже опрошены
+                            services = services[services.index(backup) + 1:]
+                        continue
+                
+                result = self._request_once(service_name, text, cache_key, use_cache, deadline)
+            if result is not None:
+                return result
+        
+        # Остальные сервисы не перевели текст - ждем маркер сервиса, пропущенного из-за лимита
+        for service_name in rate_limited:
+            if not self._rate_limiters[service_name].acquire(timeout=deadline.remaining() if deadline else None):
+                deadline.check()
+                continue
+            if not self._breaker_allows(service_name):
+                continue
+            with self._breaker_trial(service_name):
+                result = self._request_once(service_name, text, cache_key, use_cache, deadline)
+            if result is not None:
+                return result
+        
+        return None
+    
+    def _request_service(self, service_name: str, text: str) -> Any:
+        """Выполняет один запрос к сервису (для оффлайн переводчика - OfflineTranslationResult)"""
+        if service_name == 'offline':
+            logger.debug("Переводим оффлайн")
+            offline_translator = self.offline_backend.get()
+            
+            # Кеш уже проверен выше, результат сохраняется один раз под ключом этого переводчика
+            with self._service_semaphores['offline']:
+                return offline_translator.translate(text, use_cache=False)
+        
+        logger.debug("Переводим через %s", service_name)
+        return self._call_service(service_name, self._get_translator(service_name), text)
+    
+    def _timed_request(self, service_name: str, text: str, deadline: Optional[Deadline] = None) -> tuple:
+        """Выполняет запрос к сервису (не дольше остатка срока) и замеряет его задержку"""
+        start_time = time.time()
+        response = self._call_with_deadline(deadline, self._request_service, service_name, text)
+        elapsed = time.time() - start_time
+        self.latency.record(service_name, elapsed)
+        return response, elapsed
+    
+    def _accept_response(self, service_name: str, cache_key: str, text: str, response: Any,
+                         elapsed: float, use_cache: bool) -> Optional[TranslationResult]:
+        """Принимает ответ сервиса (None - пустой или неизмененный) и учитывает его в порядке сервисов"""
+        if service_name == 'offline':
+            result = self._accept_offline_result(cache_key, response, use_cache)
+        else:
+            result = self._accept_service_result(cache_key, text, service_name, response, elapsed, use_cache)
+        
+        if self.router is not None:
+            if result is None:
+                self.router.record_failure(service_name, self._pair)
+            else:
+                self.router.record_success(service_name, self._pair, elapsed)
+        
+        # Сервис ответил, даже если ответ не подошел
+        if service_name in self._breakers:
+            self._breakers[service_name].record_success()
+        return result
+    
+    def _request_failed(self, service_name: str, error: Exception, final: bool = True):
+        """
+        Учитывает неудачную попытку запроса к сервису
+        
+        Args:
+            final: Попыток больше не будет. Предохранитель считает один отказ на запрос,
+                а не на каждую повторную попытку
+        """
+        if self.router is not None:
+            self.router.record_failure(service_name, self._pair)
+        if final and service_name in self._breakers:
+            self._breakers[service_name].record_failure(error)
+        if service_name == 'offline':
+            self._offline_failed(error)
+        else:
+            self._service_failed(service_name, error)
+    
+    def _call_with_deadline(self, deadline: Optional[Deadline], func: Callable, *args) -> Any:
+        """
+        Вызывает func, ожидая результат не дольше остатка срока
+        
+        Блокирующий запрос нельзя прервать: по истечении срока его результат игнорируется.
+        """
+        if deadline is None:
+            return func(*args)
+        deadline.check()
+        future = self._get_deadline_executor().submit(func, *args)
+        try:
+            return future.result(timeout=deadline.remaining())
+        except FutureTimeoutError:
+            future.cancel()
+            raise DeadlineExceeded(f"Срок перевода {deadline.timeout}с истек")
+    
+    def _request_once(self, service_name: str, text: str, cache_key: str, use_cache: bool,
+                      deadline: Optional[Deadline] = None) -> Optional[TranslationResult]:
+        """
+        Переводит текст одним сервисом, повторяя запрос после временных ошибок
+        
+        Returns:
+            Optional[TranslationResult]: Результат или None, если сервис не перевел текст
+        """
+        for attempt in range(max(1, self.retry.max_attempts)):
+            try:
+                response, elapsed = self._timed_request(service_name, text, deadline)
+                return self._accept_response(service_name, cache_key, text, response, elapsed, use_cache)
+            except DeadlineExceeded as e:
+                self._request_failed(service_name, e)
+                raise
+            except Exception as e:
+                delay = self._retry_delay(service_name, e, attempt, deadline)
+                self._request_failed(service_name, e, final=delay is None)
+                if delay is None:
+                    return None
+                logger.debug("%s: повтор через %.2fс", service_name, delay)
+                time.sleep(delay)
+        return None
+    
+    def _retry_delay(self, service_name: str, error: Exception, attempt: int,
+                     deadline: Optional[Deadline]) -> Optional[float]:
+        """
+        Задержка перед повтором запроса к сервису
+        
+        Returns:
+            Optional[float]: None - не повторять (ошибка не временная, попытки, срок,
+            лимит запросов или предохранитель не позволяют)
+        """
+        if attempt + 1 >= self.retry.max_attempts or not is_retryable(error, self.retry):
+            return None
+        delay = backoff_delay(attempt, self.retry)
+        if deadline is not None and delay >= deadline.remaining():
+            return None
+        if not self._rate_allows(service_name) or not self._breaker_allows(service_name):
+            return None
+        self._count('retries')
+        return delay
+    
+    def _hedged_request(self, text: str, cache_key: str, primary: str, backup: str,
+                        use_cache: bool, deadline: Optional[Deadline] = None) -> tuple:
+        """
+        Запрос к основному сервису с хеджированием на запасной
+        
+        Returns:
+            tuple: (результат или None, был ли отправлен запрос запасному сервису)
+            
+        Raises:
+            DeadlineExceeded: Если ни один сервис не ответил до конца срока
+        """
+        # Оба запроса идут через _request_once: с повторами и учетом ошибок, как без хеджирования
+        executor = self._get_hedge_executor()
+        futures = {executor.submit(self._request_once, primary, text, cache_key, use_cache, deadline): primary}
+        self._count('hedge_candidates')
+        
+        hedge_delay = self.latency.hedge_delay(primary, self.hedging)
+        if deadline is not None:
+            hedge_delay = min(hedge_delay, deadline.remaining())
+        done, _ = wait(futures, timeout=hedge_delay)
+        hedged = False
+        # Запасной сервис, как и основной, проходит предохранитель (с пробным слотом) раньше лимита
+        if not done and self._may_hedge() and self._breaker_allows(backup):
+            if self._rate_allows(backup):
+                logger.debug("%s не ответил вовремя, дублируем запрос в %s", primary, backup)
+                futures[executor.submit(self._backup_request, backup, text, cache_key, use_cache, deadline)] = backup
+                self._count('hedged_requests')
+                hedged = True
+            else:
+                self._release_breaker(backup)
+        
+        # Побеждает первый приемлемый ответ, ответ второго сервиса игнорируется
+        expired = None
+        pending = set(futures)
+        while pending:
+            done, pending = wait(pending, timeout=deadline.remaining() if deadline else None,
+                                 return_when=FIRST_COMPLETED)
+            if not done:
+                for future in pending:
+                    future.cancel()
+                deadline.check()
+            for future in done:
+                service_name = futures[future]
                 try:
-                    print(f"🔒 Переводим оффлайн...")
-                    
-                    offline_translator = OfflineTranslator(
-                        source_lang=self.source_lang,
-                        target_lang=self.target_lang,
-                        cache_file=f"offline_cache_{self.source_lang}_{self.target_lang}.json"
-                    )
-                    
-                    offline_result = offline_translator.translate(text, use_cache)
-                    
-                    # Конвертируем результат в наш формат
-                    result = TranslationResult(
-                        original=offline_result.original,
-                        translated=offline_result.translated,
-                        source_lang=offline_result.source_lang,
-                        target_lang=offline_result.target_lang,
-                        service=f"offline_{offline_result.method}",
-                        confidence=offline_result.confidence
-                    )
-                    
-                    # Сохраняем в кеш
-                    if use_cache:
-                        self.cache[cache_key] = result
-                        self._save_cache()
-                    
-                    # Обновляем статистику
-                    service_key = f"offline_{offline_result.method}"
-                    if service_key not in self.stats['service_usage']:
-                        self.stats['service_usage'][service_key] = 0
-                    self.stats['service_usage'][service_key] += 1
-                    
-                    print(f"✅ Переведено оффлайн через {offline_result.method} за {offline_result.processing_time:.2f}с")
-                    return result
-                    
-                except Exception as e:
-                    error_msg = f"offline: {str(e)}"
-                    print(f"❌ {error_msg}")
-                    self.stats['errors'].append(error_msg)
+                    result = future.result()
+                except DeadlineExceeded as e:
+                    # Ошибка уже учтена в _request_once, ждем второй запрос до конца срока
+                    expired = e
                     continue
+                if result is not None:
+                    for other in pending:
+                        other.cancel()
+                    if service_name == backup:
+                        self._count('hedge_wins')
+                    return result, hedged
+        
+        if expired is not None:
+            raise expired
+        return None, hedged
+    
+    def _backup_request(self, service_name: str, text: str, cache_key: str, use_cache: bool,
+                        deadline: Optional[Deadline]) -> Optional[TranslationResult]:
+        """Запрос к запасному сервису хеджирования в слоте, выданном его предохранителем"""
+        with self._breaker_trial(service_name):
+            return self._request_once(service_name, text, cache_key, use_cache, deadline)
+    
+    def _may_hedge(self) -> bool:
+        """Не превышена ли доля хеджированных запросов"""
+        if self.hedging.max_hedge_rate is None:
+            return True
+        with self._stats_lock:
+            return self.stats['hedged_requests'] < self.hedging.max_hedge_rate * self.stats['hedge_candidates']
+    
+    async def translate_async(self, text: str, use_cache: bool = True,
+                              timeout: Optional[float] = None) -> TranslationResult:
+        """
+        Асинхронно переводит текст, не блокируя цикл событий
+        
+        HTTP запросы к LibreTranslate оффлайн переводчика выполняются без блокировки (aiohttp),
+        блокирующие сервисы (deep-translator, Argos) - в ограниченном пуле потоков.
+        Длинный текст делится на части так же, как в translate(), части переводятся одновременно.
+        
+        Args:
+            text: Текст для перевода
+            use_cache: Использовать кеш
+            timeout: Общий лимит времени на всю цепочку сервисов в секундах
             
-            # Обычные онлайн переводчики
-            if service_name not in self.translators:
-                continue
+        Returns:
+            TranslationResult: Результат перевода
+            
+        Raises:
+            asyncio.TimeoutError: Если перевод не уложился в timeout
+        """
+        if timeout is not None:
+            # Отмена по таймауту прерывает цепочку, а не переходит к следующему сервису.
+            # Срок нужен и внутри цепочки: маркер, который не появится до срока, не ждем
+            return await asyncio.wait_for(self._translate_async(text, use_cache, Deadline(timeout)), timeout)
+        return await self._translate_async(text, use_cache)
+    
+    async def _translate_async(self, text: str, use_cache: bool,
+                               deadline: Optional[Deadline] = None) -> TranslationResult:
+        self._count('total_requests')
+        
+        if not self.normalize:
+            return await self._translate_text_async(text, use_cache, deadline=deadline)
+        
+        normalized = normalize_text(text)
+        if normalized.core == text:
+            return await self._translate_text_async(text, use_cache, deadline=deadline)
+        
+        result = await self._translate_text_async(normalized.core, use_cache, normalized=True, deadline=deadline)
+        return self._restore_edges(text, normalized, result)
+    
+    async def _translate_text_async(self, text: str, use_cache: bool = True, normalized: bool = False,
+                                    deadline: Optional[Deadline] = None) -> TranslationResult:
+        """Асинхронный вариант _translate_text с той же цепочкой сервисов"""
+        cache_key = self._cache_key(text)
+        if use_cache:
+            cached = self._lookup_cached(cache_key, text, normalized or self._key_text(text) != text)
+            if cached is not None:
+                return cached
             
-            translator = self.translators[service_name]
+            result, shared = await self._single_flight.do_async(
+                cache_key, partial(self._translate_uncached_async, text, cache_key, use_cache, deadline)
+            )
+            if shared:
+                self._count('coalesced')
+                return replace(result)
+            return result
+        
+        return await self._translate_uncached_async(text, cache_key, use_cache, deadline)
+    
+    async def _translate_uncached_async(self, text: str, cache_key: str, use_cache: bool,
+                                        deadline: Optional[Deadline] = None) -> TranslationResult:
+        """Асинхронный вариант _translate_uncached"""
+        services = self._service_order()
+        result = await self._translate_with_services_async(text, cache_key, services, use_cache, deadline)
+        if result is not None:
+            return result
+        
+        # Ни один сервис не принял текст целиком - переводим по частям для сервисов с меньшим ограничением
+        segment_chars = self._split_chars(text, services)
+        if segment_chars is not None:
+            return await self._translate_segmented_async(text, cache_key, segment_chars, use_cache, deadline)
+        return self._fallback_result(text)
+    
+    async def _translate_segmented_async(self, text: str, cache_key: str, segment_chars: int,
+                                         use_cache: bool, deadline: Optional[Deadline] = None) -> TranslationResult:
+        """Асинхронный вариант _translate_segmented: части переводятся одновременно, не больше max_workers сразу"""
+        segments = split_text(text, segment_chars)
+        self._count('segmented_requests')
+        self._count('segments', len(segments))
+        logger.debug("Текст разбит на %d частей до %d символов", len(segments), segment_chars)
+        
+        cache_segments = use_cache and self.segmentation.cache_level == 'segments'
+        semaphore = asyncio.Semaphore(self.segmentation.max_workers or self.max_workers)
+        
+        async def translate_segment(segment):
+            part = segment[0]
+            if not part.strip():
+                return None
+            async with semaphore:
+                return await self._translate_text_async(part, cache_segments, deadline=deadline)
+        
+        results = await asyncio.gather(*(translate_segment(segment) for segment in segments))
+        return self._join_segment_results(text, cache_key, segments, results, use_cache)
+    
+    async def _translate_with_services_async(self, text: str, cache_key: str, services: List[str],
+                                             use_cache: bool,
+                                             deadline: Optional[Deadline] = None) -> Optional[TranslationResult]:
+        """
+        Асинхронный вариант _translate_with_services (без хеджирования)
+        
+        Срок прерывает цепочку через asyncio.wait_for, а здесь ограничивает ожидание
+        маркера: сервис, маркер которого не появится до срока, пропускается.
+        """
+        loop = asyncio.get_running_loop()
+        rate_limited = []
+        for service_name in services:
+            if not self._fits_service(service_name, text):
+                continue
+            # Создание сервиса может обращаться к сети, поэтому тоже выполняется в пуле
+            translator = self.translators.get(service_name)
+            if translator is None:
+                translator = await loop.run_in_executor(self._get_executor(), self._get_translator, service_name)
+            if translator is None:
+                continue
+            if not self._breaker_allows(service_name):
+                continue
             
+            # Отмена корутины тоже возвращает слот пробного запроса
+            with self._breaker_trial(service_name):
+                if not self._rate_allows(service_name):
+                    rate_limited.append(service_name)
+                    continue
+                result = await self._request_once_async(service_name, translator, text, cache_key, use_cache)
+            if result is not None:
+                return result
+        
+        # Остальные сервисы не перевели текст - ждем маркер сервиса, пропущенного из-за лимита
+        for service_name in rate_limited:
+            bucket = self._rate_limiters[service_name]
+            if not await bucket.acquire_async(timeout=deadline.remaining() if deadline else None):
+                continue
+            if not self._breaker_allows(service_name):
+                continue
+            with self._breaker_trial(service_name):
+                result = await self._request_once_async(service_name, self.translators[service_name],
+                                                        text, cache_key, use_cache)
+            if result is not None:
+                return result
+        
+        return None
+    
+    async def _request_once_async(self, service_name: str, translator: Any, text: str, cache_key: str,
+                                  use_cache: bool) -> Optional[TranslationResult]:
+        """Асинхронный вариант _request_once (срок задает asyncio.wait_for в translate_async)"""
+        for attempt in range(max(1, self.retry.max_attempts)):
+            # CancelledError не перехватывается: отмена прерывает всю цепочку
             try:
-                print(f"🌐 Переводим через {service_name}...")
-                
-                # Выполняем перевод
-                if service_name in ['pons', 'linguee']:
-                    # Словарные переводчики возвращают список результатов
-                    translated = translator.translate(text, return_all=False)
+                start_time = time.time()
+                if service_name == 'offline':
+                    logger.debug("Переводим оффлайн")
+                    response = await self.offline_backend.get().translate_async(text, use_cache=False)
                 else:
-                    translated = translator.translate(text)
-                
-                if not translated or translated == text:
-                    print(f"⚠️ {service_name}: Пустой или неизмененный результат")
-                    continue
-                
-                # Создаем результат
-                result = TranslationResult(
+                    logger.debug("Переводим через %s", service_name)
+                    response = await asyncio.get_running_loop().run_in_executor(
+                        self._get_executor(), self._call_service, service_name, translator, text
+                    )
+                elapsed = time.time() - start_time
+                self.latency.record(service_name, elapsed)
+                return self._accept_response(service_name, cache_key, text, response, elapsed, use_cache)
+            except Exception as e:
+                delay = self._retry_delay(service_name, e, attempt, None)
+                self._request_failed(service_name, e, final=delay is None)
+                if delay is None:
+                    return None
+                logger.debug("%s: повтор через %.2fс", service_name, delay)
+                await asyncio.sleep(delay)
+        return None
+    
+    def _lookup_cached(self, cache_key: str, text: str, normalized: bool) -> Optional[TranslationResult]:
+        """Ищет перевод в кеше, затем достаточно похожий сегмент в памяти переводов"""
+        cached = self._cache_get(cache_key, text)
+        if cached is not None:
+            self._count('cache_hits')
+            if normalized:
+                self._count('normalized_hits')
+            return cached
+        
+        # Достаточно похожий сегмент из памяти переводов принимаем без обращения к сервисам.
+        # Сегмент с другими числами ("Заказ 12345" для "Заказ 12346") годится только как подсказка
+        if self.translation_memory and self.translation_memory.config.auto_accept is not None:
+            match = self.translation_memory.lookup(text, self.translation_memory.config.auto_accept)
+            if match is not None and match.same_numbers:
+                self._count('memory_hits')
+                return TranslationResult(
                     original=text,
-                    translated=translated,
+                    translated=match.translated,
                     source_lang=self.source_lang,
                     target_lang=self.target_lang,
-                    service=service_name,
-                    confidence=1.0
+                    service=f"tm_{match.service}",
+                    confidence=match.score
                 )
-                
-                # Сохраняем в кеш
-                if use_cache:
-                    self.cache[cache_key] = result
-                    self._save_cache()
-                
-                # Обновляем статистику
-                if service_name not in self.stats['service_usage']:
-                    self.stats['service_usage'][service_name] = 0
-                self.stats['service_usage'][service_name] += 1
-                
-                print(f"✅ Переведено через {service_name}")
-                return result
-                
-            except Exception as e:
-                error_msg = f"{service_name}: {str(e)}"
-                print(f"❌ {error_msg}")
-                self.stats['errors'].append(error_msg)
-                continue
+        return None
+    
+    def _call_service(self, service_name: str, translator: Any, text: str) -> str:
+        """Выполняет запрос к сервису, не превышая лимит одновременных запросов к нему"""
+        with self._service_semaphores[service_name]:
+            if service_name in ['pons', 'linguee']:
+                # Словарные переводчики возвращают список результатов
+                return translator.translate(text, return_all=False)
+            return translator.translate(text)
+    
+    def _accept_service_result(self, cache_key: str, text: str, service_name: str, translated: str,
+                               elapsed: float, use_cache: bool) -> Optional[TranslationResult]:
+        """Проверяет ответ сервиса, сохраняет его в кеш и учитывает в статистике"""
+        if not translated or translated == text:
+            logger.debug("%s: пустой или неизмененный результат", service_name)
+            return None
+        
+        # Создаем результат
+        result = TranslationResult(
+            original=text,
+            translated=translated,
+            source_lang=self.source_lang,
+            target_lang=self.target_lang,
+            service=service_name,
+            confidence=1.0
+        )
+        
+        # Сохраняем в кеш
+        if use_cache:
+            self._cache_put(cache_key, result, elapsed)
+        
+        # Обновляем статистику
+        self._record_usage(service_name)
+        
+        logger.debug("Переведено через %s", service_name)
+        return result
+    
+    def _accept_offline_result(self, cache_key: str, offline_result: Any, use_cache: bool) -> TranslationResult:
+        """Конвертирует результат оффлайн переводчика, сохраняет его в кеш и учитывает в статистике"""
+        result = TranslationResult(
+            original=offline_result.original,
+            translated=offline_result.translated,
+            source_lang=offline_result.source_lang,
+            target_lang=offline_result.target_lang,
+            service=f"offline_{offline_result.method}",
+            confidence=offline_result.confidence
+        )
+        
+        # Сохраняем в кеш
+        if use_cache:
+            self._cache_put(cache_key, result, offline_result.processing_time)
+        
+        # Обновляем статистику
+        self._record_usage(f"offline_{offline_result.method}")
         
-        # Если все сервисы не сработали, возвращаем оригинальный текст
-        print(f"⚠️ Все переводчики недоступны, возвращаем оригинальный текст")
+        self.offline_backend.report_success()
+        logger.debug("Переведено оффлайн через %s за %.2fс", offline_result.method, offline_result.processing_time)
+        return result
+    
+    def _offline_failed(self, error: Exception):
+        error_msg = f"offline: {str(error)}"
+        logger.warning("%s", error_msg)
+        self._record_error(error_msg)
+        if self.offline_backend.report_failure(error):
+            logger.info("Оффлайн бэкенд: методы перевода определены заново")
+    
+    def _service_failed(self, service_name: str, error: Exception):
+        error_msg = f"{service_name}: {str(error)}"
+        logger.warning("%s", error_msg)
+        self._record_error(error_msg)
+    
+    @staticmethod
+    def _restore_edges(text: str, normalized: NormalizedText, result: TranslationResult) -> TranslationResult:
+        """Возвращает в перевод снятые при нормализации края; непереведенный текст отдается как есть"""
+        if result.service == 'fallback':
+            return replace(result, original=text, translated=text)
+        return replace(result, original=text, translated=normalized.restore(result.translated))
+    
+    def _fallback_result(self, text: str) -> TranslationResult:
+        """Если все сервисы не сработали, возвращаем оригинальный текст"""
+        logger.warning("Все переводчики недоступны, возвращаем оригинальный текст")
         return TranslationResult(
             original=text,
             translated=text,
@@ -462,68 +1450,534 @@ class EnhancedTranslator:
             confidence=0.0
         )
     
-    def translate_batch(self, texts: List[str], show_progress: bool = True) -> List[TranslationResult]:
+    def translate_batch(self, texts: List[str], show_progress: bool = True,
+                        max_workers: Optional[int] = None,
+                        timeout: Optional[float] = None) -> List[TranslationResult]:
         """
-        Переводит список текстов
+        Переводит список текстов параллельно
+        
+        Повторяющиеся тексты (после нормализации) переводятся один раз, перевод раздается
+        всем их позициям. Промахи кеша сначала уходят пачками в сервисы с пакетными запросами
+        (LibreTranslate, DeepL, Microsoft, оффлайн LibreTranslate), пока такие сервисы
+        идут первыми в цепочке; оставшиеся тексты переводятся по одному остальными сервисами.
+        Тексты длиннее ограничения сервисов переводятся по частям (см. translate).
+        Запросы к каждому сервису ограничены его max_concurrency, результаты
+        возвращаются в порядке входных текстов. По завершении в лог (INFO) пишется
+        одна итоговая строка пакета.
         
         Args:
             texts: Список текстов
-            show_progress: Показывать прогресс
+            show_progress: Сообщать о прогрессе (уровень INFO логгера translatecore.enhanced)
+            max_workers: Потоков в пуле (по умолчанию - max_workers переводчика, 1 - последовательно)
+            timeout: Общий лимит времени на весь пакет в секундах; тексты, не переведенные
+                к сроку, возвращаются без перевода (service='fallback')
             
         Returns:
             List[TranslationResult]: Список результатов перевода
         """
-        results = []
         total = len(texts)
+        workers = min(max_workers or self.max_workers, total)
+        results: List[Optional[TranslationResult]] = [None] * total
+        deadline = Deadline(timeout) if timeout is not None else None
+        start_time = time.time()
+        done = 0
+        progress_lock = threading.Lock()
+        
+        def report(count: int):
+            nonlocal done
+            with progress_lock:
+                previous, done = done, done + count
+                if show_progress and done // 10 > previous // 10:
+                    logger.info("Прогресс: %d/%d (%.1f%%)", done, total, (done / total) * 100)
         
+        # Нормализуем тексты; повторяющиеся тексты переводятся один раз
+        edges = [None] * total
+        copies: Dict[str, List[int]] = {}
         for i, text in enumerate(texts):
-            if show_progress and i % 10 == 0:
-                progress = (i / total) * 100
-                print(f"Прогресс: {i}/{total} ({progress:.1f}%)")
+            self._count('total_requests')
+            normalized = normalize_text(text) if self.normalize else None
+            if normalized is not None and normalized.core != text:
+                edges[i] = normalized
+            copies.setdefault(edges[i].core if edges[i] is not None else text, []).append(i)
+        self._count('batch_texts', total)
+        self._count('batch_unique_texts', len(copies))
+        
+        # Отвечаем из кеша
+        pending = []
+        for core, indices in copies.items():
+            cache_key = self._cache_key(core)
+            cached = self._lookup_cached(cache_key, core, (any(edges[i] is not None for i in indices)
+                                                           or self._key_text(core) != core))
+            if cached is not None:
+                results[indices[0]] = cached
+            else:
+                pending.append((indices[0], core, cache_key))
+        cached = total - sum(len(copies[core]) for _, core, _ in pending)
+        report(cached)
+        
+        # Длинные тексты не идут в пачки - они переводятся по частям
+        segment_chars = self._segment_chars()
+        long_items = [item for item in pending if segment_chars is not None and len(item[1]) > segment_chars]
+        pending = [item for item in pending if item not in long_items]
+        
+        # Пакетные сервисы в начале цепочки переводят промахи пачками
+        services = self._service_order()
+        while pending and services:
+            batch_call = self._get_batch_call(services[0])
+            if batch_call is None:
+                break
+            service_name = services.pop(0)
+            if not self._breaker_allows(service_name):
+                continue
+            limits = get_batch_limits(service_name, self.service_settings.get(service_name))
+            chunks = [[pending[j] for j in batch]
+                      for batch in split_batches([core for _, core, _ in pending], limits)]
+            
+            def translate_chunk(chunk, service_name=service_name, batch_call=batch_call,
+                                wait_for_rate=not services):
+                try:
+                    translated = self._translate_chunk(service_name, batch_call, chunk, wait_for_rate, deadline)
+                except DeadlineExceeded:
+                    return [None] * len(chunk)
+                report(sum(len(copies[core]) for (_, core, _), result in zip(chunk, translated)
+                           if result is not None))
+                return translated
+            
+            # Пачки, пропущенные из-за лимита, не учитываются предохранителем
+            with self._breaker_trial(service_name):
+                chunk_results = self._run_parallel(translate_chunk, chunks, workers)
+            still_pending = []
+            for chunk, translated in zip(chunks, chunk_results):
+                for item, result in zip(chunk, translated):
+                    if result is None:
+                        still_pending.append(item)
+                    else:
+                        results[item[0]] = result
+            pending = still_pending
+        
+        # Остальные тексты - по одному через оставшиеся сервисы. Одновременный translate()
+        # того же текста не дублирует запрос к сервисам (single-flight по ключу кеша)
+        def translate_item(item):
+            _, core, cache_key = item
+            try:
+                result = self._translate_coalesced(core, cache_key, deadline,
+                                                   services=None if item in long_items else list(services))
+            except DeadlineExceeded:
+                result = self._fallback_result(core)
+            report(len(copies[core]))
+            return result
+        
+        pending += long_items
+        for item, result in zip(pending, self._run_parallel(translate_item, pending, workers)):
+            results[item[0]] = result
+        
+        # Раздаем перевод всем копиям текста
+        for indices in copies.values():
+            for i in indices[1:]:
+                results[i] = replace(results[indices[0]])
+        
+        # Возвращаем снятые при нормализации края
+        for i, normalized in enumerate(edges):
+            if normalized is not None:
+                results[i] = self._restore_edges(texts[i], normalized, results[i])
+        
+        # Одна итоговая строка на пакет вместо сообщений о каждом тексте
+        logger.info("Пакет: %d текстов (%d уникальных), из кеша %d, без перевода %d за %.2fс",
+                    total, len(copies), cached,
+                    sum(result.service == 'fallback' for result in results), time.time() - start_time)
+        
+        return results
+    
+    def _get_batch_call(self, service_name: str) -> Optional[Callable[[List[str]], List[Any]]]:
+        """Возвращает пакетный запрос сервиса или None, если сервис переводит только по одному тексту"""
+        if service_name == 'offline':
+            if self._get_translator('offline') is None:
+                return None
+            offline_translator = self.offline_backend.get()
+            if not offline_translator.native_batch_available():
+                return None
+            return offline_translator.translate_with_libretranslate_batch
+        
+        batch_translate = NATIVE_BATCH_TRANSLATORS.get(service_name)
+        if batch_translate is None:
+            return None
+        translator = self._get_translator(service_name)
+        if translator is None:
+            return None
+        return partial(batch_translate, translator)
+    
+    def _translate_chunk(self, service_name: str, batch_call: Callable[[List[str]], List[Any]],
+                         chunk: List[tuple], wait_for_rate: bool = False,
+                         deadline: Optional[Deadline] = None) -> List[Optional[TranslationResult]]:
+        """
+        Переводит пачку одним запросом к сервису
+        
+        Если пакетный запрос не удался, тексты пачки переводятся этим сервисом по одному.
+        Если лимит запросов исчерпан, пачка остается следующим сервисам
+        (или ждет маркер при wait_for_rate - когда следующих сервисов нет).
+        
+        Returns:
+            List[Optional[TranslationResult]]: Результаты (None - сервис не перевел текст)
+        """
+        if not self._rate_allows(service_name):
+            if not wait_for_rate:
+                return [None] * len(chunk)
+            if not self._rate_limiters[service_name].acquire(timeout=deadline.remaining() if deadline else None):
+                # Маркер не появится до срока: без него запрос не отправляем
+                deadline.check()
+                return [None] * len(chunk)
+        
+        texts = [core for _, core, _ in chunk]
+        try:
+            logger.debug("%s: пакетный перевод %d текстов", service_name, len(texts))
+            start_time = time.time()
+            with self._service_semaphores[service_name]:
+                translated = self._call_with_deadline(deadline, batch_call, texts)
+            elapsed = (time.time() - start_time) / len(texts)
+            if len(translated) != len(texts):
+                raise RuntimeError(f"получено {len(translated)} переводов вместо {len(texts)}")
+        except Exception as e:
+            self._request_failed(service_name, e)
+            if isinstance(e, DeadlineExceeded):
+                raise
+            return [self._translate_with_services(core, cache_key, [service_name], deadline=deadline)
+                    for _, core, cache_key in chunk]
+        
+        return [self._accept_response(service_name, cache_key, core, response, elapsed, True)
+                for (_, core, cache_key), response in zip(chunk, translated)]
+    
+    @staticmethod
+    def _run_parallel(func: Callable[[Any], Any], items: List[Any], workers: int) -> List[Any]:
+        """Применяет func к элементам в пуле потоков, сохраняя порядок"""
+        if workers <= 1 or len(items) <= 1:
+            return [func(item) for item in items]
+        with ThreadPoolExecutor(max_workers=min(workers, len(items)), thread_name_prefix='translatecore') as executor:
+            return list(executor.map(func, items))
+    
+    async def translate_batch_async(self, texts: List[str], max_concurrency: Optional[int] = None,
+                                    timeout: Optional[float] = None) -> List[TranslationResult]:
+        """
+        Асинхронно переводит список текстов
+        
+        Args:
+            texts: Список текстов
+            max_concurrency: Одновременных переводов (по умолчанию - max_workers переводчика)
+            timeout: Лимит времени на перевод одного текста в секундах
+            
+        Returns:
+            List[TranslationResult]: Результаты в порядке входных текстов
+        """
+        limit = asyncio.Semaphore(max_concurrency or self.max_workers)
+        
+        async def translate_one(text: str) -> TranslationResult:
+            async with limit:
+                return await self.translate_async(text, timeout=timeout)
+        
+        # Отмена или ошибка одного перевода отменяет остальные
+        return list(await asyncio.gather(*(translate_one(text) for text in texts)))
+    
+    def translate_multi(self, text: str, targets: List[str], use_cache: bool = True,
+                        timeout: Optional[float] = None) -> Dict[str, TranslationResult]:
+        """
+        Переводит текст сразу на несколько языков
+        
+        Нормализация и разбиение длинного текста выполняются один раз, языки переводятся
+        параллельно переводчиками-двойниками с общим кешем, предохранителями и статистикой.
+        Если первым в цепочке идет сервис, переводящий на несколько языков одним запросом
+        (Microsoft), промахи кеша уходят ему одним запросом.
+        
+        Args:
+            text: Текст для перевода
+            targets: Целевые языки
+            use_cache: Использовать кеш
+            timeout: Общий лимит времени на все языки в секундах
             
-            result = self.translate(text)
-            results.append(result)
+        Returns:
+            Dict[str, TranslationResult]: Результаты по целевым языкам (в порядке targets)
             
-            # Небольшая пауза между запросами
-            if i < total - 1:  # Не делаем паузу после последнего элемента
-                time.sleep(0.1)
+        Raises:
+            DeadlineExceeded: Если перевод не уложился в timeout
+        """
+        targets = list(dict.fromkeys(target.lower() for target in targets))
+        self._count('total_requests', len(targets))
+        deadline = Deadline(timeout) if timeout is not None else None
+        
+        # Работа над исходным текстом - один раз на все языки
+        normalized = normalize_text(text) if self.normalize else None
+        if normalized is not None and normalized.core == text:
+            normalized = None
+        core = normalized.core if normalized is not None else text
+        segment_chars = self._segment_chars()
+        segments = (split_text(core, segment_chars)
+                    if segment_chars is not None and len(core) > segment_chars else None)
+        
+        results: Dict[str, TranslationResult] = {}
+        if segments is None and len(targets) > 1:
+            results.update(self._translate_multi_native(core, targets, use_cache, normalized is not None, deadline))
+        
+        pending = [target for target in targets if target not in results]
+        translated = self._run_parallel(
+            lambda target: self._for_target(target)._translate_text(
+                core, use_cache, normalized=normalized is not None, deadline=deadline, segments=segments
+            ),
+            pending, len(pending)
+        )
+        results.update(zip(pending, translated))
+        
+        if normalized is not None:
+            results = {target: self._restore_edges(text, normalized, result)
+                       for target, result in results.items()}
+        return {target: results[target] for target in targets}
+    
+    def translate_batch_multi(self, texts: List[str], targets: List[str], show_progress: bool = True,
+                              max_workers: Optional[int] = None,
+                              timeout: Optional[float] = None) -> Dict[str, List[TranslationResult]]:
+        """
+        Переводит список текстов сразу на несколько языков
+        
+        Языки переводятся параллельно через translate_batch переводчиков-двойников
+        (общий кеш, лимиты параллельности сервисов, предохранители и статистика).
+        
+        Args:
+            texts: Список текстов
+            targets: Целевые языки
+            show_progress: Сообщать о прогрессе
+            max_workers: Потоков на каждый язык (по умолчанию - max_workers переводчика)
+            timeout: Общий лимит времени на пакет каждого языка в секундах
+            
+        Returns:
+            Dict[str, List[TranslationResult]]: Результаты по целевым языкам в порядке входных текстов
+        """
+        targets = list(dict.fromkeys(target.lower() for target in targets))
+        results = self._run_parallel(
+            lambda target: self._for_target(target).translate_batch(texts, show_progress, max_workers, timeout),
+            targets, len(targets)
+        )
+        return dict(zip(targets, results))
+    
+    def _translate_multi_native(self, text: str, targets: List[str], use_cache: bool, normalized: bool,
+                                deadline: Optional[Deadline] = None) -> Dict[str, TranslationResult]:
+        """
+        Переводит текст на несколько языков одним запросом, если такой сервис идет первым в цепочке
+        
+        Returns:
+            Dict[str, TranslationResult]: Переводы из кеша и от сервиса (языки без перевода отсутствуют)
+        """
+        service_name = self._service_order()[0] if self._service_locks else None
+        multi_translate = NATIVE_MULTI_TARGET_TRANSLATORS.get(service_name)
+        if multi_translate is None:
+            return {}
         
-        if show_progress:
-            print(f"Прогресс: {total}/{total} (100.0%)")
+        results = {}
+        misses = {}
+        for target in targets:
+            sibling = self._for_target(target)
+            cache_key = sibling._cache_key(text)
+            cached = sibling._lookup_cached(cache_key, text, normalized) if use_cache else None
+            if cached is not None:
+                results[target] = cached
+            else:
+                misses[self._get_lang_code(target, service_name)] = (sibling, cache_key)
+        
+        translator = self._get_translator(service_name)
+        if (len(misses) < 2 or translator is None or not self._fits_service(service_name, text)
+                or not self._breaker_allows(service_name)):
+            return results
         
+        with self._breaker_trial(service_name):
+            if not self._rate_allows(service_name):
+                return results
+            try:
+                logger.debug("%s: перевод на %d языков одним запросом", service_name, len(misses))
+                start_time = time.time()
+                with self._service_semaphores[service_name]:
+                    translated = self._call_with_deadline(deadline, multi_translate, translator, text, list(misses))
+                elapsed = time.time() - start_time
+            except Exception as e:
+                self._request_failed(service_name, e)
+                if isinstance(e, DeadlineExceeded):
+                    raise
+                return results
+            
+            self._count('multi_target_requests')
+            for code, (sibling, cache_key) in misses.items():
+                if code in translated:
+                    result = sibling._accept_response(service_name, cache_key, text, translated[code],
+                                                      elapsed, use_cache)
+                    if result is not None:
+                        results[sibling.target_lang] = result
         return results
     
+    def _for_target(self, target_lang: str) -> 'EnhancedTranslator':
+        """
+        Переводчик-двойник для другого целевого языка
+        
+        Двойник делит с этим переводчиком кеш, настройки, лимиты параллельности, предохранители,
+        порядок сервисов и статистику; свои у него только сервисы (они привязаны к языку)
+        и память переводов языковой пары.
+        """
+        target_lang = target_lang.lower()
+        if target_lang == self.target_lang:
+            return self
+        with self._executor_lock:
+            sibling = self._target_translators.get(target_lang)
+            if sibling is None:
+                sibling = copy.copy(self)
+                sibling.target_lang = target_lang
+                sibling._pair = f"{self.source_lang}-{target_lang}"
+                sibling._cache_prefix = cache_key_prefix(self.source_lang, target_lang, self.CACHE_NAMESPACE)
+                sibling._memory_prefix = cache_key_prefix(self.source_lang, target_lang, self.MEMORY_NAMESPACE)
+                sibling.translators = {}
+                sibling._failed_services = set()
+                sibling.offline_backend = None
+                sibling._executor = sibling._hedge_executor = sibling._deadline_executor = None
+                sibling._executor_lock = threading.Lock()
+                sibling._target_translators = {}
+                if self.translation_memory is not None:
+                    sibling.translation_memory = TranslationMemory(self.translation_memory.config)
+                    sibling._load_translation_memory()
+                self._target_translators[target_lang] = sibling
+            return sibling
+    
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Ограниченный пул потоков для блокирующих сервисов в асинхронном API"""
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                    thread_name_prefix='translatecore-async')
+            return self._executor
+    
+    def _get_hedge_executor(self) -> ThreadPoolExecutor:
+        """
+        Пул потоков хеджированных запросов (основной и запасной запрос на каждый перевод)
+        
+        Отдельный от пула _call_with_deadline: проигравшие запросы, которые еще не ответили,
+        не занимают потоки запросов со сроком.
+        """
+        with self._executor_lock:
+            if self._hedge_executor is None:
+                self._hedge_executor = ThreadPoolExecutor(max_workers=2 * self.max_workers,
+                                                          thread_name_prefix='translatecore-hedge')
+            return self._hedge_executor
+    
+    def _get_deadline_executor(self) -> ThreadPoolExecutor:
+        """Пул потоков блокирующих запросов, результат которых ждется не дольше срока"""
+        with self._executor_lock:
+            if self._deadline_executor is None:
+                self._deadline_executor = ThreadPoolExecutor(max_workers=2 * self.max_workers,
+                                                             thread_name_prefix='translatecore-deadline')
+            return self._deadline_executor
+    
     def get_available_languages(self, service: str = 'google') -> List[str]:
         """Получает список поддерживаемых языков для сервиса"""
-        if service not in self.translators:
+        translator = self._get_translator(service)
+        if translator is None:
             return []
         
         try:
-            translator = self.translators[service]
             return translator.get_supported_languages()
         except Exception as e:
-            print(f"Ошибка получения языков для {service}: {e}")
+            logger.warning("Ошибка получения языков для %s: %s", service, e)
             return []
     
     def get_stats(self) -> Dict[str, Any]:
         """Возвращает статистику использования"""
+        with self._stats_lock:
+            stats = dict(self.stats)
+            service_usage = dict(self.stats['service_usage'])
+            errors = list(self.stats['errors'])
+        
         return {
-            'total_requests': self.stats['total_requests'],
-            'cache_hits': self.stats['cache_hits'],
-            'cache_hit_rate': (self.stats['cache_hits'] / max(1, self.stats['total_requests'])) * 100,
-            'cache_size': len(self.cache),
-            'service_usage': self.stats['service_usage'],
-            'active_services': list(self.translators.keys()),
-            'errors_count': len(self.stats['errors']),
-            'errors': self.stats['errors'][-5:] if self.stats['errors'] else []  # Показываем только последние 5 ошибок
+            'total_requests': stats['total_requests'],
+            'cache_hits': stats['cache_hits'],
+            'cache_hit_rate': (stats['cache_hits'] / max(1, stats['total_requests'])) * 100,
+            'normalized_hits': stats['normalized_hits'],
+            'normalized_hit_rate': (stats['normalized_hits'] / max(1, stats['total_requests'])) * 100,
+            'cache_size': self.cache.count(self._cache_prefix),
+            'cache_tiers': self.cache.get_stats(),
+            'cache_pending_writes': self.cache.pending_writes(),
+            'memory_hits': stats['memory_hits'],
+            'batch_texts': stats['batch_texts'],
+            'batch_unique_texts': stats['batch_unique_texts'],
+            'batch_dedup_ratio': ((stats['batch_texts'] - stats['batch_unique_texts']) / max(1, stats['batch_texts'])) * 100,
+            'translation_memory': self.translation_memory.get_stats() if self.translation_memory else None,
+            'service_usage': service_usage,
+            'active_services': self._service_states(),
+            'service_concurrency': {name: self._get_service_concurrency(name) for name in self._service_locks},
+            'offline_backend': self.offline_backend.health(probe=False) if self.offline_backend else None,
+            'service_latency': self.latency.get_stats(),
+            'hedging': {
+                'candidates': stats['hedge_candidates'],
+                'hedged_requests': stats['hedged_requests'],
+                'hedge_wins': stats['hedge_wins'],
+                'hedge_rate': (stats['hedged_requests'] / max(1, stats['hedge_candidates'])) * 100
+            } if self.hedging else None,
+            'routing': self.router.get_stats(self._pair) if self.router else None,
+            'circuit_breakers': {name: breaker.get_stats() for name, breaker in self._breakers.items()},
+            'rate_limited': stats['rate_limited'],
+            'retries': stats['retries'],
+            'deadline_exceeded': stats['deadline_exceeded'],
+            'segmented_requests': stats['segmented_requests'],
+            'segments': stats['segments'],
+            'coalesced': stats['coalesced'],
+            'multi_target_requests': stats['multi_target_requests'],
+            'rate_limits': {name: bucket.get_stats() for name, bucket in self._rate_limiters.items()},
+            'errors_count': len(errors),
+            'errors': errors[-5:] if errors else []  # Показываем только последние 5 ошибок
         }
     
+    def _service_states(self) -> Dict[str, str]:
+        """Состояние настроенных сервисов: 'initialized', 'configured' (еще не использовался) или 'failed'"""
+        states = {}
+        for service_name in self._service_locks:
+            if service_name in self.translators:
+                states[service_name] = 'initialized'
+            elif service_name in self._failed_services:
+                states[service_name] = 'failed'
+            else:
+                states[service_name] = 'configured'
+        return states
+    
     def clear_cache(self):
         """Очищает кеш переводов"""
-        self.cache = {}
-        if os.path.exists(self.cache_file):
-            os.remove(self.cache_file)
-        print(f"✅ Кеш очищен")
+        self.cache.clear(self._cache_prefix)
+        if self.translation_memory is not None:
+            self.translation_memory.clear()
+            self.cache_store.clear(self._memory_prefix)
+        logger.info("Кеш очищен")
+    
+    def flush(self):
+        """Сбрасывает отложенные записи кеша на диск"""
+        self.cache.flush()
+    
+    def close(self):
+        """Сбрасывает кеш и освобождает ресурсы переводчика"""
+        self.flush()
+        for translator in [self, *self._target_translators.values()]:
+            if translator.offline_backend is not None:
+                translator.offline_backend.shutdown()
+            for executor in (translator._executor, translator._hedge_executor, translator._deadline_executor):
+                if executor is not None:
+                    executor.shutdown(wait=False)
+            translator._executor = translator._hedge_executor = translator._deadline_executor = None
+    
+    async def aclose(self):
+        """Закрывает HTTP сессию оффлайн переводчика и освобождает ресурсы"""
+        if self.offline_backend is not None and self.offline_backend.translator is not None:
+            await self.offline_backend.translator.aclose_http()
+        self.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.aclose()
 
 
 def get_available_services() -> List[str]:
@@ -575,6 +2029,7 @@ def main():
                        help='Показать команды установки зависимостей')
     
     args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
     
     if args.install_deps:
         install_requirements()
@@ -611,7 +2066,8 @@ def main():
     print(f"\n📊 Статистика:")
     print(f"  Запросов: {stats['total_requests']}")
     print(f"  Попаданий в кеш: {stats['cache_hits']}")
-    print(f"  Активных сервисов: {len(stats['active_services'])}")
+    initialized = [name for name, state in stats['active_services'].items() if state == 'initialized']
+    print(f"  Активных сервисов: {len(initialized)} из {len(stats['active_services'])}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Хеджирование запросов к сервисам перевода
+Если основной сервис не ответил за задержку хеджирования (по умолчанию - его p95),
+тот же текст отправляется следующему сервису цепочки; побеждает первый приемлемый ответ.
+"""
+
+import threading
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, Dict, Optional
+
+
+@dataclass
+class HedgingConfig:
+    """Настройки хеджирования запросов"""
+    delay: Optional[float] = None           # Фиксированная задержка в секундах (None - по задержкам сервиса)
+    percentile: float = 95.0                # Перцентиль задержек основного сервиса
+    min_samples: int = 20                   # Замеров до перехода на перцентиль
+    default_delay: float = 1.0              # Задержка, пока замеров недостаточно
+    min_delay: float = 0.05                 # Нижняя граница задержки
+    max_hedge_rate: Optional[float] = None  # Максимальная доля хеджированных запросов (0..1, None - без ограничения)
+
+
+class LatencyTracker:
+    """Скользящее окно задержек успешных запросов по сервисам"""
+
+    def __init__(self, window: int = 200):
+        """
+        Args:
+            window: Замеров, хранимых для каждого сервиса
+        """
+        self.window = window
+        self._lock = threading.Lock()
+        self._samples: Dict[str, Deque[float]] = {}
+
+    def record(self, service: str, seconds: float):
+        """Добавляет замер задержки сервиса"""
+        with self._lock:
+            samples = self._samples.get(service)
+            if samples is None:
+                samples = self._samples[service] = deque(maxlen=self.window)
+            samples.append(seconds)
+
+    def count(self, service: str) -> int:
+        with self._lock:
+            return len(self._samples.get(service, ()))
+
+    def percentile(self, service: str, percentile: float) -> Optional[float]:
+        """Возвращает перцентиль задержек сервиса или None, если замеров нет"""
+        with self._lock:
+            samples = sorted(self._samples.get(service, ()))
+        if not samples:
+            return None
+        index = min(len(samples) - 1, max(0, int(round(percentile / 100 * len(samples))) - 1))
+        return samples[index]
+
+    def hedge_delay(self, service: str, config: HedgingConfig) -> float:
+        """Задержка перед хеджированием запроса к сервису"""
+        if config.delay is not None:
+            return max(config.min_delay, config.delay)
+        if self.count(service) < config.min_samples:
+            return max(config.min_delay, config.default_delay)
+        return max(config.min_delay, self.percentile(service, config.percentile))
+
+    def get_stats(self) -> Dict[str, Dict[str, float]]:
+        """Возвращает p50 и p95 задержек по сервисам"""
+        with self._lock:
+            services = list(self._samples)
+        return {
+            service: {
+                'samples': self.count(service),
+                'p50': self.percentile(service, 50),
+                'p95': self.percentile(service, 95)
+            }
+            for service in services
+        }
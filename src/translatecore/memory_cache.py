@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Ограниченный кеш переводов в памяти
+Вытеснение по LRU, TTL и (опционально) с учетом стоимости получения перевода
+"""
+
+import sys
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+
+@dataclass
+class MemoryCacheConfig:
+    """Настройки кеша в памяти"""
+    max_entries: Optional[int] = 100000  # Лимит по числу записей (None - без лимита)
+    max_bytes: Optional[int] = None      # Лимит по примерному объему в байтах
+    ttl: Optional[float] = None          # Время жизни записи в секундах
+    policy: str = 'lru'                  # 'lru' или 'cost'
+    eviction_window: int = 16            # Сколько старейших записей сравнивать в режиме 'cost'
+
+
+def estimate_size(value: Any) -> int:
+    """Примерный размер значения в байтах"""
+    if isinstance(value, (str, bytes, int, float, bool)) or value is None:
+        return sys.getsizeof(value)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(estimate_size(k) + estimate_size(v) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(estimate_size(v) for v in value)
+    if hasattr(value, '__dict__'):
+        return sys.getsizeof(value) + estimate_size(vars(value))
+    return sys.getsizeof(value)
+
+
+class _Entry:
+    __slots__ = ('value', 'size', 'cost', 'created')
+
+    def __init__(self, value: Any, size: int, cost: float, created: float):
+        self.value = value
+        self.size = size
+        self.cost = cost
+        self.created = created
+
+
+class MemoryCache:
+    """
+    Потокобезопасный LRU кеш с ограничением по числу записей и объему.
+    Вытесненные записи просто удаляются из памяти - постоянное хранилище их сохраняет.
+    """
+
+    def __init__(self, config: Optional[MemoryCacheConfig] = None):
+        self.config = config or MemoryCacheConfig()
+        if self.config.policy not in ('lru', 'cost'):
+            raise ValueError(f"Неизвестная политика вытеснения: {self.config.policy}")
+
+        self._data: 'OrderedDict[str, _Entry]' = OrderedDict()
+        self._lock = threading.RLock()
+        self._bytes = 0
+        self.stats = {
+            'hits': 0,
+            'misses': 0,
+            'evictions': 0,
+            'expirations': 0
+        }
+
+    def _is_expired(self, entry: _Entry, now: float) -> bool:
+        return self.config.ttl is not None and now - entry.created > self.config.ttl
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Возвращает значение и отмечает запись как недавно использованную"""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.stats['misses'] += 1
+                return default
+            if self._is_expired(entry, time.time()):
+                self._remove(key)
+                self.stats['expirations'] += 1
+                self.stats['misses'] += 1
+                return default
+            self._data.move_to_end(key)
+            self.stats['hits'] += 1
+            return entry.value
+
+    def set(self, key: str, value: Any, cost: float = 1.0):
+        """
+        Добавляет запись
+
+        Args:
+            key: Ключ
+            value: Значение
+            cost: Стоимость повторного получения значения (учитывается политикой 'cost')
+        """
+        size = estimate_size(key) + estimate_size(value)
+        with self._lock:
+            if key in self._data:
+                self._remove(key)
+            self._data[key] = _Entry(value, size, cost, time.time())
+            self._bytes += size
+            self._enforce_limits()
+
+    def pop(self, key: str, default: Any = None) -> Any:
+        with self._lock:
+            if key not in self._data:
+                return default
+            return self._remove(key).value
+
+    def _remove(self, key: str) -> _Entry:
+        entry = self._data.pop(key)
+        self._bytes -= entry.size
+        return entry
+
+    def _over_limit(self) -> bool:
+        if self.config.max_entries is not None and len(self._data) > self.config.max_entries:
+            return True
+        if self.config.max_bytes is not None and self._bytes > self.config.max_bytes:
+            return True
+        return False
+
+    def _enforce_limits(self):
+        self._purge_expired_head()
+        while self._data and self._over_limit():
+            self._remove(self._pick_victim())
+            self.stats['evictions'] += 1
+
+    def _purge_expired_head(self):
+        """Удаляет просроченные записи из начала LRU очереди"""
+        if self.config.ttl is None:
+            return
+        now = time.time()
+        while self._data:
+            key, entry = next(iter(self._data.items()))
+            if not self._is_expired(entry, now):
+                break
+            self._remove(key)
+            self.stats['expirations'] += 1
+
+    def _pick_victim(self) -> str:
+        """Выбирает запись для вытеснения"""
+        if self.config.policy == 'lru':
+            return next(iter(self._data))
+
+        # Политика 'cost': среди самых старых записей вытесняем самую дешевую
+        victim_key = None
+        victim_cost = None
+        for i, (key, entry) in enumerate(self._data.items()):
+            if i >= self.config.eviction_window:
+                break
+            if victim_cost is None or entry.cost < victim_cost:
+                victim_key, victim_cost = key, entry.cost
+        return victim_key
+
+    def purge_expired(self) -> int:
+        """Удаляет все просроченные записи"""
+        if self.config.ttl is None:
+            return 0
+        now = time.time()
+        with self._lock:
+            expired = [key for key, entry in self._data.items() if self._is_expired(entry, now)]
+            for key in expired:
+                self._remove(key)
+            self.stats['expirations'] += len(expired)
+        return len(expired)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._bytes = 0
+
+    def items(self) -> Iterator[Tuple[str, Any]]:
+        with self._lock:
+            return iter([(key, entry.value) for key, entry in self._data.items()])
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Возвращает статистику кеша"""
+        with self._lock:
+            lookups = self.stats['hits'] + self.stats['misses']
+            return {
+                'entries': len(self._data),
+                'bytes': self._bytes,
+                'max_entries': self.config.max_entries,
+                'max_bytes': self.config.max_bytes,
+                'policy': self.config.policy,
+                'hits': self.stats['hits'],
+                'misses': self.stats['misses'],
+                'hit_rate': (self.stats['hits'] / max(1, lookups)) * 100,
+                'evictions': self.stats['evictions'],
+                'expirations': self.stats['expirations']
+            }
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            entry = self._data.get(key)
+            return entry is not None and not self._is_expired(entry, time.time())
+
+    def __getitem__(self, key: str) -> Any:
+        with self._lock:
+            if key not in self:
+                raise KeyError(key)
+            return self.get(key)
+
+    def __setitem__(self, key: str, value: Any):
+        self.set(key, value)
+
+    def __len__(self) -> int:
+        return len(self._data)
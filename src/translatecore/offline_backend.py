@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Жизненный цикл оффлайн бэкенда
+Один OfflineTranslator на все время жизни владельца: запуск с прогревом,
+проверка здоровья, восстановление после сбоев и остановка.
+"""
+
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional
+
+
+@dataclass
+class OfflineBackendConfig:
+    """Настройки жизненного цикла оффлайн бэкенда"""
+    warm_up: bool = True           # Прогреть бэкенд пробным переводом при запуске
+    warm_up_text: str = 'Hello'    # Текст пробного перевода
+    max_failures: int = 3          # Подряд идущих ошибок до повторного определения методов
+    stop_docker: bool = True       # Останавливать контейнер LibreTranslate, запущенный бэкендом
+
+
+class OfflineBackendManager:
+    """
+    Владеет единственным экземпляром оффлайн переводчика.
+
+    Экземпляр создается один раз (проверка методов, Docker, пакетов Argos выполняется
+    только при запуске), после серии ошибок методы определяются заново без пересоздания.
+    """
+
+    def __init__(self, factory: Callable[[], Any], config: Optional[OfflineBackendConfig] = None):
+        """
+        Args:
+            factory: Создает оффлайн переводчик (например, OfflineTranslator)
+            config: Настройки жизненного цикла
+        """
+        self.factory = factory
+        self.config = config or OfflineBackendConfig()
+        self.translator = None
+
+        self._lock = threading.Lock()
+        self._failures = 0
+        self.stats = {
+            'started_at': None,
+            'warm_up_time': None,
+            'warmed_up': False,
+            'failures': 0,
+            'recoveries': 0,
+            'last_error': None
+        }
+
+    def start(self):
+        """Создает и прогревает переводчик (повторные вызовы возвращают тот же экземпляр)"""
+        with self._lock:
+            if self.translator is not None:
+                return self.translator
+
+            self.translator = self.factory()
+            self.stats['started_at'] = time.time()
+            if self.config.warm_up:
+                start_time = time.time()
+                self.stats['warmed_up'] = self.translator.warm_up(self.config.warm_up_text)
+                self.stats['warm_up_time'] = time.time() - start_time
+            return self.translator
+
+    def get(self):
+        """Возвращает запущенный переводчик"""
+        return self.translator if self.translator is not None else self.start()
+
+    def report_success(self):
+        """Сбрасывает счетчик подряд идущих ошибок"""
+        self._failures = 0
+
+    def report_failure(self, error: Exception) -> bool:
+        """
+        Учитывает ошибку перевода
+
+        Returns:
+            bool: True, если после серии ошибок методы перевода были определены заново
+        """
+        with self._lock:
+            self._failures += 1
+            self.stats['failures'] += 1
+            self.stats['last_error'] = str(error)
+            if self.translator is None or self._failures < self.config.max_failures:
+                return False
+
+            self._failures = 0
+            self.stats['recoveries'] += 1
+            try:
+                self.translator.refresh_methods()
+            except Exception as e:
+                self.stats['last_error'] = str(e)
+            return True
+
+    def health(self, probe: bool = True) -> Dict[str, Any]:
+        """
+        Возвращает состояние бэкенда
+
+        Args:
+            probe: Проверить методы перевода (запрос к LibreTranslate, проверка пакетов Argos)
+        """
+        methods = self.translator.check_health() if probe and self.translator is not None else {}
+        return {
+            'running': self.translator is not None,
+            'healthy': any(methods.values()) if probe else None,
+            'methods': methods,
+            'consecutive_failures': self._failures,
+            **self.stats
+        }
+
+    def shutdown(self):
+        """Сбрасывает кеш переводчика и останавливает запущенный им контейнер"""
+        with self._lock:
+            translator, self.translator = self.translator, None
+        if translator is None:
+            return
+        translator.close()
+        if self.config.stop_docker and getattr(translator, 'docker_started', False):
+            translator.stop_docker_libretranslate()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.shutdown()
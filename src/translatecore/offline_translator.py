@@ -5,27 +5,62 @@
 Работает без интернета, без внешних API, полная приватность
 """
 
+import asyncio
 import json
+import logging
 import os
 import time
 import subprocess
 import sys
 from pathlib import Path
 from typing import List, Dict, Optional, Any
-from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, replace
+from functools import partial
 import requests
 import threading
 import signal
 
+logger = logging.getLogger('translatecore.offline')
+
+# Импортируем хранилище кеша
+try:
+    from .cache_store import (get_shared_cache_store, import_json_cache, make_cache_key,
+                              cache_key_prefix, split_legacy_key, DEFAULT_CACHE_BACKEND,
+                              WriteBehindConfig,
+                              pack_value, check_compression)
+    from .memory_cache import MemoryCacheConfig
+    from .cache_snapshot import open_snapshot
+    from .tiered_cache import TieredCache
+    from .batch_providers import split_batches, get_batch_limits
+    from .single_flight import SingleFlight
+except ImportError:
+    from cache_store import (get_shared_cache_store, import_json_cache, make_cache_key,
+                             cache_key_prefix, split_legacy_key, DEFAULT_CACHE_BACKEND,
+                             WriteBehindConfig,
+                             pack_value, check_compression)
+    from memory_cache import MemoryCacheConfig
+    from cache_snapshot import open_snapshot
+    from tiered_cache import TieredCache
+    from batch_providers import split_batches, get_batch_limits
+    from single_flight import SingleFlight
+
 # Попытаемся импортировать argostranslate для прямого использования
 try:
     import argostranslate.package
     import argostranslate.translate
     ARGOS_AVAILABLE = True
 except ImportError:
-    print("⚠️ argostranslate не установлен, будем использовать LibreTranslate сервер")
+    logger.info("argostranslate не установлен, будем использовать LibreTranslate сервер")
     ARGOS_AVAILABLE = False
 
+# aiohttp нужен только для неблокирующих запросов к LibreTranslate в асинхронном API
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    AIOHTTP_AVAILABLE = False
+
 
 @dataclass
 class OfflineTranslationResult:
@@ -62,38 +97,98 @@ class OfflineTranslator:
         'catalan': {'code': 'ca', 'name': 'Catalan'}
     }
     
+    # Пространство имен записей переводчика в общем кеше
+    CACHE_NAMESPACE = 'offline'
+    
+    # Потоков для блокирующих методов (Argos) в асинхронном API: модель одна на процесс
+    ASYNC_WORKERS = 1
+    
     def __init__(self, source_lang: str, target_lang: str, 
                  cache_file: Optional[str] = None,
                  libretranslate_url: Optional[str] = None,
-                 prefer_method: str = 'auto'):
+                 prefer_method: str = 'auto',
+                 cache_backend: str = DEFAULT_CACHE_BACKEND,
+                 memory_cache: Optional[MemoryCacheConfig] = None,
+                 write_behind: Optional[WriteBehindConfig] = None,
+                 cache_snapshot: Optional[str] = None,
+                 cache_compression: Optional[str] = None,
+                 cache: Optional[TieredCache] = None):
         """
         Инициализация оффлайн переводчика
         
         Args:
             source_lang: Исходный язык
             target_lang: Целевой язык
-            cache_file: Файл кеша переводов
+            cache_file: Файл кеша переводов (по умолчанию - общее хранилище для всех пар и процессов)
             libretranslate_url: URL локального LibreTranslate сервера
             prefer_method: Предпочтительный метод ('auto', 'argos', 'libretranslate', 'docker')
+            cache_backend: Бэкенд хранилища кеша ('sqlite', 'append', 'json')
+            memory_cache: Настройки ограниченного кеша в памяти
+            write_behind: Настройки отложенной записи кеша (None - запись сразу)
+            cache_snapshot: Файл снапшота кеша только для чтения (см. cache_snapshot.py)
+            cache_compression: Сжатие длинных переводов в хранилище ('zlib', 'lzma' или None)
+            cache: Готовый многоуровневый кеш владельца (например, EnhancedTranslator);
+                   настройки хранилища, памяти, записи и снапшота тогда не используются
         """
         self.source_lang = source_lang.lower()
         self.target_lang = target_lang.lower()
         self.libretranslate_url = libretranslate_url or "http://localhost:5000"
         self.prefer_method = prefer_method
+        self.docker_started = False  # Контейнер LibreTranslate запущен этим экземпляром
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+        self._http_session = None
+        self._http_loop = None
+        self._single_flight = SingleFlight()
         
-        # Статистика
+        # Статистика (обновляется из рабочих потоков пакетного перевода)
+        self._stats_lock = threading.Lock()
         self.stats = {
             'total_requests': 0,
             'cache_hits': 0,
             'argos_translations': 0,
             'libretranslate_translations': 0,
             'docker_translations': 0,
+            'batch_texts': 0,
+            'batch_unique_texts': 0,
+            'coalesced': 0,
             'errors': []
         }
         
         # Кеш переводов
-        self.cache_file = cache_file or f"offline_cache_{self.source_lang}_{self.target_lang}.json"
-        self.cache = self._load_cache()
+        self._cache_prefix = cache_key_prefix(self.source_lang, self.target_lang, self.CACHE_NAMESPACE)
+        if cache is not None:
+            # Кеш владельца: каждый перевод хранится один раз на все переводчики
+            self.cache = cache
+            self.cache_store = cache.store
+            self.cache_file = str(cache.store.path)
+            self.cache_compression = cache.compression
+            self.cache_snapshot = cache.snapshot
+            self.write_behind = None
+        else:
+            check_compression(cache_compression)
+            self.cache_compression = cache_compression
+            self.cache_store = get_shared_cache_store(cache_file, cache_backend)
+            self.cache_file = str(self.cache_store.path)
+            self.memory_cache_config = memory_cache
+        
+        # Однократно переносим кеш старого формата. С кешем владельца переводчик
+        # вызывается без кеша (use_cache=False), и записи 'offline' никто бы не прочитал
+        if cache is None:
+            if cache_file and cache_file.endswith('.json'):
+                self._import_legacy_cache(cache_file)
+            else:
+                self._import_legacy_cache(f"offline_cache_{self.source_lang}_{self.target_lang}.json")
+        
+        if cache is None:
+            # Отложенная запись убирает дисковый ввод-вывод из translate(); обертка общая для процесса
+            self.write_behind = write_behind
+            if write_behind:
+                self.cache_store = get_shared_cache_store(cache_file, cache_backend, write_behind)
+            
+            # Снапшот отображается в память и разделяется между процессами
+            self.cache_snapshot = open_snapshot(cache_snapshot) if cache_snapshot else None
+            self.cache = self._load_cache()
         
         # Проверяем доступные методы
         self.available_methods = self._check_available_methods()
@@ -101,35 +196,56 @@ class OfflineTranslator:
         if not self.available_methods:
             raise RuntimeError("❌ Нет доступных методов оффлайн перевода!")
         
-        print(f"🔧 Доступные методы: {', '.join(self.available_methods)}")
+        logger.info("Доступные методы: %s", ', '.join(self.available_methods))
         
         # Рекомендация пользователю
-        if 'argos' in self.available_methods:
-            print("💡 Рекомендация: Argos Translate - лучший выбор для персонального использования")
-        elif 'libretranslate' in self.available_methods or 'docker' in self.available_methods:
-            print("💡 Рекомендация: Установите Argos Translate для лучшей производительности: pip install argostranslate")
+        if 'argos' not in self.available_methods:
+            logger.info("Установите Argos Translate для лучшей производительности: pip install argostranslate")
         
         # Инициализируем Argos если доступен
         if 'argos' in self.available_methods:
             self._init_argos()
     
-    def _load_cache(self) -> Dict[str, str]:
-        """Загружает кеш переводов"""
-        if Path(self.cache_file).exists():
-            try:
-                with open(self.cache_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            except Exception as e:
-                print(f"⚠️ Ошибка загрузки кеша: {e}")
-        return {}
+    def _load_cache(self) -> TieredCache:
+        """Создает многоуровневый кеш переводов (записи подгружаются из хранилища по мере обращения)"""
+        return TieredCache(
+            self.cache_store,
+            memory_cache=self.memory_cache_config,
+            snapshot=self.cache_snapshot,
+            compression=self.cache_compression
+        )
+    
+    def _import_legacy_cache(self, json_path: str):
+        """Импортирует JSON кеш старого формата в общее хранилище"""
+        try:
+            import_json_cache(self.cache_store, json_path, self._convert_legacy_entry)
+        except Exception as e:
+            logger.warning("Ошибка импорта кеша %s: %s", json_path, e)
+    
+    def _convert_legacy_entry(self, key: str, value: Any):
+        """Конвертирует запись 'текст|source|target' в ключ и значение общего кеша"""
+        parts = split_legacy_key(key)
+        if parts is None or not isinstance(value, str):
+            return None
+        text, source_lang, target_lang = parts
+        return (make_cache_key(text, source_lang, target_lang, self.CACHE_NAMESPACE),
+                pack_value({'translated': value}, self.cache_compression))
+    
+    def _cache_get(self, key: str) -> Optional[str]:
+        """Ищет перевод в памяти, затем в снапшоте и в постоянном хранилище"""
+        try:
+            record = self.cache.get(key)
+        except Exception as e:
+            logger.warning("Ошибка загрузки кеша: %s", e)
+            return None
+        return record['translated'] if record is not None else None
     
-    def _save_cache(self):
-        """Сохраняет кеш переводов"""
+    def _cache_put(self, key: str, translated: str, cost: float = 1.0):
+        """Сохраняет перевод в памяти и в постоянном хранилище"""
         try:
-            with open(self.cache_file, 'w', encoding='utf-8') as f:
-                json.dump(self.cache, f, ensure_ascii=False, indent=2)
+            self.cache.set(key, {'translated': translated, 'created': int(time.time())}, cost=cost)
         except Exception as e:
-            print(f"⚠️ Ошибка сохранения кеша: {e}")
+            logger.warning("Ошибка сохранения кеша: %s", e)
     
     def _check_available_methods(self) -> List[str]:
         """Проверяет доступные методы перевода"""
@@ -138,14 +254,14 @@ class OfflineTranslator:
         # Проверяем прямой Argos
         if ARGOS_AVAILABLE:
             methods.append('argos')
-            print("✅ Argos Translate доступен напрямую")
+            logger.debug("Argos Translate доступен напрямую")
         
         # Проверяем локальный LibreTranslate сервер
         try:
             response = requests.get(f"{self.libretranslate_url}/languages", timeout=2)
             if response.status_code == 200:
                 methods.append('libretranslate')
-                print(f"✅ LibreTranslate сервер доступен: {self.libretranslate_url}")
+                logger.debug("LibreTranslate сервер доступен: %s", self.libretranslate_url)
         except:
             pass
         
@@ -155,28 +271,30 @@ class OfflineTranslator:
                                   capture_output=True, text=True, timeout=5)
             if result.returncode == 0:
                 methods.append('docker')
-                print("✅ Docker доступен для запуска LibreTranslate")
+                logger.debug("Docker доступен для запуска LibreTranslate")
         except:
             pass
         
         return methods
     
+    @staticmethod
+    def _is_package_installed(from_code: str, to_code: str) -> bool:
+        """Проверяет, установлен ли языковой пакет Argos"""
+        return any(
+            p.from_code == from_code and p.to_code == to_code 
+            for p in argostranslate.package.get_installed_packages()
+        )
+    
     def _ensure_language_package(self, from_code: str, to_code: str) -> bool:
         """Автоматически загружает языковой пакет если нужен"""
         try:
-            # Обновляем индекс пакетов
-            argostranslate.package.update_package_index()
+            # Установленный пакет не требует обращения к сети
+            if self._is_package_installed(from_code, to_code):
+                return True
             
-            # Проверяем, установлен ли пакет
-            installed_packages = argostranslate.package.get_installed_packages()
-            is_installed = any(
-                p.from_code == from_code and p.to_code == to_code 
-                for p in installed_packages
-            )
+            # Обновляем индекс пакетов только для загрузки недостающего
+            argostranslate.package.update_package_index()
             
-            if is_installed:
-                return True
-                
             # Ищем пакет для загрузки
             available_packages = argostranslate.package.get_available_packages()
             package = next(
@@ -186,17 +304,16 @@ class OfflineTranslator:
             )
             
             if package:
-                print(f"📦 Автоматически скачиваем языковой пакет: {from_code}→{to_code}...")
-                print("   (это происходит только при первом использовании)")
+                logger.info("Скачиваем языковой пакет %s→%s (только при первом использовании)", from_code, to_code)
                 argostranslate.package.install_from_path(package.download())
-                print(f"✅ Языковой пакет {from_code}→{to_code} успешно установлен")
+                logger.info("Языковой пакет %s→%s установлен", from_code, to_code)
                 return True
             else:
-                print(f"⚠️ Языковой пакет {from_code}→{to_code} недоступен в Argos")
+                logger.warning("Языковой пакет %s→%s недоступен в Argos", from_code, to_code)
                 return False
                 
         except Exception as e:
-            print(f"❌ Ошибка загрузки пакета {from_code}→{to_code}: {e}")
+            logger.error("Ошибка загрузки пакета %s→%s: %s", from_code, to_code, e)
             return False
     
     def _init_argos(self):
@@ -210,13 +327,13 @@ class OfflineTranslator:
             
             # Проверяем и загружаем пакет автоматически
             if self._ensure_language_package(source_code, target_code):
-                print(f"✅ Argos Translate готов для {self.source_lang} → {self.target_lang}")
+                logger.info("Argos Translate готов для %s → %s", self.source_lang, self.target_lang)
             else:
-                print(f"❌ Не удалось подготовить пакет {self.source_lang} → {self.target_lang}")
+                logger.error("Не удалось подготовить пакет %s → %s", self.source_lang, self.target_lang)
                 self.available_methods = [m for m in self.available_methods if m != 'argos']
                 
         except Exception as e:
-            print(f"❌ Ошибка инициализации Argos: {e}")
+            logger.error("Ошибка инициализации Argos: %s", e)
             self.available_methods = [m for m in self.available_methods if m != 'argos']
     
     def translate_with_argos(self, text: str) -> OfflineTranslationResult:
@@ -233,7 +350,7 @@ class OfflineTranslator:
             translated = argostranslate.translate.translate(text, source_code, target_code)
             processing_time = time.time() - start_time
             
-            self.stats['argos_translations'] += 1
+            self._count('argos_translations')
             
             return OfflineTranslationResult(
                 original=text,
@@ -273,7 +390,7 @@ class OfflineTranslator:
                 translated = result['translatedText']
                 processing_time = time.time() - start_time
                 
-                self.stats['libretranslate_translations'] += 1
+                self._count('libretranslate_translations')
                 
                 return OfflineTranslationResult(
                     original=text,
@@ -295,14 +412,14 @@ class OfflineTranslator:
             return False
         
         try:
-            print("🐳 Запускаем LibreTranslate в Docker...")
+            logger.info("Запускаем LibreTranslate в Docker")
             
             # Проверяем, не запущен ли уже контейнер
             check_cmd = ['docker', 'ps', '--filter', 'name=libretranslate-offline', '--format', '{{.Names}}']
             result = subprocess.run(check_cmd, capture_output=True, text=True, timeout=10)
             
             if 'libretranslate-offline' in result.stdout:
-                print("✅ LibreTranslate контейнер уже запущен")
+                logger.info("LibreTranslate контейнер уже запущен")
                 return True
             
             # Запускаем контейнер
@@ -314,14 +431,15 @@ class OfflineTranslator:
             ]
             
             subprocess.run(docker_cmd, check=True, timeout=60)
+            self.docker_started = True
             
             # Ждем запуска сервиса
-            print("⏳ Ждем запуска сервиса...")
+            logger.info("Ждем запуска сервиса")
             for i in range(30):  # Ждем до 30 секунд
                 try:
                     response = requests.get("http://localhost:5000/languages", timeout=2)
                     if response.status_code == 200:
-                        print("✅ LibreTranslate запущен в Docker")
+                        logger.info("LibreTranslate запущен в Docker")
                         self.libretranslate_url = "http://localhost:5000"
                         if 'libretranslate' not in self.available_methods:
                             self.available_methods.append('libretranslate')
@@ -330,11 +448,11 @@ class OfflineTranslator:
                     pass
                 time.sleep(1)
             
-            print("❌ Не удалось дождаться запуска LibreTranslate")
+            logger.error("Не удалось дождаться запуска LibreTranslate")
             return False
             
         except Exception as e:
-            print(f"❌ Ошибка запуска Docker: {e}")
+            logger.error("Ошибка запуска Docker: %s", e)
             return False
     
     def stop_docker_libretranslate(self):
@@ -344,10 +462,54 @@ class OfflineTranslator:
                          capture_output=True, timeout=10)
             subprocess.run(['docker', 'rm', 'libretranslate-offline'], 
                          capture_output=True, timeout=10)
-            print("🐳 Docker контейнер остановлен")
+            logger.info("Docker контейнер остановлен")
         except:
             pass
     
+    def check_health(self) -> Dict[str, bool]:
+        """Проверяет, отвечают ли доступные методы перевода"""
+        health = {}
+        for method in self.available_methods:
+            try:
+                if method == 'argos':
+                    source_code = self.LANGUAGE_CODES[self.source_lang]['code']
+                    target_code = self.LANGUAGE_CODES[self.target_lang]['code']
+                    health[method] = self._is_package_installed(source_code, target_code)
+                elif method == 'libretranslate':
+                    response = requests.get(f"{self.libretranslate_url}/languages", timeout=2)
+                    health[method] = response.status_code == 200
+                else:
+                    result = subprocess.run(['docker', '--version'], capture_output=True, timeout=5)
+                    health[method] = result.returncode == 0
+            except Exception:
+                health[method] = False
+        return health
+    
+    def refresh_methods(self) -> List[str]:
+        """Заново определяет доступные методы (после сбоя бэкенда)"""
+        self.available_methods = self._check_available_methods()
+        if 'argos' in self.available_methods:
+            self._init_argos()
+        return self.available_methods
+    
+    def warm_up(self, text: str = 'Hello') -> bool:
+        """
+        Прогревает бэкенд пробным переводом (загрузка модели Argos, соединение с LibreTranslate)
+        
+        Docker при прогреве не запускается, результат не кешируется.
+        """
+        try:
+            if 'argos' in self.available_methods:
+                self.translate_with_argos(text)
+            elif 'libretranslate' in self.available_methods:
+                self.translate_with_libretranslate(text)
+            else:
+                return False
+            return True
+        except Exception as e:
+            logger.warning("Ошибка прогрева оффлайн перевода: %s", e)
+            return False
+    
     def translate(self, text: str, use_cache: bool = True) -> OfflineTranslationResult:
         """
         Главный метод перевода
@@ -359,22 +521,26 @@ class OfflineTranslator:
         Returns:
             OfflineTranslationResult: Результат перевода
         """
-        self.stats['total_requests'] += 1
+        self._count('total_requests')
         
         # Проверяем кеш
-        cache_key = f"{text}|{self.source_lang}|{self.target_lang}"
-        if use_cache and cache_key in self.cache:
-            self.stats['cache_hits'] += 1
-            cached = self.cache[cache_key]
-            return OfflineTranslationResult(
-                original=text,
-                translated=cached,
-                source_lang=self.source_lang,
-                target_lang=self.target_lang,
-                method='cache',
-                processing_time=0.0
-            )
+        cache_key = make_cache_key(text, self.source_lang, self.target_lang, self.CACHE_NAMESPACE)
+        if not use_cache:
+            return self._translate_uncached(text, cache_key, use_cache)
+        
+        cached = self._cached_result(cache_key, text)
+        if cached is not None:
+            return cached
         
+        # Одновременные запросы того же текста ждут первый вместо повторного перевода
+        result, shared = self._single_flight.do(cache_key, partial(self._translate_uncached, text, cache_key, use_cache))
+        if shared:
+            self._count('coalesced')
+            return replace(result)
+        return result
+    
+    def _translate_uncached(self, text: str, cache_key: str, use_cache: bool) -> OfflineTranslationResult:
+        """Переводит текст, которого нет в кеше, первым сработавшим методом"""
         # Выбираем метод перевода
         method_order = self._get_method_order()
         
@@ -388,7 +554,7 @@ class OfflineTranslator:
                     if self.start_docker_libretranslate():
                         result = self.translate_with_libretranslate(text)
                         result.method = 'libretranslate_docker'
-                        self.stats['docker_translations'] += 1
+                        self._count('docker_translations')
                     else:
                         continue
                 else:
@@ -396,21 +562,186 @@ class OfflineTranslator:
                 
                 # Сохраняем в кеш
                 if use_cache:
-                    self.cache[cache_key] = result.translated
-                    self._save_cache()
+                    # Медленные переводы (например, Argos на длинном тексте) дороже вытеснять
+                    self._cache_put(cache_key, result.translated, cost=1.0 + result.processing_time)
                 
-                print(f"✅ Переведено через {result.method} за {result.processing_time:.2f}с")
+                logger.debug("Переведено через %s за %.2fс", result.method, result.processing_time)
                 return result
                 
             except Exception as e:
                 error_msg = f"{method}: {str(e)}"
-                print(f"❌ {error_msg}")
-                self.stats['errors'].append(error_msg)
+                logger.warning("%s", error_msg)
+                self._record_error(error_msg)
                 continue
         
         # Если все методы не сработали
         raise RuntimeError("❌ Все методы оффлайн перевода недоступны")
     
+    def _cached_result(self, cache_key: str, text: str) -> Optional[OfflineTranslationResult]:
+        """Возвращает перевод из кеша в виде результата"""
+        cached = self._cache_get(cache_key)
+        if cached is None:
+            return None
+        self._count('cache_hits')
+        return OfflineTranslationResult(
+            original=text,
+            translated=cached,
+            source_lang=self.source_lang,
+            target_lang=self.target_lang,
+            method='cache',
+            processing_time=0.0
+        )
+    
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Ограниченный пул потоков для блокирующих методов в асинхронном API"""
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.ASYNC_WORKERS,
+                                                    thread_name_prefix='translatecore-offline')
+            return self._executor
+    
+    async def _get_http_session(self):
+        """HTTP сессия aiohttp текущего цикла событий"""
+        loop = asyncio.get_running_loop()
+        if self._http_session is None or self._http_session.closed or self._http_loop is not loop:
+            self._http_session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=30))
+            self._http_loop = loop
+        return self._http_session
+    
+    async def translate_with_libretranslate_async(self, text: str) -> OfflineTranslationResult:
+        """Переводит текст через локальный LibreTranslate сервер без блокировки цикла событий"""
+        if 'libretranslate' not in self.available_methods:
+            raise RuntimeError("LibreTranslate сервер недоступен")
+        
+        # Без aiohttp блокирующий запрос выполняется в пуле потоков
+        if not AIOHTTP_AVAILABLE:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), self.translate_with_libretranslate, text)
+        
+        start_time = time.time()
+        source_code = self.LANGUAGE_CODES[self.source_lang]['code']
+        target_code = self.LANGUAGE_CODES[self.target_lang]['code']
+        
+        try:
+            session = await self._get_http_session()
+            async with session.post(
+                f"{self.libretranslate_url}/translate",
+                json={'q': text, 'source': source_code, 'target': target_code}
+            ) as response:
+                if response.status != 200:
+                    raise RuntimeError(f"LibreTranslate ошибка: {response.status}")
+                result = await response.json()
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            raise RuntimeError(f"Ошибка LibreTranslate: {e}")
+        
+        self._count('libretranslate_translations')
+        
+        return OfflineTranslationResult(
+            original=text,
+            translated=result['translatedText'],
+            source_lang=self.source_lang,
+            target_lang=self.target_lang,
+            method='libretranslate_local',
+            processing_time=time.time() - start_time
+        )
+    
+    async def translate_async(self, text: str, use_cache: bool = True) -> OfflineTranslationResult:
+        """
+        Асинхронный вариант translate()
+        
+        Argos выполняется в ограниченном пуле потоков, LibreTranslate - неблокирующим HTTP запросом.
+        Отмена (CancelledError) не перехватывается и прерывает перебор методов.
+        
+        Args:
+            text: Текст для перевода
+            use_cache: Использовать кеш
+            
+        Returns:
+            OfflineTranslationResult: Результат перевода
+        """
+        self._count('total_requests')
+        
+        cache_key = make_cache_key(text, self.source_lang, self.target_lang, self.CACHE_NAMESPACE)
+        if not use_cache:
+            return await self._translate_uncached_async(text, cache_key, use_cache)
+        
+        cached = self._cached_result(cache_key, text)
+        if cached is not None:
+            return cached
+        
+        result, shared = await self._single_flight.do_async(
+            cache_key, partial(self._translate_uncached_async, text, cache_key, use_cache)
+        )
+        if shared:
+            self._count('coalesced')
+            return replace(result)
+        return result
+    
+    async def _translate_uncached_async(self, text: str, cache_key: str, use_cache: bool) -> OfflineTranslationResult:
+        """Асинхронный вариант _translate_uncached"""
+        loop = asyncio.get_running_loop()
+        for method in self._get_method_order():
+            try:
+                if method == 'argos':
+                    result = await loop.run_in_executor(self._get_executor(), self.translate_with_argos, text)
+                elif method == 'libretranslate':
+                    result = await self.translate_with_libretranslate_async(text)
+                elif method == 'docker':
+                    if await loop.run_in_executor(self._get_executor(), self.start_docker_libretranslate):
+                        result = await self.translate_with_libretranslate_async(text)
+                        result.method = 'libretranslate_docker'
+                        self._count('docker_translations')
+                    else:
+                        continue
+                else:
+                    continue
+                
+                if use_cache:
+                    self._cache_put(cache_key, result.translated, cost=1.0 + result.processing_time)
+                
+                logger.debug("Переведено через %s за %.2fс", result.method, result.processing_time)
+                return result
+                
+            except Exception as e:
+                error_msg = f"{method}: {str(e)}"
+                logger.warning("%s", error_msg)
+                self._record_error(error_msg)
+                continue
+        
+        raise RuntimeError("❌ Все методы оффлайн перевода недоступны")
+    
+    async def translate_batch_async(self, texts: List[str],
+                                    max_concurrency: int = 4) -> List[OfflineTranslationResult]:
+        """Асинхронно переводит список текстов (результаты в порядке входных текстов)"""
+        limit = asyncio.Semaphore(max_concurrency)
+        
+        async def translate_one(text: str) -> OfflineTranslationResult:
+            async with limit:
+                try:
+                    return await self.translate_async(text)
+                except Exception as e:
+                    logger.warning("Ошибка перевода '%s': %s", text, e)
+                    return OfflineTranslationResult(
+                        original=text,
+                        translated=text,
+                        source_lang=self.source_lang,
+                        target_lang=self.target_lang,
+                        method='error'
+                    )
+        
+        return list(await asyncio.gather(*(translate_one(text) for text in texts)))
+    
+    async def aclose_http(self):
+        """Закрывает HTTP сессию асинхронного API"""
+        if self._http_session is not None and not self._http_session.closed:
+            await self._http_session.close()
+        self._http_session = None
+    
+    async def aclose(self):
+        """Асинхронно закрывает переводчик"""
+        await self.aclose_http()
+        self.close()
+    
     def _get_method_order(self) -> List[str]:
         """Определяет порядок использования методов"""
         if self.prefer_method == 'auto':
@@ -425,49 +756,168 @@ class OfflineTranslator:
         return [m for m in order if m in self.available_methods]
     
     def translate_batch(self, texts: List[str], show_progress: bool = True) -> List[OfflineTranslationResult]:
-        """Переводит список текстов"""
+        """
+        Переводит список текстов
+        
+        Повторяющиеся тексты переводятся один раз, результат раздается всем их позициям.
+        Прогресс (при show_progress) и итоговая строка пакета пишутся в лог на уровне INFO.
+        """
+        start_time = time.time()
+        unique_texts = list(dict.fromkeys(texts))
+        self._count('batch_texts', len(texts))
+        self._count('batch_unique_texts', len(unique_texts))
+        
+        translated = dict(zip(unique_texts, self._translate_unique(unique_texts, show_progress)))
+        first_seen = set()
         results = []
+        for text in texts:
+            result = translated[text]
+            results.append(result if text not in first_seen else replace(result))
+            first_seen.add(text)
+        
+        logger.info("Пакет: %d текстов (%d уникальных), из кеша %d, с ошибкой %d за %.2fс",
+                    len(texts), len(unique_texts),
+                    sum(result.method == 'cache' for result in translated.values()),
+                    sum(result.method == 'error' for result in translated.values()),
+                    time.time() - start_time)
+        return results
+    
+    def _translate_unique(self, texts: List[str], show_progress: bool = True) -> List[OfflineTranslationResult]:
+        """
+        Переводит список различных текстов
+        
+        Если первым методом идет LibreTranslate, промахи кеша отправляются пачками
+        (поле 'q' со списком текстов); тексты из неудавшихся пачек переводятся по одному.
+        """
         total = len(texts)
+        results: List[Optional[OfflineTranslationResult]] = [None] * total
+        
+        if self.native_batch_available():
+            misses = []
+            for i, text in enumerate(texts):
+                cache_key = make_cache_key(text, self.source_lang, self.target_lang, self.CACHE_NAMESPACE)
+                cached = self._cached_result(cache_key, text)
+                if cached is not None:
+                    self._count('total_requests')
+                    results[i] = cached
+                else:
+                    misses.append(i)
+            
+            for batch in split_batches([texts[i] for i in misses], get_batch_limits(self.CACHE_NAMESPACE)):
+                indices = [misses[j] for j in batch]
+                try:
+                    batch_results = self.translate_with_libretranslate_batch([texts[i] for i in indices])
+                except Exception as e:
+                    error_msg = f"libretranslate batch: {str(e)}"
+                    logger.warning("%s", error_msg)
+                    self._record_error(error_msg)
+                    continue
+                
+                for i, result in zip(indices, batch_results):
+                    self._count('total_requests')
+                    cache_key = make_cache_key(texts[i], self.source_lang, self.target_lang, self.CACHE_NAMESPACE)
+                    self._cache_put(cache_key, result.translated, cost=1.0 + result.processing_time)
+                    results[i] = result
+                
+                if show_progress:
+                    done = sum(result is not None for result in results)
+                    logger.info("Прогресс: %d/%d (%.1f%%)", done, total, (done / total) * 100)
         
         for i, text in enumerate(texts):
+            if results[i] is not None:
+                continue
             if show_progress and i % 5 == 0:
-                progress = (i / total) * 100
-                print(f"📊 Прогресс: {i}/{total} ({progress:.1f}%)")
+                logger.info("Прогресс: %d/%d (%.1f%%)", i, total, (i / total) * 100)
             
             try:
-                result = self.translate(text)
-                results.append(result)
+                results[i] = self.translate(text)
             except Exception as e:
-                print(f"❌ Ошибка перевода '{text}': {e}")
+                logger.warning("Ошибка перевода '%s': %s", text, e)
                 # Возвращаем оригинальный текст при ошибке
-                results.append(OfflineTranslationResult(
+                results[i] = OfflineTranslationResult(
                     original=text,
                     translated=text,
                     source_lang=self.source_lang,
                     target_lang=self.target_lang,
                     method='error'
-                ))
-        
-        if show_progress:
-            print(f"📊 Прогресс: {total}/{total} (100.0%)")
+                )
         
         return results
     
+    def native_batch_available(self) -> bool:
+        """Переводит ли основной метод несколько текстов за один запрос"""
+        return self._get_method_order()[:1] == ['libretranslate']
+    
+    def translate_with_libretranslate_batch(self, texts: List[str]) -> List[OfflineTranslationResult]:
+        """Переводит несколько текстов одним запросом к LibreTranslate"""
+        if 'libretranslate' not in self.available_methods:
+            raise RuntimeError("LibreTranslate сервер недоступен")
+        
+        start_time = time.time()
+        source_code = self.LANGUAGE_CODES[self.source_lang]['code']
+        target_code = self.LANGUAGE_CODES[self.target_lang]['code']
+        
+        response = requests.post(
+            f"{self.libretranslate_url}/translate",
+            json={'q': texts, 'source': source_code, 'target': target_code},
+            timeout=30
+        )
+        if response.status_code != 200:
+            raise RuntimeError(f"LibreTranslate ошибка: {response.status_code}")
+        
+        translated = response.json()['translatedText']
+        if len(translated) != len(texts):
+            raise RuntimeError(f"LibreTranslate вернул {len(translated)} переводов вместо {len(texts)}")
+        
+        processing_time = (time.time() - start_time) / len(texts)
+        self._count('libretranslate_translations', len(texts))
+        return [
+            OfflineTranslationResult(
+                original=text,
+                translated=translation,
+                source_lang=self.source_lang,
+                target_lang=self.target_lang,
+                method='libretranslate_local',
+                processing_time=processing_time
+            )
+            for text, translation in zip(texts, translated)
+        ]
+    
+    def _count(self, name: str, amount: int = 1):
+        """Потокобезопасно увеличивает счетчик статистики"""
+        with self._stats_lock:
+            self.stats[name] += amount
+    
+    def _record_error(self, error_msg: str):
+        with self._stats_lock:
+            self.stats['errors'].append(error_msg)
+    
     def get_stats(self) -> Dict[str, Any]:
         """Возвращает статистику использования"""
+        with self._stats_lock:
+            stats = dict(self.stats)
+            errors = list(self.stats['errors'])
+        
         return {
-            'total_requests': self.stats['total_requests'],
-            'cache_hits': self.stats['cache_hits'],
-            'cache_hit_rate': (self.stats['cache_hits'] / max(1, self.stats['total_requests'])) * 100,
-            'cache_size': len(self.cache),
+            'total_requests': stats['total_requests'],
+            'cache_hits': stats['cache_hits'],
+            'cache_hit_rate': (stats['cache_hits'] / max(1, stats['total_requests'])) * 100,
+            'cache_size': self.cache.count(self._cache_prefix),
+            'cache_tiers': self.cache.get_stats(),
+            'cache_pending_writes': self.cache.pending_writes(),
+            'batch_texts': stats['batch_texts'],
+            'batch_unique_texts': stats['batch_unique_texts'],
+            'batch_dedup_ratio': ((stats['batch_texts'] - stats['batch_unique_texts'])
+                                  / max(1, stats['batch_texts'])) * 100,
+            'coalesced': stats['coalesced'],
             'methods_used': {
-                'argos': self.stats['argos_translations'],
-                'libretranslate': self.stats['libretranslate_translations'], 
-                'docker': self.stats['docker_translations']
+                'argos': stats['argos_translations'],
+                'libretranslate': stats['libretranslate_translations'], 
+                'docker': stats['docker_translations']
             },
             'available_methods': self.available_methods,
-            'errors_count': len(self.stats['errors']),
-            'errors': self.stats['errors'][-3:] if self.stats['errors'] else []
+            'errors_count': len(errors),
+            'errors': errors[-3:] if errors else []
         }
     
     def get_supported_languages(self) -> Dict[str, Dict[str, str]]:
@@ -477,7 +927,7 @@ class OfflineTranslator:
     def install_language_package(self, source_lang: str, target_lang: str) -> bool:
         """Устанавливает языковой пакет для Argos"""
         if not ARGOS_AVAILABLE:
-            print("❌ Argos Translate не установлен")
+            logger.error("Argos Translate не установлен")
             return False
         
         try:
@@ -492,18 +942,35 @@ class OfflineTranslator:
             for package in available_packages:
                 if (package.from_code == source_code and 
                     package.to_code == target_code):
-                    print(f"📦 Скачиваем пакет {source_lang}→{target_lang}...")
+                    logger.info("Скачиваем пакет %s→%s", source_lang, target_lang)
                     argostranslate.package.install_from_path(package.download())
-                    print("✅ Пакет установлен")
+                    logger.info("Пакет %s→%s установлен", source_lang, target_lang)
                     return True
             
-            print(f"❌ Пакет {source_lang}→{target_lang} не найден")
+            logger.error("Пакет %s→%s не найден", source_lang, target_lang)
             return False
             
         except Exception as e:
-            print(f"❌ Ошибка установки пакета: {e}")
+            logger.error("Ошибка установки пакета: %s", e)
             return False
     
+    def flush(self):
+        """Сбрасывает отложенные записи кеша на диск"""
+        self.cache.flush()
+    
+    def close(self):
+        """Сбрасывает кеш и освобождает ресурсы переводчика"""
+        self.flush()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+    
     def __del__(self):
         """Очистка при удалении объекта"""
         if hasattr(self, 'prefer_method') and self.prefer_method == 'docker':
@@ -580,6 +1047,7 @@ def main():
                        help='Запустить LibreTranslate в Docker')
     
     args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
     
     if args.install_deps:
         install_offline_requirements()
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Ограничение частоты запросов к сервисам перевода
+Маркерная корзина с запасом (burst) на каждую пару сервис + API ключ;
+корзины общие для всех переводчиков процесса, потоков и асинхронного API.
+"""
+
+import asyncio
+import hashlib
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+
+logger = logging.getLogger('translatecore.rate_limit')
+
+
+@dataclass
+class RateLimit:
+    """Ограничение частоты запросов"""
+    rate: float            # Запросов в секунду в среднем
+    burst: int = 1         # Запросов подряд без ожидания
+
+
+class TokenBucket:
+    """
+    Потокобезопасная маркерная корзина
+
+    Маркеры пополняются со скоростью rate до burst; запрос забирает маркер.
+    try_acquire() не блокирует, wait_time() подсказывает, сколько ждать маркер.
+    """
+
+    def __init__(self, limit: RateLimit):
+        self.limit = limit
+        self._lock = threading.Lock()
+        self._tokens = float(limit.burst)
+        self._updated = time.monotonic()
+        self.stats = {
+            'acquired': 0,
+            'rejected': 0
+        }
+
+    def _refill(self, now: float):
+        self._tokens = min(float(self.limit.burst), self._tokens + (now - self._updated) * self.limit.rate)
+        self._updated = now
+
+    def try_acquire(self, tokens: float = 1.0) -> bool:
+        """Забирает маркеры, если они есть; иначе возвращает False, не ожидая"""
+        with self._lock:
+            self._refill(time.monotonic())
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                self.stats['acquired'] += 1
+                return True
+            self.stats['rejected'] += 1
+            return False
+
+    def wait_time(self, tokens: float = 1.0) -> float:
+        """Секунд до появления нужного числа маркеров"""
+        with self._lock:
+            self._refill(time.monotonic())
+            missing = tokens - self._tokens
+        return max(0.0, missing / self.limit.rate) if self.limit.rate > 0 else float('inf')
+
+    def acquire(self, tokens: float = 1.0, timeout: Optional[float] = None) -> bool:
+        """Ждет маркеры не дольше timeout секунд (None - без ограничения)"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not self.try_acquire(tokens):
+            delay = self.wait_time(tokens)
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or delay > remaining:
+                    return False
+            time.sleep(min(delay, 1.0) or 0.001)
+        return True
+
+    async def acquire_async(self, tokens: float = 1.0, timeout: Optional[float] = None) -> bool:
+        """Асинхронный вариант acquire: ждет маркеры, не блокируя цикл событий"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not self.try_acquire(tokens):
+            delay = self.wait_time(tokens)
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or delay > remaining:
+                    return False
+            await asyncio.sleep(min(delay, 1.0) or 0.001)
+        return True
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            self._refill(time.monotonic())
+            return {
+                'rate': self.limit.rate,
+                'burst': self.limit.burst,
+                'available': self._tokens,
+                **self.stats
+            }
+
+
+# Корзины процесса по (сервис, отпечаток API ключа)
+_buckets: Dict[Tuple[str, str], TokenBucket] = {}
+_buckets_lock = threading.Lock()
+
+
+def _key_fingerprint(api_key: Any) -> str:
+    """Отпечаток API ключа (сам ключ не хранится)"""
+    if not api_key:
+        return ''
+    return hashlib.blake2b(repr(api_key).encode('utf-8'), digest_size=8).hexdigest()
+
+
+def get_rate_limiter(service: str, api_key: Any, limit: RateLimit) -> TokenBucket:
+    """
+    Возвращает общую корзину сервиса и API ключа
+
+    Переводчики с одним ключом делят одну корзину. Лимит задает первый переводчик:
+    корзина с другим ограничением не создается, иначе переводчики сбрасывали бы
+    запас друг друга.
+    """
+    key = (service, _key_fingerprint(api_key))
+    with _buckets_lock:
+        bucket = _buckets.get(key)
+        if bucket is None:
+            bucket = _buckets[key] = TokenBucket(limit)
+        elif bucket.limit != limit:
+            logger.warning("%s: лимит %s не применен, ключ уже использует %s", service, limit, bucket.limit)
+        return bucket
+
+
+def rate_limit_from_settings(settings: Optional[Dict[str, Any]]) -> Optional[RateLimit]:
+    """
+    Ограничение из настроек сервиса: 'rate_limit' (запросов в секунду) и 'burst'
+
+    Returns:
+        Optional[RateLimit]: None, если ограничение не задано
+    """
+    settings = settings or {}
+    if not settings.get('rate_limit'):
+        return None
+    rate = float(settings['rate_limit'])
+    return RateLimit(rate=rate, burst=max(1, int(settings.get('burst', max(1, round(rate))))))
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Повторные запросы и бюджет времени на перевод
+Временные ошибки (429, 5xx, таймауты, обрывы соединения) повторяются с экспоненциальной
+задержкой и случайным разбросом; ошибки авторизации и другие 4xx не повторяются.
+Общий срок (Deadline) делится между всеми сервисами цепочки.
+"""
+
+import random
+import time
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+import requests
+
+try:
+    from deep_translator.exceptions import (TooManyRequests, ServerException, RequestError,
+                                            AuthorizationException, ApiKeyException)
+    TRANSIENT_ERRORS: Tuple[type, ...] = (TooManyRequests, ServerException, RequestError)
+    AUTH_ERRORS: Tuple[type, ...] = (AuthorizationException, ApiKeyException)
+except ImportError:
+    TRANSIENT_ERRORS = ()
+    AUTH_ERRORS = ()
+
+
+class DeadlineExceeded(TimeoutError):
+    """Общий срок перевода истек"""
+
+
+@dataclass
+class RetryConfig:
+    """Настройки повторных запросов к сервису"""
+    max_attempts: int = 3          # Попыток на сервис, включая первую (1 - без повторов)
+    base_delay: float = 0.2        # Задержка перед первым повтором в секундах
+    max_delay: float = 5.0         # Максимальная задержка между попытками
+    jitter: float = 0.5            # Доля задержки, выбираемая случайно (0 - без разброса)
+    retry_statuses: Tuple[int, ...] = (408, 429, 500, 502, 503, 504)
+
+
+class Deadline:
+    """Срок, общий для всех попыток и сервисов одного перевода"""
+
+    def __init__(self, timeout: float):
+        self.timeout = timeout
+        self.expires_at = time.monotonic() + timeout
+
+    def remaining(self) -> float:
+        """Оставшийся бюджет в секундах (не меньше 0)"""
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    def check(self):
+        """Выбрасывает DeadlineExceeded, если срок истек"""
+        if self.expired():
+            raise DeadlineExceeded(f"Срок перевода {self.timeout}с истек")
+
+
+def _status_code(error: Exception) -> Optional[int]:
+    status = getattr(error, 'status_code', None)
+    if status is None and getattr(error, 'response', None) is not None:
+        status = getattr(error.response, 'status_code', None)
+    return status if isinstance(status, int) else None
+
+
+def is_retryable(error: Exception, config: Optional[RetryConfig] = None) -> bool:
+    """
+    Стоит ли повторить запрос после ошибки
+
+    Повторяются: 429 и 5xx, таймауты и обрывы соединения, временные ошибки deep-translator.
+    Не повторяются: ошибки авторизации и ключей, остальные 4xx, истекший общий срок.
+    """
+    config = config or RetryConfig()
+    if isinstance(error, DeadlineExceeded) or (AUTH_ERRORS and isinstance(error, AUTH_ERRORS)):
+        return False
+    status = _status_code(error)
+    if status is not None:
+        return status in config.retry_statuses
+    if isinstance(error, (requests.Timeout, requests.ConnectionError, TimeoutError, ConnectionError)):
+        return True
+    return bool(TRANSIENT_ERRORS) and isinstance(error, TRANSIENT_ERRORS)
+
+
+def backoff_delay(attempt: int, config: Optional[RetryConfig] = None) -> float:
+    """
+    Задержка перед повтором номер attempt (с 0): экспоненциальный рост с разбросом
+
+    Случайна доля jitter задержки, чтобы параллельные запросы не повторялись одновременно.
+    """
+    config = config or RetryConfig()
+    delay = min(config.max_delay, config.base_delay * (2 ** attempt))
+    return delay * (1 - config.jitter) + random.uniform(0, delay * config.jitter)
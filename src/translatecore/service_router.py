@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Адаптивный порядок сервисов перевода
+Для каждого сервиса и языковой пары отслеживаются EWMA задержки и доли ошибок;
+цепочка сервисов упорядочивается по ним в пределах ограничений ("оффлайн первым",
+"платные последними"), а пониженные сервисы периодически получают пробные запросы.
+"""
+
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+@dataclass
+class RouterConfig:
+    """Настройки адаптивного порядка сервисов"""
+    alpha: float = 0.2              # Вес нового замера в EWMA
+    error_penalty: float = 5.0      # Секунд задержки, добавляемых к оценке за 100% ошибок
+    min_samples: int = 3            # Замеров до того, как сервис упорядочивается по оценке
+    first: List[str] = field(default_factory=list)   # Сервисы, которые всегда идут первыми (например, ['offline'])
+    last: List[str] = field(default_factory=list)    # Сервисы, которые всегда идут последними
+    paid_last: bool = False         # Платные сервисы всегда идут последними
+    probe_interval: float = 30.0    # Секунд без запросов, после которых пониженный сервис получает пробный запрос
+
+
+@dataclass
+class ServiceHealth:
+    """Сглаженные показатели сервиса для языковой пары"""
+    latency: float = 0.0
+    error_rate: float = 0.0
+    samples: int = 0
+    last_attempt: float = 0.0
+
+
+class AdaptiveRouter:
+    """
+    Упорядочивает цепочку сервисов по сглаженной задержке и доле ошибок
+
+    Оценка сервиса - EWMA задержки плюс error_penalty, умноженный на EWMA доли ошибок
+    (меньше - лучше). Сервисы, у которых меньше min_samples замеров, сохраняют
+    исходную позицию относительно друг друга и идут после измеренных, пока
+    не наберут замеры пробными запросами.
+    """
+
+    def __init__(self, config: Optional[RouterConfig] = None, paid_services: Iterable[str] = ()):
+        """
+        Args:
+            config: Настройки порядка сервисов
+            paid_services: Платные сервисы (для paid_last)
+        """
+        self.config = config or RouterConfig()
+        self.paid_services = set(paid_services)
+
+        self._lock = threading.Lock()
+        self._health: Dict[Tuple[str, str], ServiceHealth] = {}
+        self.stats = {
+            'reorders': 0,
+            'probes': 0
+        }
+
+    def _get_health(self, service: str, pair: str) -> ServiceHealth:
+        health = self._health.get((service, pair))
+        if health is None:
+            health = self._health[(service, pair)] = ServiceHealth()
+        return health
+
+    def _update(self, service: str, pair: str, latency: Optional[float], failed: bool):
+        alpha = self.config.alpha
+        with self._lock:
+            health = self._get_health(service, pair)
+            if health.samples == 0:
+                health.error_rate = float(failed)
+                if latency is not None:
+                    health.latency = latency
+            else:
+                health.error_rate = alpha * float(failed) + (1 - alpha) * health.error_rate
+                if latency is not None:
+                    health.latency = alpha * latency + (1 - alpha) * health.latency
+            health.samples += 1
+            health.last_attempt = time.time()
+
+    def record_success(self, service: str, pair: str, latency: float):
+        """Учитывает успешный перевод и его задержку"""
+        self._update(service, pair, latency, failed=False)
+
+    def record_failure(self, service: str, pair: str):
+        """Учитывает ошибку или неприемлемый ответ сервиса"""
+        self._update(service, pair, None, failed=True)
+
+    def score(self, service: str, pair: str) -> Optional[float]:
+        """Оценка сервиса (меньше - лучше) или None, если замеров недостаточно"""
+        with self._lock:
+            health = self._health.get((service, pair))
+            if health is None or health.samples < self.config.min_samples:
+                return None
+            return health.latency + self.config.error_penalty * health.error_rate
+
+    def order(self, services: List[str], pair: str) -> List[str]:
+        """
+        Возвращает цепочку сервисов для очередного запроса
+
+        Args:
+            services: Сервисы в исходном порядке приоритета
+            pair: Языковая пара (например, 'russian-english')
+        """
+        last = set(self.config.last)
+        if self.config.paid_last:
+            last |= self.paid_services
+        first = [name for name in services if name in self.config.first]
+        tail = [name for name in services if name in last and name not in first]
+        middle = [name for name in services if name not in first and name not in tail]
+
+        scores = {name: self.score(name, pair) for name in middle}
+        ranked = sorted(middle, key=lambda name: (scores[name] is None,
+                                                  scores[name] or 0.0,
+                                                  middle.index(name)))
+
+        # Пробный запрос к давно не опрошенному пониженному сервису
+        # (когда лидер цепочки уже измерен, чтобы холодный старт шел в исходном порядке)
+        now = time.time()
+        with self._lock:
+            for name in ranked[1:] if ranked and scores[ranked[0]] is not None else []:
+                health = self._get_health(name, pair)
+                if now - health.last_attempt >= self.config.probe_interval:
+                    # Отметка сразу, чтобы параллельные запросы не пробовали тот же сервис
+                    health.last_attempt = now
+                    ranked.remove(name)
+                    ranked.insert(0, name)
+                    self.stats['probes'] += 1
+                    break
+            if ranked != middle:
+                self.stats['reorders'] += 1
+
+        return first + ranked + tail
+
+    def get_stats(self, pair: Optional[str] = None) -> Dict[str, Dict[str, float]]:
+        """Возвращает показатели сервисов (для одной языковой пары, если она указана)"""
+        with self._lock:
+            items = [(key, health) for key, health in self._health.items()
+                     if pair is None or key[1] == pair]
+            stats = dict(self.stats)
+        services = {}
+        for (service, service_pair), health in items:
+            name = service if pair is not None else f"{service}:{service_pair}"
+            services[name] = {
+                'latency': health.latency,
+                'error_rate': health.error_rate * 100,
+                'samples': health.samples,
+                'score': self.score(service, service_pair)
+            }
+        return {**stats, 'services': services}
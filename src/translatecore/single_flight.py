@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Объединение одинаковых запросов, выполняющихся одновременно
+Первый вызов с ключом выполняет перевод, одновременные вызовы с тем же ключом
+ждут его результат вместо повторного запроса к сервису.
+"""
+
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Tuple
+
+
+class _Call:
+    """Выполняющийся вызов потокового API"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """
+    Объединяет одновременные вызовы с одинаковым ключом
+
+    Потоковый (do) и асинхронный (do_async) API ведут отдельные таблицы: асинхронные
+    вызовы объединяются в пределах своего цикла событий. Ошибка первого вызова
+    передается всем ожидающим.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self._tasks: Dict[Tuple[asyncio.AbstractEventLoop, Hashable], List[Any]] = {}
+
+    def do(self, key: Hashable, func: Callable[[], Any], timeout: Optional[float] = None) -> Tuple[Any, bool]:
+        """
+        Выполняет func или ждет результат одновременного вызова с тем же ключом
+
+        Args:
+            key: Ключ запроса
+            func: Функция, выполняемая первым вызовом
+            timeout: Сколько ждать чужой результат в секундах (None - без ограничения)
+
+        Returns:
+            Tuple[Any, bool]: Результат и признак того, что он получен от другого вызова
+
+        Raises:
+            TimeoutError: Если чужой результат не получен за timeout
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if leader:
+            try:
+                call.result = func()
+            except BaseException as e:
+                call.error = e
+                raise
+            finally:
+                with self._lock:
+                    del self._calls[key]
+                call.done.set()
+            return call.result, False
+
+        if not call.done.wait(timeout):
+            raise TimeoutError("Не дождались результата одновременного запроса")
+        if call.error is not None:
+            raise call.error
+        return call.result, True
+
+    async def do_async(self, key: Hashable, func: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """
+        Асинхронный вариант do()
+
+        Перевод выполняется отдельной задачей: отмена одного ожидающего не прерывает его
+        для остальных, задача отменяется, когда отменены все ожидающие.
+
+        Returns:
+            Tuple[Any, bool]: Результат и признак того, что он получен от другого вызова
+        """
+        loop = asyncio.get_running_loop()
+        task_key = (loop, key)
+        entry = self._tasks.get(task_key)
+        shared = entry is not None
+        if entry is None:
+            task = loop.create_task(func())
+            entry = self._tasks[task_key] = [task, 0]
+
+            def forget(_, entry=entry):
+                if self._tasks.get(task_key) is entry:
+                    del self._tasks[task_key]
+
+            task.add_done_callback(forget)
+
+        task = entry[0]
+        entry[1] += 1
+        try:
+            return await asyncio.shield(task), shared
+        except asyncio.CancelledError:
+            if entry[1] == 1 and not task.done():
+                task.cancel()
+            raise
+        finally:
+            entry[1] -= 1
+
+    def in_flight(self) -> int:
+        """Число выполняющихся вызовов"""
+        with self._lock:
+            return len(self._calls) + len(self._tasks)
@@ -10,6 +10,7 @@ import os
 import re
 import ast
 import json
+import logging
 import shutil
 import unicodedata
 from pathlib import Path
@@ -17,16 +18,25 @@ from typing import Dict, List, Tuple, Optional, Set
 import subprocess
 import sys
 
+try:
+    from .memory_cache import MemoryCacheConfig
+except ImportError:
+    from memory_cache import MemoryCacheConfig
+
+logger = logging.getLogger('translatecore.smart_code')
+
 class SmartCodeAwareTranslator:
     """Smart translator that protects code while translating text"""
     
-    def __init__(self, source_lang: str = "auto", target_lang: str = "english"):
+    def __init__(self, source_lang: str = "auto", target_lang: str = "english",
+                 memory_cache: Optional[MemoryCacheConfig] = None):
         self.source_lang = source_lang
         self.target_lang = target_lang
+        self.memory_cache = memory_cache
         self.stats = {'files_processed': 0, 'translations_made': 0, 'ai_calls': 0}
-        self.translation_cache = {}
         
-        # Initialize translator engine
+        # Initialize translator engine; its tiered cache is the only translation cache,
+        # placeholder-protected segments are cached there once and restored on each hit
         self.translator_engine = self._init_translator_engine()
     
     def _init_translator_engine(self):
@@ -35,15 +45,16 @@ class SmartCodeAwareTranslator:
             # Import EnhancedTranslator from the same package
             from .enhanced_translator import EnhancedTranslator
             
-            print("🤖 Using EnhancedTranslator with code-aware protection")
+            logger.info("Using EnhancedTranslator with code-aware protection")
             return EnhancedTranslator(
                 source_lang=self.source_lang,
                 target_lang=self.target_lang,
                 config_file="translation_api_config.json",
-                service_config_name="development"
+                service_config_name="development",
+                memory_cache=self.memory_cache
             )
         except Exception as e:
-            print(f"⚠️ Could not initialize EnhancedTranslator: {e}")
+            logger.warning("Could not initialize EnhancedTranslator: %s", e)
             return None
     
     def detect_text_script(self, text: str) -> str:
@@ -206,11 +217,6 @@ class SmartCodeAwareTranslator:
         if not text.strip():
             return text
         
-        # Check cache first
-        cache_key = f"{text}|{self.source_lang}|{self.target_lang}"
-        if cache_key in self.translation_cache:
-            return self.translation_cache[cache_key]
-        
         if not self.translator_engine:
             return text  # No translation engine available
         
@@ -224,21 +230,18 @@ class SmartCodeAwareTranslator:
             
             self.stats['ai_calls'] += 1
             
-            # Translate the protected text
+            # Translate the protected text (cached by the engine)
             result = self.translator_engine.translate(protected_text)
             translated = result.translated if hasattr(result, 'translated') else str(result)
             
             # Restore original code expressions
             final_result = self.restore_code_placeholders(translated, placeholders)
-            
-            # Cache the result
-            self.translation_cache[cache_key] = final_result
             self.stats['translations_made'] += 1
             
             return final_result
             
         except Exception as e:
-            print(f"  ⚠️ AI translation failed for '{text[:30]}...': {e}")
+            logger.warning("AI translation failed for '%.30s...': %s", text, e)
             return text
     
     def process_line_smart(self, line: str, line_num: int) -> Tuple[str, bool]:
@@ -332,22 +335,17 @@ class SmartCodeAwareTranslator:
             if segment.get('safe_translate', False):
                 translated_text = self.ai_translate_safe(original_text)
             else:
-                # For simple strings, check cache first
-                cache_key = f"{original_text}|{self.source_lang}|{self.target_lang}"
-                if cache_key in self.translation_cache:
-                    translated_text = self.translation_cache[cache_key]
-                else:
-                    if self.translator_engine:
-                        try:
-                            result = self.translator_engine.translate(original_text)
-                            translated_text = result.translated if hasattr(result, 'translated') else str(result)
-                            self.translation_cache[cache_key] = translated_text
-                            self.stats['ai_calls'] += 1
-                            self.stats['translations_made'] += 1
-                        except:
-                            translated_text = original_text
-                    else:
+                # Simple strings go straight to the engine (cached there)
+                if self.translator_engine:
+                    try:
+                        result = self.translator_engine.translate(original_text)
+                        translated_text = result.translated if hasattr(result, 'translated') else str(result)
+                        self.stats['ai_calls'] += 1
+                        self.stats['translations_made'] += 1
+                    except:
                         translated_text = original_text
+                else:
+                    translated_text = original_text
             
             if translated_text != original_text:
                 if 'start_pos' in segment:
@@ -366,25 +364,26 @@ class SmartCodeAwareTranslator:
                     result_line = result_line.replace(old_pattern, new_pattern, 1)
                 
                 changes_made = True
-                print(f"  🛡️ Line {line_num}: Code-safe {segment['type']}: '{original_text[:40]}...' → '{translated_text[:40]}...'")
+                logger.debug("Line %d: code-safe %s: '%.40s...' → '%.40s...'",
+                             line_num, segment['type'], original_text, translated_text)
         
         return result_line, changes_made
     
     def translate_file_smart(self, filepath: Path) -> bool:
         """Translates file using smart code-aware logic"""
-        print(f"\n🛡️ Processing {filepath.name} with code-aware protection...")
+        logger.info("Processing %s with code-aware protection", filepath.name)
         
         try:
             with open(filepath, 'r', encoding='utf-8') as f:
                 lines = f.readlines()
         except Exception as e:
-            print(f"❌ Error reading {filepath}: {e}")
+            logger.error("Error reading %s: %s", filepath, e)
             return False
         
         # Quick check if translation is needed
         content = ''.join(lines)
         if not any(self.needs_translation(line) for line in lines[:50]):  # Check first 50 lines
-            print(f"✅ No translation needed for {filepath.name}")
+            logger.info("No translation needed for %s", filepath.name)
             return True
         
         # Process lines
@@ -398,34 +397,33 @@ class SmartCodeAwareTranslator:
                 changes_made += 1
         
         if changes_made == 0:
-            print(f"✅ No changes needed in {filepath.name}")
+            logger.info("No changes needed in %s", filepath.name)
             return True
         
         # Validate syntax
         translated_content = ''.join(translated_lines)
         try:
             ast.parse(translated_content)
-            print(f"✅ Syntax validation passed")
+            logger.debug("Syntax validation passed")
         except SyntaxError as e:
-            print(f"❌ Syntax error would be introduced: {e}")
-            print(f"   Error at line {e.lineno}: {e.text}")
+            logger.error("Syntax error would be introduced: %s (line %s: %s)", e, e.lineno, e.text)
             return False
         
         # Create backup
         backup_path = filepath.with_suffix('.py.backup_smart')
         if not backup_path.exists():
             shutil.copy2(filepath, backup_path)
-            print(f"💾 Backup created: {backup_path.name}")
+            logger.info("Backup created: %s", backup_path.name)
         
         # Write result
         try:
             with open(filepath, 'w', encoding='utf-8') as f:
                 f.write(translated_content)
-            print(f"✅ Successfully translated {filepath.name} ({changes_made} smart translations)")
+            logger.info("Successfully translated %s (%d smart translations)", filepath.name, changes_made)
             self.stats['files_processed'] += 1
             return True
         except Exception as e:
-            print(f"❌ Error writing {filepath}: {e}")
+            logger.error("Error writing %s: %s", filepath, e)
             return False
     
     def run_smart_translation(self, files: List[str]) -> Dict:
@@ -460,6 +458,7 @@ class SmartCodeAwareTranslator:
             'files_processed': self.stats['files_processed'],
             'translations_made': self.stats['translations_made'],
             'ai_calls': self.stats['ai_calls'],
+            'cache_tiers': self.translator_engine.cache.get_stats() if self.translator_engine else None,
             'success_count': success_count,
             'total_files': len(files)
         }
@@ -474,6 +473,7 @@ def main():
     parser.add_argument('--files', nargs='+', help='Files to translate')
     
     args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
     
     # Default files if none specified
     if not args.files:
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Нормализация текста перед поиском в кеше
+Варианты одной строки (пробелы, формы Unicode, знаки конца предложения) получают один ключ.
+Сервису уходит текст с исходными пробелами внутри, снятые края возвращаются в перевод.
+"""
+
+import re
+import unicodedata
+from dataclasses import dataclass
+
+
+_HORIZONTAL_SPACE = re.compile(r'[^\S\n]+')
+_SPACE_AROUND_NEWLINE = re.compile(r' ?\n ?')
+
+# Знаки конца предложения, которые снимаются с конца текста. Скобки, кавычки
+# и подчеркивания (части плейсхолдеров вроде __CODE_PLACEHOLDER_0__) не трогаем.
+_TRAILING_PUNCTUATION = frozenset('.!?…:;,')
+
+
+def _is_trailing_char(char: str) -> bool:
+    """Пробелы и знаки конца предложения, которые снимаются с конца текста"""
+    return char.isspace() or char in _TRAILING_PUNCTUATION
+
+
+def collapse_whitespace(text: str) -> str:
+    """Схлопывает пробелы внутри строк и вокруг переводов строк (для ключа кеша)"""
+    text = _HORIZONTAL_SPACE.sub(' ', text.replace('\r\n', '\n'))
+    return _SPACE_AROUND_NEWLINE.sub('\n', text)
+
+
+@dataclass
+class NormalizedText:
+    """Текст без краев (пробелы внутри сохранены) и снятое с краев оформление"""
+    core: str
+    leading: str = ''
+    trailing: str = ''
+
+    @property
+    def key(self) -> str:
+        """Текст для ключа кеша: пробелы внутри схлопнуты"""
+        return collapse_whitespace(self.core)
+
+    def restore(self, translated: str) -> str:
+        """Возвращает снятые пробелы и знаки конца предложения вокруг перевода"""
+        return f"{self.leading}{translated}{self.trailing}"
+
+
+def normalize_text(text: str) -> NormalizedText:
+    """
+    Нормализует текст для ключа кеша и перевода
+
+    Приводит к форме NFC, снимает пробелы с краев и знаки .!?…:;, с конца. Пробелы и отступы
+    внутри текста не меняются: они схлопываются только в ключе кеша (см. NormalizedText.key).
+
+    Args:
+        text: Исходный текст
+
+    Returns:
+        NormalizedText: Текст для перевода и оформление для восстановления
+    """
+    text = unicodedata.normalize('NFC', text)
+
+    start = 0
+    while start < len(text) and text[start].isspace():
+        start += 1
+    end = len(text)
+    while end > start and _is_trailing_char(text[end - 1]):
+        end -= 1
+
+    # Текст из одних пробелов и пунктуации не нормализуем
+    if start == end:
+        return NormalizedText(core=text)
+
+    return NormalizedText(core=text[start:end], leading=text[:start], trailing=text[end:])
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Разбиение длинных текстов на части
+Текст делится по абзацам, затем по строкам, предложениям и словам так, чтобы каждая часть
+укладывалась в ограничение сервиса; разделители сохраняются для обратной сборки.
+"""
+
+import re
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+CACHE_LEVELS = ('segments', 'whole')
+
+# Уровни разбиения от крупного к мелкому
+_SEPARATORS = [
+    re.compile(r'\n[^\S\n]*\n\s*'),                 # Абзацы
+    re.compile(r'\n\s*'),                           # Строки
+    re.compile(r'(?<=[.!?…;:。！？])[\"»”)\]]*\s+'),  # Предложения
+    re.compile(r'\s+'),                             # Слова
+]
+
+Segment = Tuple[str, str]  # (часть текста, разделитель после нее)
+
+
+@dataclass
+class SegmentationConfig:
+    """Настройки разбиения длинных текстов"""
+    enabled: bool = True
+    max_chars: Optional[int] = None    # Ограничение части (None - max_chars каждого сервиса цепочки)
+    cache_level: str = 'segments'      # 'segments' - кешировать каждую часть, 'whole' - только весь текст
+    max_workers: Optional[int] = None  # Потоков на части одного текста (None - max_workers переводчика)
+
+    def __post_init__(self):
+        if self.cache_level not in CACHE_LEVELS:
+            raise ValueError(f"Неизвестный уровень кеширования: {self.cache_level} "
+                             f"(доступны: {', '.join(CACHE_LEVELS)})")
+
+
+def _split_with_separators(text: str, pattern: re.Pattern) -> List[Segment]:
+    """Делит текст по шаблону, оставляя каждый разделитель после своей части"""
+    segments = []
+    position = 0
+    for match in pattern.finditer(text):
+        if match.end() == match.start():
+            continue
+        segments.append((text[position:match.start()], match.group()))
+        position = match.end()
+    segments.append((text[position:], ''))
+    return segments
+
+
+def _split(text: str, max_chars: int, level: int) -> List[Segment]:
+    if len(text) <= max_chars:
+        return [(text, '')]
+    if level >= len(_SEPARATORS):
+        # Слово длиннее ограничения режется без учета границ
+        return [(text[i:i + max_chars], '') for i in range(0, len(text), max_chars)]
+
+    segments: List[Segment] = []
+    current: Optional[str] = None
+    current_separator = ''
+    for piece, separator in _split_with_separators(text, _SEPARATORS[level]):
+        if len(piece) > max_chars:
+            if current is not None:
+                segments.append((current, current_separator))
+                current, current_separator = None, ''
+            parts = _split(piece, max_chars, level + 1)
+            last_text, last_separator = parts[-1]
+            segments.extend(parts[:-1])
+            segments.append((last_text, last_separator + separator))
+            continue
+
+        if current is None:
+            current = piece
+        elif len(current) + len(current_separator) + len(piece) > max_chars:
+            segments.append((current, current_separator))
+            current = piece
+        else:
+            current = f"{current}{current_separator}{piece}"
+        current_separator = separator
+
+    if current is not None:
+        segments.append((current, current_separator))
+    return segments
+
+
+def split_text(text: str, max_chars: int) -> List[Segment]:
+    """
+    Делит текст на части не длиннее max_chars
+
+    Части собираются жадно: соседние абзацы (предложения) объединяются, пока укладываются
+    в ограничение. ''.join(часть + разделитель) восстанавливает исходный текст.
+
+    Args:
+        text: Исходный текст
+        max_chars: Максимальная длина части
+
+    Returns:
+        List[Segment]: Пары (часть, разделитель после нее)
+    """
+    if max_chars < 1:
+        raise ValueError("max_chars должен быть положительным")
+    return _split(text, max_chars, 0)
+
+
+def join_segments(parts: List[str], segments: List[Segment]) -> str:
+    """Собирает переведенные части с исходными разделителями"""
+    return ''.join(part + separator for part, (_, separator) in zip(parts, segments))
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Многоуровневый кеш переводов
+L1 - ограниченный кеш в памяти процесса, L2 - постоянное хранилище
+(перед ним - необязательный снапшот только для чтения).
+Один экземпляр разделяют EnhancedTranslator, его OfflineTranslator и SmartCodeAwareTranslator,
+поэтому каждый перевод хранится и сохраняется один раз.
+"""
+
+import threading
+from typing import Any, Callable, Dict, Optional
+
+try:
+    from .cache_store import CacheStore, pack_value, unpack_value, check_compression
+    from .cache_snapshot import CacheSnapshot
+    from .memory_cache import MemoryCache, MemoryCacheConfig
+except ImportError:
+    from cache_store import CacheStore, pack_value, unpack_value, check_compression
+    from cache_snapshot import CacheSnapshot
+    from memory_cache import MemoryCache, MemoryCacheConfig
+
+
+class TieredCache:
+    """
+    Кеш записей перевода (см. pack_value) с уровнями L1 и L2.
+
+    В L1 записи лежат распакованными, в L2 - упакованными и, при необходимости, сжатыми.
+    Запись, найденная в L2 или снапшоте, поднимается в L1. Ключи, записанные или
+    очищенные через этот экземпляр, в снапшоте не ищутся - он мог устареть.
+    """
+
+    def __init__(self, store: CacheStore,
+                 memory_cache: Optional[MemoryCacheConfig] = None,
+                 snapshot: Optional[CacheSnapshot] = None,
+                 compression: Optional[str] = None,
+                 cost: Optional[Callable[[Dict[str, Any]], float]] = None):
+        """
+        Args:
+            store: Постоянное хранилище (L2)
+            memory_cache: Настройки кеша в памяти (L1)
+            snapshot: Снапшот только для чтения, проверяется перед L2
+            compression: Сжатие длинных переводов в L2 ('zlib', 'lzma' или None)
+            cost: Оценка стоимости записи, поднятой из L2 (для политики вытеснения 'cost')
+        """
+        check_compression(compression)
+        self.store = store
+        self.memory = MemoryCache(memory_cache)
+        self.snapshot = snapshot
+        self.compression = compression
+        self.cost = cost
+
+        self._lock = threading.Lock()
+        self._changed_keys = set()
+        self._cleared_prefixes = []
+        self.stats = {
+            'l1_hits': 0,
+            'snapshot_hits': 0,
+            'l2_hits': 0,
+            'misses': 0,
+            'writes': 0
+        }
+
+    def _count(self, name: str):
+        with self._lock:
+            self.stats[name] += 1
+
+    def _snapshot_valid(self, key: str) -> bool:
+        """Проверяет, что запись снапшота не перекрыта более новой записью в L2"""
+        with self._lock:
+            if key in self._changed_keys:
+                return False
+            return not any(key.startswith(prefix) for prefix in self._cleared_prefixes)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Ищет запись в L1, затем в снапшоте и в L2"""
+        record = self.memory.get(key)
+        if record is not None:
+            self._count('l1_hits')
+            return record
+
+        value = None
+        if self.snapshot is not None and self._snapshot_valid(key):
+            value = self.snapshot.get(key)
+        if value is not None:
+            self._count('snapshot_hits')
+        else:
+            value = self.store.get(key)
+            if value is None:
+                self._count('misses')
+                return None
+            self._count('l2_hits')
+
+        record = unpack_value(value)
+        self.memory.set(key, record, cost=self.cost(record) if self.cost else 1.0)
+        return record
+
+    def set(self, key: str, record: Dict[str, Any], cost: Optional[float] = None):
+        """Сохраняет запись в L1 и L2"""
+        if cost is None:
+            cost = self.cost(record) if self.cost else 1.0
+        if self.snapshot is not None:
+            with self._lock:
+                self._changed_keys.add(key)
+        self.memory.set(key, record, cost=cost)
+        self.store.set(key, pack_value(record, self.compression))
+        self._count('writes')
+
+    def save(self):
+        """Повторно сохраняет все записи L1 в L2 одной пачкой"""
+        self.store.set_many(
+            (key, pack_value(record, self.compression))
+            for key, record in self.memory.items()
+        )
+
+    def clear(self, prefix: str = ''):
+        """Удаляет записи с префиксом из L2 и сбрасывает L1"""
+        with self._lock:
+            self._changed_keys = {key for key in self._changed_keys if not key.startswith(prefix)}
+            self._cleared_prefixes.append(prefix)
+        self.memory.clear()
+        self.store.clear(prefix)
+
+    def count(self, prefix: str = '') -> int:
+        return self.store.count(prefix)
+
+    def pending_writes(self) -> int:
+        return self.store.pending_writes()
+
+    def flush(self):
+        self.store.flush()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Возвращает статистику попаданий по уровням"""
+        with self._lock:
+            stats = dict(self.stats)
+        lookups = stats['l1_hits'] + stats['snapshot_hits'] + stats['l2_hits'] + stats['misses']
+        hits = lookups - stats['misses']
+        stats.update({
+            'lookups': lookups,
+            'hit_rate': (hits / max(1, lookups)) * 100,
+            'l1_hit_rate': (stats['l1_hits'] / max(1, lookups)) * 100,
+            'l2_hit_rate': ((stats['l2_hits'] + stats['snapshot_hits']) / max(1, lookups)) * 100,
+            'l1': self.memory.get_stats(),
+            'pending_writes': self.store.pending_writes()
+        })
+        return stats
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Нечеткая память переводов (translation memory)
+Находит ранее переведенные похожие сегменты по символьным n-граммам
+"""
+
+import math
+import re
+import threading
+from array import array
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Set
+
+
+# Пунктуация и цифры не участвуют в "скелете" сегмента
+_SKELETON_PUNCTUATION = re.compile(r'[^\w\s]|_')
+_SKELETON_DIGITS = re.compile(r'\d+')
+
+
+@dataclass
+class TranslationMemoryConfig:
+    """Настройки памяти переводов"""
+    threshold: float = 0.75              # Минимальное сходство (коэффициент Дайса по n-граммам)
+    ngram_size: int = 3                  # Размер символьной n-граммы
+    auto_accept: Optional[float] = None  # Сходство, при котором translate() сразу берет найденный перевод
+    max_postings: int = 5000             # Бюджет подсчета по спискам n-грамм на один поиск
+    max_candidates: int = 32             # Сколько лучших кандидатов проверять точно
+    persist: bool = True                 # Сохранять сегменты в общем хранилище кеша
+
+
+@dataclass
+class TranslationMemoryMatch:
+    """Найденный похожий сегмент"""
+    source: str
+    translated: str
+    score: float
+    service: str = 'unknown'
+    same_numbers: bool = True  # Числа сегмента совпадают с числами запроса (перевод можно брать как есть)
+
+
+class TranslationMemory:
+    """
+    Инвертированный индекс сегментов по n-граммам.
+
+    Сегменты, отличающиеся только регистром, пунктуацией или числами, находятся
+    по "скелету" за один поиск в словаре. Остальные - по спискам самых редких
+    n-грамм запроса (префиксный фильтр) с ограниченным бюджетом подсчета, так что
+    время поиска почти не растет с размером памяти. Лучшие кандидаты проверяются точно.
+    """
+
+    def __init__(self, config: Optional[TranslationMemoryConfig] = None):
+        self.config = config or TranslationMemoryConfig()
+        if not 0.0 < self.config.threshold <= 1.0:
+            raise ValueError(f"Порог сходства должен быть в (0, 1]: {self.config.threshold}")
+
+        self._lock = threading.RLock()
+        self._postings: Dict[str, array] = {}
+        self._skeletons: Dict[str, int] = {}
+        self._ids: Dict[str, int] = {}
+        self._sources: List[str] = []
+        self._translations: List[str] = []
+        self._services: List[str] = []
+        self._gram_counts = array('I')
+        self.stats = {
+            'lookups': 0,
+            'hits': 0
+        }
+
+    def _ngrams(self, text: str) -> Set[str]:
+        """Множество n-грамм текста (без учета регистра и повторных пробелов)"""
+        text = f" {' '.join(text.lower().split())} "
+        n = self.config.ngram_size
+        if len(text) <= n:
+            return {text}
+        return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+    @staticmethod
+    def _skeleton(text: str) -> str:
+        """Текст без регистра, пунктуации и конкретных чисел"""
+        text = _SKELETON_DIGITS.sub('0', _SKELETON_PUNCTUATION.sub(' ', text.lower()))
+        return ' '.join(text.split())
+
+    def add(self, source: str, translated: str, service: str = 'unknown'):
+        """Добавляет сегмент или обновляет перевод уже известного сегмента"""
+        with self._lock:
+            segment_id = self._ids.get(source)
+            if segment_id is not None:
+                self._translations[segment_id] = translated
+                self._services[segment_id] = service
+                return
+
+            grams = self._ngrams(source)
+            segment_id = len(self._sources)
+            self._ids[source] = segment_id
+            self._skeletons.setdefault(self._skeleton(source), segment_id)
+            self._sources.append(source)
+            self._translations.append(translated)
+            self._services.append(service)
+            self._gram_counts.append(len(grams))
+            for gram in grams:
+                postings = self._postings.get(gram)
+                if postings is None:
+                    postings = self._postings[gram] = array('I')
+                postings.append(segment_id)
+
+    def lookup(self, text: str, threshold: Optional[float] = None) -> Optional[TranslationMemoryMatch]:
+        """
+        Ищет самый похожий сегмент
+
+        Args:
+            text: Текст для поиска
+            threshold: Минимальное сходство (по умолчанию - из настроек)
+
+        Returns:
+            Optional[TranslationMemoryMatch]: Лучшее совпадение не ниже порога или None
+        """
+        if threshold is None:
+            threshold = self.config.threshold
+        grams = self._ngrams(text)
+        numbers = _SKELETON_DIGITS.findall(text)
+
+        with self._lock:
+            self.stats['lookups'] += 1
+
+            segment_id = self._ids.get(text)
+            if segment_id is None:
+                segment_id = self._skeletons.get(self._skeleton(text))
+            if segment_id is not None:
+                score = self._score(grams, segment_id)
+                if score >= threshold:
+                    return self._match(segment_id, score, numbers)
+
+            segment_id, score = self._search(grams, threshold)
+            if segment_id is None or score < threshold:
+                return None
+            return self._match(segment_id, score, numbers)
+
+    def _search(self, grams: Set[str], threshold: float):
+        """Поиск лучшего кандидата по инвертированному индексу n-грамм"""
+        query_size = len(grams)
+
+        # Дайс >= t требует пересечения не меньше t*q/(2-t) n-грамм
+        # и размера сегмента в пределах [t*q/(2-t), q*(2-t)/t]
+        min_overlap = max(1, math.ceil(threshold * query_size / (2 - threshold) - 1e-9))
+        min_size = threshold * query_size / (2 - threshold)
+        max_size = query_size * (2 - threshold) / threshold if threshold > 0 else math.inf
+
+        # Подходящий сегмент содержит хотя бы одну из probe_size самых редких n-грамм запроса.
+        # Частые n-граммы дают длинные списки, поэтому подсчет ограничен бюджетом:
+        # похожие сегменты почти всегда делят с запросом именно редкие n-граммы.
+        ordered = sorted(grams, key=lambda gram: len(self._postings.get(gram, ())))
+        probe_size = query_size - min_overlap + 1
+        overlaps = Counter()
+        counted = 0
+        for gram in ordered[:probe_size]:
+            postings = self._postings.get(gram, ())
+            if counted and counted + len(postings) > self.config.max_postings:
+                break
+            overlaps.update(postings)
+            counted += len(postings)
+
+        best_id, best_score = None, 0.0
+        for segment_id, _ in overlaps.most_common(self.config.max_candidates):
+            size = self._gram_counts[segment_id]
+            if size < min_size or size > max_size:
+                continue
+            score = self._score(grams, segment_id)
+            if score > best_score:
+                best_id, best_score = segment_id, score
+        return best_id, best_score
+
+    def _score(self, grams: Set[str], segment_id: int) -> float:
+        """Коэффициент Дайса между n-граммами запроса и сегмента"""
+        overlap = len(grams & self._ngrams(self._sources[segment_id]))
+        return 2.0 * overlap / (len(grams) + self._gram_counts[segment_id])
+
+    def _match(self, segment_id: int, score: float, numbers: List[str]) -> TranslationMemoryMatch:
+        self.stats['hits'] += 1
+        source = self._sources[segment_id]
+        return TranslationMemoryMatch(
+            source=source,
+            translated=self._translations[segment_id],
+            score=score,
+            service=self._services[segment_id],
+            same_numbers=_SKELETON_DIGITS.findall(source) == numbers
+        )
+
+    def clear(self):
+        with self._lock:
+            self._postings.clear()
+            self._skeletons.clear()
+            self._ids.clear()
+            self._sources.clear()
+            self._translations.clear()
+            self._services.clear()
+            self._gram_counts = array('I')
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Возвращает статистику памяти переводов"""
+        with self._lock:
+            return {
+                'segments': len(self._sources),
+                'ngrams': len(self._postings),
+                'threshold': self.config.threshold,
+                'lookups': self.stats['lookups'],
+                'hits': self.stats['hits'],
+                'hit_rate': (self.stats['hits'] / max(1, self.stats['lookups'])) * 100
+            }
+
+    def __contains__(self, source: str) -> bool:
+        return source in self._ids
+
+    def __len__(self) -> int:
+        return len(self._sources)
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Unit тесты для пакетных запросов к сервисам перевода
+"""
+
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+from translatecore.batch_providers import (BatchLimits, split_batches, get_batch_limits, DEFAULT_BATCH_LIMITS,
+                                           microsoft_translate_multi)
+
+
+class TestSplitBatches(unittest.TestCase):
+    """Тесты деления текстов на пачки"""
+
+    def test_max_items(self):
+        """Пачка содержит не больше max_items текстов"""
+        batches = split_batches(['a'] * 7, BatchLimits(max_items=3, max_chars=100))
+        self.assertEqual(batches, [[0, 1, 2], [3, 4, 5], [6]])
+
+    def test_max_chars(self):
+        """Пачка не превышает max_chars символов"""
+        batches = split_batches(['aaaa', 'bbbb', 'cc', 'dddddd'], BatchLimits(max_items=10, max_chars=10))
+        self.assertEqual(batches, [[0, 1, 2], [3]])
+
+    def test_long_text_goes_alone(self):
+        """Текст длиннее max_chars уходит отдельной пачкой"""
+        batches = split_batches(['a', 'x' * 50, 'b'], BatchLimits(max_items=10, max_chars=10))
+        self.assertEqual(batches, [[0], [1], [2]])
+
+    def test_empty(self):
+        """Пустой список не дает пачек"""
+        self.assertEqual(split_batches([], BatchLimits()), [])
+
+
+class TestBatchLimits(unittest.TestCase):
+    """Тесты ограничений пакета"""
+
+    def test_defaults(self):
+        """Без настроек используются ограничения сервиса"""
+        self.assertEqual(get_batch_limits('deepl'), DEFAULT_BATCH_LIMITS['deepl'])
+        self.assertEqual(get_batch_limits('unknown'), BatchLimits())
+
+    def test_settings_override(self):
+        """batch_size и batch_chars из настроек переопределяют ограничения"""
+        limits = get_batch_limits('libre', {'batch_size': 5, 'batch_chars': 0})
+        self.assertEqual(limits.max_items, 5)
+        self.assertEqual(limits.max_chars, 1)
+
+
+class TestMultiTarget(unittest.TestCase):
+    """Тесты перевода на несколько языков одним запросом"""
+
+    def test_microsoft_multi(self):
+        """Все целевые языки уходят параметрами 'to' одного запроса"""
+        translator = SimpleNamespace(_url_params={'api-version': '3.0', 'to': 'en'}, _source='ru',
+                                     _base_url='https://api.example/translate', headers={}, proxies=None)
+        response = mock.Mock(status_code=200)
+        response.json.return_value = [{'translations': [{'to': 'en', 'text': 'Hello'},
+                                                        {'to': 'de', 'text': 'Hallo'}]}]
+        with mock.patch('translatecore.batch_providers.requests.post', return_value=response) as post:
+            translated = microsoft_translate_multi(translator, 'Привет', ['en', 'de'])
+
+        self.assertEqual(translated, {'en': 'Hello', 'de': 'Hallo'})
+        self.assertEqual(post.call_args.kwargs['params'],
+                         [('api-version', '3.0'), ('from', 'ru'), ('to', 'en'), ('to', 'de')])
+
+    def test_microsoft_multi_code_case(self):
+        """Переводы возвращаются под запрошенными кодами независимо от регистра ответа"""
+        translator = SimpleNamespace(_url_params={'api-version': '3.0'}, _source='ru',
+                                     _base_url='https://api.example/translate', headers={}, proxies=None)
+        response = mock.Mock(status_code=200)
+        response.json.return_value = [{'translations': [{'to': 'zh-Hans', 'text': '你好'},
+                                                        {'to': 'en', 'text': 'Hello'}]}]
+        with mock.patch('translatecore.batch_providers.requests.post', return_value=response):
+            translated = microsoft_translate_multi(translator, 'Привет', ['zh-hans', 'en'])
+
+        self.assertEqual(translated, {'zh-hans': '你好', 'en': 'Hello'})
+
+
+if __name__ == '__main__':
+    unittest.main()
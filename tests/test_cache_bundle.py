@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Unit тесты для пакетов кеша переводов
+"""
+
+import shutil
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+from translatecore.cache_bundle import BundleFilter, export_bundle, import_bundles, read_bundle
+from translatecore.cache_store import SQLiteCacheStore, make_cache_key, pack_value
+
+
+class TestCacheBundles(unittest.TestCase):
+    """Тесты для экспорта и импорта пакетов кеша"""
+
+    def setUp(self):
+        self.test_dir = Path(tempfile.mkdtemp())
+        self.store = SQLiteCacheStore(str(self.test_dir / 'cache.db'))
+
+    def tearDown(self):
+        self.store.close()
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def _put(self, store, text, target, service, confidence=1.0, created=None):
+        key = make_cache_key(text, 'russian', target, 'enhanced')
+        store.set(key, pack_value({'translated': f'{service}:{text}', 'service': service,
+                                   'confidence': confidence,
+                                   'created': created if created is not None else int(time.time())}))
+        return key
+
+    def test_export_filters(self):
+        """Экспорт по паре языков, сервису и возрасту"""
+        self._put(self.store, 'Да', 'english', 'google')
+        self._put(self.store, 'Нет', 'english', 'deepl')
+        self._put(self.store, 'Да', 'german', 'google')
+        self._put(self.store, 'Старое', 'english', 'google', created=int(time.time()) - 10 * 86400)
+
+        path = str(self.test_dir / 'bundle.jsonl.gz')
+        self.assertEqual(export_bundle(self.store, path), 4)
+        self.assertEqual(export_bundle(self.store, path, BundleFilter(target_lang='english')), 3)
+        self.assertEqual(export_bundle(self.store, path, BundleFilter(services=['deepl'])), 1)
+        self.assertEqual(export_bundle(self.store, path, BundleFilter(max_age=86400)), 3)
+        self.assertEqual(len(list(read_bundle(path))), 3)
+
+    def test_import_resolves_conflicts(self):
+        """Конфликты разрешаются по уверенности или приоритету сервиса"""
+        key = self._put(self.store, 'Да', 'english', 'google', confidence=0.5)
+
+        other = SQLiteCacheStore(str(self.test_dir / 'other.db'))
+        self._put(other, 'Да', 'english', 'deepl', confidence=0.9)
+        self._put(other, 'Нет', 'english', 'deepl')
+        bundle = str(self.test_dir / 'other.jsonl')
+        export_bundle(other, bundle)
+        other.close()
+
+        counters = import_bundles(self.store, [bundle], 'priority', {'google': 0, 'deepl': 1})
+        self.assertEqual(counters, {'added': 1, 'replaced': 0, 'kept': 1})
+        self.assertEqual(self.store.get(key)['s'], 'google')
+
+        counters = import_bundles(self.store, [bundle], 'confidence')
+        self.assertEqual(counters, {'added': 0, 'replaced': 1, 'kept': 1})
+        self.assertEqual(self.store.get(key)['s'], 'deepl')
+
+    def test_rejects_foreign_file(self):
+        """Посторонний файл не импортируется"""
+        path = self.test_dir / 'other.jsonl'
+        path.write_text('{"k": "a", "v": "b"}\n', encoding='utf-8')
+        with self.assertRaises(ValueError):
+            import_bundles(self.store, [str(path)])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Unit тесты для снапшотов кеша переводов
+"""
+
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+from translatecore.cache_snapshot import CacheSnapshot, compile_snapshot, open_snapshot
+from translatecore.cache_store import SQLiteCacheStore, make_cache_key
+
+
+class TestCacheSnapshot(unittest.TestCase):
+    """Тесты для компиляции и чтения снапшотов"""
+
+    def setUp(self):
+        self.test_dir = Path(tempfile.mkdtemp())
+        self.path = str(self.test_dir / 'cache.snapshot')
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def test_compile_from_store_and_lookup(self):
+        """Записи хранилища находятся в снапшоте без загрузки всего файла"""
+        with SQLiteCacheStore(str(self.test_dir / 'cache.db')) as store:
+            for i in range(200):
+                store.set(make_cache_key(f'Текст {i}', 'russian', 'english', 'offline'),
+                          {'original': f'Текст {i}', 'translated': f'Text {i}'})
+            self.assertEqual(compile_snapshot(store.items(), self.path), 200)
+
+        with CacheSnapshot(self.path) as snapshot:
+            self.assertEqual(len(snapshot), 200)
+            key = make_cache_key('Текст 42', 'russian', 'english', 'offline')
+            self.assertEqual(snapshot.get(key)['translated'], 'Text 42')
+            self.assertIsNone(snapshot.get(make_cache_key('Нет', 'russian', 'english', 'offline')))
+
+    def test_prefix_items_and_empty_snapshot(self):
+        """Перебор по префиксу и пустой снапшот"""
+        compile_snapshot([('a|1', 'A'), ('b|2', 'B')], self.path)
+        with CacheSnapshot(self.path) as snapshot:
+            self.assertEqual(list(snapshot.items('a|')), [('a|1', 'A')])
+
+        compile_snapshot([], self.path)
+        with CacheSnapshot(self.path) as snapshot:
+            self.assertEqual(len(snapshot), 0)
+            self.assertIsNone(snapshot.get('a|1'))
+
+    def test_rejects_foreign_file(self):
+        """Файл другого формата не открывается как снапшот"""
+        Path(self.path).write_bytes(b'{"not": "a snapshot", "padding": 0000000}')
+        with self.assertRaises(ValueError):
+            CacheSnapshot(self.path)
+
+    def test_open_snapshot_is_shared(self):
+        """Процесс отображает файл снапшота в память один раз"""
+        compile_snapshot([('k', 'v')], self.path)
+        self.assertIs(open_snapshot(self.path), open_snapshot(self.path))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Unit тесты для постоянных хранилищ кеша переводов
+"""
+
+import gc
+import json
+import shutil
+import tempfile
+import unittest
+import weakref
+from pathlib import Path
+
+from translatecore.cache_store import (
+    AppendOnlyCacheStore,
+    CacheStoreLockedError,
+    JSONCacheStore,
+    SQLiteCacheStore,
+    WriteBehindCacheStore,
+    WriteBehindConfig,
+    get_shared_cache_store,
+    import_json_cache,
+    make_cache_key,
+    pack_value,
+    unpack_value,
+)
+
+
+class TestCacheStores(unittest.TestCase):
+    """Тесты для бэкендов хранилища кеша"""
+
+    def setUp(self):
+        self.test_dir = Path(tempfile.mkdtemp())
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def test_sqlite_roundtrip(self):
+        """Запись переживает повторное открытие хранилища"""
+        path = self.test_dir / 'cache.db'
+        with SQLiteCacheStore(str(path)) as store:
+            store.set('Привет|russian|english', {'translated': 'Hello'})
+
+        with SQLiteCacheStore(str(path)) as store:
+            self.assertEqual(store.get('Привет|russian|english'), {'translated': 'Hello'})
+            self.assertEqual(len(store), 1)
+
+    def test_append_only_drops_torn_tail(self):
+        """Оборванная последняя запись отбрасывается, остальные сохраняются"""
+        path = self.test_dir / 'cache.jsonl'
+        store = AppendOnlyCacheStore(str(path))
+        store.set('a', 'A')
+        store.set('b', 'B')
+        store.close()
+
+        with open(path, 'ab') as f:
+            f.write(b'{"k": "c", "v": "trunc')
+
+        store = AppendOnlyCacheStore(str(path))
+        self.assertEqual(store.get('a'), 'A')
+        self.assertEqual(store.get('b'), 'B')
+        self.assertIsNone(store.get('c'))
+
+        store.set('c', 'C')
+        store.close()
+        self.assertEqual(AppendOnlyCacheStore(str(path)).get('c'), 'C')
+
+    def test_append_only_compaction(self):
+        """Уплотнение оставляет только актуальные значения"""
+        path = self.test_dir / 'cache.jsonl'
+        store = AppendOnlyCacheStore(str(path), compact_min_records=10)
+        for i in range(50):
+            store.set('key', f'value {i}')
+        store.close()
+
+        lines = path.read_text(encoding='utf-8').splitlines()
+        self.assertLess(len(lines), 50)
+        self.assertEqual(AppendOnlyCacheStore(str(path)).get('key'), 'value 49')
+
+    def test_append_only_single_writer(self):
+        """Открытый журнал не открывается вторым экземпляром, после close() - открывается"""
+        path = str(self.test_dir / 'cache.jsonl')
+        store = AppendOnlyCacheStore(path)
+        store.set('a', 'A')
+        with self.assertRaises(CacheStoreLockedError):
+            AppendOnlyCacheStore(path)
+
+        store.close()
+        with AppendOnlyCacheStore(path) as reopened:
+            self.assertEqual(reopened.get('a'), 'A')
+
+    def test_legacy_json_imported_once(self):
+        """Старый JSON кеш импортируется один раз"""
+        legacy = self.test_dir / 'translation_cache_russian_english.json'
+        legacy.write_text(json.dumps({'Мир|russian|english': 'World'}), encoding='utf-8')
+
+        def convert(key, value):
+            text, source, target = key.rsplit('|', 2)
+            return make_cache_key(text, source, target, 'offline'), value
+
+        key = make_cache_key('Мир', 'russian', 'english', 'offline')
+        with SQLiteCacheStore(str(self.test_dir / 'cache.db')) as store:
+            self.assertEqual(import_json_cache(store, str(legacy), convert), 1)
+            self.assertEqual(store.get(key), 'World')
+            store.delete(key)
+
+            self.assertEqual(import_json_cache(store, str(legacy), convert), 0)
+            self.assertIsNone(store.get(key))
+
+    def test_json_meta_persisted(self):
+        """JSON хранилище помнит импорт старого кеша между запусками"""
+        legacy = self.test_dir / 'translation_cache_russian_english.json'
+        legacy.write_text(json.dumps({'Мир|russian|english': 'World'}), encoding='utf-8')
+        path = str(self.test_dir / 'cache.json')
+
+        store = JSONCacheStore(path)
+        self.assertEqual(import_json_cache(store, str(legacy)), 1)
+        store.delete('Мир|russian|english')
+
+        store = JSONCacheStore(path)
+        self.assertEqual(import_json_cache(store, str(legacy)), 0)
+        self.assertEqual(len(store), 0)
+
+    def test_prefix_scoped_operations(self):
+        """Пары языков и пространства имен не мешают друг другу в общем хранилище"""
+        with SQLiteCacheStore(str(self.test_dir / 'cache.db')) as store:
+            store.set(make_cache_key('Да', 'russian', 'english', 'enhanced'), 'Yes')
+            store.set(make_cache_key('Да', 'russian', 'german', 'enhanced'), 'Ja')
+            store.set(make_cache_key('Да', 'russian', 'english', 'offline'), 'Yes')
+
+            store.clear('enhanced|russian|english|')
+            self.assertEqual(store.count(), 2)
+            self.assertEqual(store.count('enhanced|'), 1)
+
+    def test_shared_store_is_reused(self):
+        """Переводчики одного процесса получают один экземпляр хранилища"""
+        path = str(self.test_dir / 'shared.db')
+        self.assertIs(get_shared_cache_store(path), get_shared_cache_store(path))
+
+    def test_write_behind_flushes_on_threshold_and_close(self):
+        """Отложенные записи видны сразу и попадают на диск по порогу и при close()"""
+        base = SQLiteCacheStore(str(self.test_dir / 'cache.db'))
+        store = WriteBehindCacheStore(base, WriteBehindConfig(max_pending=3, flush_interval=None))
+
+        store.set('a', 'A')
+        store.set('b', 'B')
+        self.assertEqual(store.get('a'), 'A')
+        self.assertEqual(store.pending_writes(), 2)
+        self.assertIsNone(base.get('a'))
+
+        store.set('c', 'C')
+        self.assertEqual(store.pending_writes(), 0)
+        self.assertEqual(base.get('c'), 'C')
+
+        store.set('d', 'D')
+        store.close()
+        self.assertEqual(base.get('d'), 'D')
+        base.close()
+
+    def test_shared_write_behind_is_reused(self):
+        """Переводчики одного процесса делят одну обертку отложенной записи"""
+        path = str(self.test_dir / 'write_behind.db')
+        config = WriteBehindConfig(flush_interval=None)
+        store = get_shared_cache_store(path, write_behind=config)
+        self.assertIsInstance(store, WriteBehindCacheStore)
+        self.assertIs(store, get_shared_cache_store(path, write_behind=WriteBehindConfig(flush_interval=None)))
+        self.assertIs(store.store, get_shared_cache_store(path))
+        store.close()
+
+    def test_write_behind_not_kept_alive(self):
+        """Обработчик atexit и фоновый поток не удерживают обертку"""
+        base = SQLiteCacheStore(str(self.test_dir / 'cache.db'))
+        store = WriteBehindCacheStore(base, WriteBehindConfig(flush_interval=0.01))
+        ref = weakref.ref(store)
+        del store
+        gc.collect()
+        self.assertIsNone(ref())
+        base.close()
+
+
+class TestCacheValues(unittest.TestCase):
+    """Тесты для ключей и компактных значений кеша"""
+
+    def test_key_has_fixed_size(self):
+        """Длина ключа не зависит от длины текста, форма Unicode не влияет на ключ"""
+        short = make_cache_key('Да', 'russian', 'english', 'enhanced')
+        long = make_cache_key('Очень длинный абзац. ' * 500, 'russian', 'english', 'enhanced')
+        self.assertEqual(len(short), len(long))
+        self.assertEqual(make_cache_key('e\u0301', 'french', 'english', 'enhanced'),
+                         make_cache_key('\u00e9', 'french', 'english', 'enhanced'))
+
+    def test_pack_roundtrip_with_compression(self):
+        """Длинные переводы сжимаются, запись восстанавливается без потерь"""
+        record = {'translated': 'Long paragraph. ' * 200, 'service': 'google', 'confidence': 1.0}
+        for compression in ('zlib', 'lzma'):
+            value = pack_value(record, compression)
+            self.assertEqual(value['z'], compression)
+            self.assertLess(len(json.dumps(value)), len(record['translated']))
+            self.assertEqual(unpack_value(value), record)
+
+        short = pack_value({'translated': 'Hi', 'alternatives': []}, 'zlib')
+        self.assertEqual(short, {'t': 'Hi'})
+
+    def test_unpack_legacy_values(self):
+        """Значения прежних форматов по-прежнему читаются"""
+        self.assertEqual(unpack_value('Hello'), {'translated': 'Hello'})
+        legacy = {'original': 'Привет', 'translated': 'Hello', 'source_lang': 'russian',
+                  'target_lang': 'english', 'service': 'google', 'confidence': 1.0, 'alternatives': []}
+        self.assertEqual(unpack_value(legacy),
+                         {'translated': 'Hello', 'service': 'google', 'confidence': 1.0, 'alternatives': []})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Unit тесты для предохранителей сервисов
+"""
+
+import time
+import unittest
+
+from translatecore.circuit_breaker import CircuitBreaker, CircuitBreakerConfig, CLOSED, OPEN, HALF_OPEN
+
+
+class TestCircuitBreaker(unittest.TestCase):
+    """Тесты состояний предохранителя"""
+
+    def make_open(self, cooldown=0.05):
+        breaker = CircuitBreaker(CircuitBreakerConfig(failure_threshold=2, cooldown=cooldown))
+        breaker.record_failure(RuntimeError('down'))
+        breaker.record_failure(RuntimeError('down'))
+        return breaker
+
+    def test_opens_after_threshold(self):
+        """Предохранитель размыкается после failure_threshold ошибок подряд"""
+        breaker = CircuitBreaker(CircuitBreakerConfig(failure_threshold=2))
+        breaker.record_failure()
+        self.assertEqual(breaker.state, CLOSED)
+        breaker.record_failure(RuntimeError('down'))
+        self.assertEqual(breaker.state, OPEN)
+        self.assertFalse(breaker.allow_request())
+        stats = breaker.get_stats()
+        self.assertEqual(stats['rejected'], 1)
+        self.assertEqual(stats['last_error'], 'down')
+        self.assertEqual((stats['failure_threshold'], stats['cooldown']), (2, 30.0))
+
+    def test_success_resets_failures(self):
+        """Успешный ответ обнуляет счетчик ошибок"""
+        breaker = CircuitBreaker(CircuitBreakerConfig(failure_threshold=2))
+        breaker.record_failure()
+        breaker.record_success()
+        breaker.record_failure()
+        self.assertEqual(breaker.state, CLOSED)
+
+    def test_half_open_after_cooldown(self):
+        """После остывания пропускается только пробный запрос"""
+        breaker = self.make_open()
+        time.sleep(0.06)
+        self.assertEqual(breaker.state, HALF_OPEN)
+        self.assertTrue(breaker.allow_request())
+        self.assertFalse(breaker.allow_request())
+
+    def test_trial_success_closes(self):
+        """Успешный пробный запрос закрывает предохранитель"""
+        breaker = self.make_open()
+        time.sleep(0.06)
+        breaker.allow_request()
+        breaker.record_success()
+        self.assertEqual(breaker.state, CLOSED)
+
+    def test_trial_failure_reopens(self):
+        """Ошибка пробного запроса снова размыкает предохранитель"""
+        breaker = self.make_open()
+        time.sleep(0.06)
+        breaker.allow_request()
+        breaker.record_failure()
+        self.assertEqual(breaker.state, OPEN)
+        self.assertEqual(breaker.get_stats()['opened'], 2)
+
+    def test_release_returns_trial_slot(self):
+        """Слот пробного запроса без учтенного результата возвращается"""
+        breaker = self.make_open()
+        time.sleep(0.06)
+        self.assertTrue(breaker.allow_request())
+        self.assertFalse(breaker.allow_request())
+        breaker.release()
+        self.assertEqual(breaker.state, HALF_OPEN)
+        self.assertTrue(breaker.allow_request())
+
+    def test_release_after_result_ignored(self):
+        """После учтенного результата release ничего не меняет"""
+        breaker = self.make_open()
+        time.sleep(0.06)
+        breaker.allow_request()
+        breaker.record_failure()
+        breaker.release()
+        self.assertEqual(breaker.state, OPEN)
+        self.assertFalse(breaker.allow_request())
+
+
+if __name__ == '__main__':
+    unittest.main()
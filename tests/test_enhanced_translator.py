@@ -0,0 +1,553 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Unit тесты для EnhancedTranslator с подмененными сервисами перевода
+"""
+
+import asyncio
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from unittest import mock
+
+from translatecore.batch_providers import NATIVE_BATCH_TRANSLATORS, NATIVE_MULTI_TARGET_TRANSLATORS
+from translatecore.circuit_breaker import CircuitBreakerConfig, CLOSED, HALF_OPEN, OPEN
+from translatecore.enhanced_translator import EnhancedTranslator
+from translatecore.hedging import HedgingConfig
+from translatecore.rate_limiter import RateLimit
+from translatecore.retry_policy import RetryConfig
+from translatecore.translation_memory import TranslationMemoryConfig
+
+
+class FakeService:
+    """Сервис перевода без сети: добавляет префикс к тексту"""
+
+    def __init__(self, prefix='EN:', delay=0.0, fail=False):
+        self.prefix = prefix
+        self.delay = delay
+        self.fail = fail
+        self.calls = 0
+        self.texts = []
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+
+    def translate(self, text, **kwargs):
+        with self._lock:
+            self.calls += 1
+            self.texts.append(text)
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        try:
+            time.sleep(self.delay(text) if callable(self.delay) else self.delay)
+            if isinstance(self.fail, Exception):
+                raise self.fail
+            if self.fail:
+                raise RuntimeError('сервис недоступен')
+            return self.prefix + text
+        finally:
+            with self._lock:
+                self.active -= 1
+
+
+class TranslatorTestCase(unittest.TestCase):
+    """Создает переводчик с кешем во временном каталоге"""
+
+    def setUp(self):
+        self.test_dir = Path(tempfile.mkdtemp())
+        self.translators = []
+
+    def tearDown(self):
+        for translator in self.translators:
+            translator.close()
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def make_translator(self, services=None, preferred_services=None, **kwargs):
+        """Переводчик ru->en, сервисы которого заменены FakeService"""
+        if services is None:
+            services = {'google': FakeService()}
+        translator = EnhancedTranslator('russian', 'english',
+                                        preferred_services=preferred_services or list(services),
+                                        cache_file=str(self.test_dir / f'cache{len(self.translators)}.db'),
+                                        **kwargs)
+        translator.translators.update(services)
+        self.translators.append(translator)
+        return translator
+
+
+class TestLazyServices(TranslatorTestCase):
+    """Тесты отложенного создания сервисов"""
+
+    def setUp(self):
+        super().setUp()
+        self.created = []
+        self.services = {'google': FakeService('G:'), 'mymemory': FakeService('M:')}
+
+        def create(translator, service_name):
+            self.created.append(service_name)
+            time.sleep(0.1)
+            return self.services.get(service_name)
+
+        patcher = mock.patch.object(EnhancedTranslator, '_create_translator', autospec=True, side_effect=create)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_services_created_on_first_use(self):
+        """Сервисы не создаются в конструкторе; создается только понадобившийся"""
+        translator = self.make_translator({}, ['google', 'mymemory'])
+        self.assertEqual(self.created, [])
+
+        self.assertEqual(translator.translate('Привет').service, 'google')
+        self.assertEqual(self.created, ['google'])
+
+    def test_concurrent_creation_once(self):
+        """Одновременные первые запросы создают сервис один раз"""
+        translator = self.make_translator({}, ['google'])
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(translator.translate, [f'Текст {i}' for i in range(8)]))
+
+        self.assertEqual(self.created, ['google'])
+        self.assertEqual({result.service for result in results}, {'google'})
+
+    def test_failed_creation_remembered(self):
+        """Сервис, который не удалось создать, больше не создается"""
+        self.services.pop('google')
+        translator = self.make_translator({}, ['google', 'mymemory'])
+
+        self.assertEqual(translator.translate('Раз').service, 'mymemory')
+        self.assertEqual(translator.translate('Два').service, 'mymemory')
+        self.assertEqual(self.created, ['google', 'mymemory'])
+
+    def test_eager_services(self):
+        """При lazy_services=False сервисы создаются в конструкторе"""
+        self.make_translator({}, ['google'], lazy_services=False)
+        self.assertIn('google', self.created)
+
+
+class TestConcurrentBatch(TranslatorTestCase):
+    """Тесты параллельного пакетного перевода"""
+
+    TEXTS = [f'Текст номер {i}' for i in range(24)]
+
+    def test_order_preserved(self):
+        """Результаты идут в порядке входных текстов, даже если поздние тексты переводятся быстрее"""
+        service = FakeService(delay=lambda text: 0.05 if text.endswith(('0', '1', '2')) else 0.0)
+        translator = self.make_translator({'google': service}, max_workers=8)
+
+        results = translator.translate_batch(self.TEXTS, show_progress=False)
+        self.assertEqual([result.original for result in results], self.TEXTS)
+        self.assertEqual([result.translated for result in results], ['EN:' + text for text in self.TEXTS])
+        self.assertGreater(service.max_active, 1)
+
+    def test_stats_consistent(self):
+        """Счетчики, обновляемые из рабочих потоков, не теряют значений"""
+        translator = self.make_translator({'google': FakeService(delay=0.01)}, max_workers=8)
+
+        translator.translate_batch(self.TEXTS, show_progress=False)
+        translator.translate_batch(self.TEXTS, show_progress=False)
+
+        stats = translator.get_stats()
+        total = 2 * len(self.TEXTS)
+        self.assertEqual(stats['total_requests'], total)
+        self.assertEqual(stats['cache_hits'], len(self.TEXTS))
+        self.assertEqual(stats['service_usage'], {'google': len(self.TEXTS)})
+        self.assertEqual(stats['batch_texts'], total)
+
+    def test_service_concurrency_limit(self):
+        """Одновременных запросов к сервису не больше его лимита"""
+        service = FakeService(delay=0.02)
+        translator = self.make_translator({'google': service}, max_workers=8, service_concurrency={'google': 2})
+
+        translator.translate_batch(self.TEXTS, show_progress=False)
+        self.assertEqual(service.max_active, 2)
+
+
+class TestBatchDedup(TranslatorTestCase):
+    """Тесты дедупликации повторяющихся текстов пакета"""
+
+    def test_duplicates_fanned_out(self):
+        """Повторы переводятся один раз, перевод раздается во все позиции"""
+        service = FakeService()
+        translator = self.make_translator({'google': service})
+        texts = ['Привет', 'Мир', 'Привет', ' Привет\n', 'Мир']
+
+        results = translator.translate_batch(texts, show_progress=False)
+        self.assertEqual(service.calls, 2)
+        self.assertEqual([result.original for result in results], texts)
+        self.assertEqual([result.translated for result in results],
+                         ['EN:Привет', 'EN:Мир', 'EN:Привет', ' EN:Привет\n', 'EN:Мир'])
+        self.assertEqual(len({id(result) for result in results}), len(texts))
+
+    def test_batch_joins_inflight_translate(self):
+        """Текст пакета, который уже переводит translate(), не запрашивается повторно"""
+        service = FakeService(delay=lambda text: 0.3 if text == 'Привет' else 0.0)
+        translator = self.make_translator({'google': service})
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            single = executor.submit(translator.translate, 'Привет')
+            time.sleep(0.1)
+            results = translator.translate_batch(['Привет', 'Мир'], show_progress=False)
+
+        self.assertEqual(single.result().translated, 'EN:Привет')
+        self.assertEqual([result.translated for result in results], ['EN:Привет', 'EN:Мир'])
+        self.assertEqual(service.texts.count('Привет'), 1)
+        self.assertEqual(translator.get_stats()['coalesced'], 1)
+
+    def test_dedup_ratio(self):
+        """batch_dedup_ratio - доля повторов среди текстов пакетов"""
+        translator = self.make_translator()
+        translator.translate_batch(['Раз', 'Два', 'Раз', 'Раз'], show_progress=False)
+
+        stats = translator.get_stats()
+        self.assertEqual((stats['batch_texts'], stats['batch_unique_texts']), (4, 2))
+        self.assertAlmostEqual(stats['batch_dedup_ratio'], 50.0)
+
+
+class TestNativeBatch(TranslatorTestCase):
+    """Тесты пакетных запросов сервисов в translate_batch"""
+
+    def setUp(self):
+        super().setUp()
+        self.batches = []
+
+    def batch(self, service, texts):
+        """Пакетный запрос FakeService: один вызов на пачку"""
+        self.batches.append(list(texts))
+        return [service.prefix + text for text in texts]
+
+    def failing_batch(self, service, texts):
+        self.batches.append(list(texts))
+        raise RuntimeError('пакетный запрос не поддерживается')
+
+    def test_misses_sent_as_one_batch(self):
+        """Промахи кеша уходят в пакетный сервис одним запросом"""
+        services = {'libre': FakeService('LB:'), 'google': FakeService()}
+        translator = self.make_translator(services)
+        translator.translate('Два')
+
+        with mock.patch.dict(NATIVE_BATCH_TRANSLATORS, {'libre': self.batch}):
+            results = translator.translate_batch(['Раз', 'Два', 'Три'], show_progress=False)
+
+        self.assertEqual([result.translated for result in results], ['LB:Раз', 'LB:Два', 'LB:Три'])
+        self.assertEqual(self.batches, [['Раз', 'Три']])
+        self.assertEqual((services['libre'].calls, services['google'].calls), (1, 0))
+
+    def test_failed_batch_falls_back_per_item(self):
+        """Если пакетный запрос не удался, тексты переводятся по одному тем же сервисом"""
+        services = {'libre': FakeService('LB:'), 'google': FakeService()}
+        translator = self.make_translator(services)
+
+        with mock.patch.dict(NATIVE_BATCH_TRANSLATORS, {'libre': self.failing_batch}):
+            results = translator.translate_batch(['Раз', 'Два'], show_progress=False)
+
+        self.assertEqual(self.batches, [['Раз', 'Два']])
+        self.assertEqual([result.service for result in results], ['libre', 'libre'])
+        self.assertEqual(sorted(services['libre'].texts), ['Два', 'Раз'])
+        self.assertEqual(services['google'].calls, 0)
+
+    def test_failed_batch_and_service_fall_through_chain(self):
+        """Если сервис не переводит и по одному, тексты достаются следующему сервису цепочки"""
+        services = {'libre': FakeService('LB:', fail=True), 'google': FakeService()}
+        translator = self.make_translator(services)
+
+        with mock.patch.dict(NATIVE_BATCH_TRANSLATORS, {'libre': self.failing_batch}):
+            results = translator.translate_batch(['Раз', 'Два'], show_progress=False)
+
+        self.assertEqual([result.translated for result in results], ['EN:Раз', 'EN:Два'])
+        self.assertEqual(services['google'].calls, 2)
+
+
+class TestAsyncAPI(TranslatorTestCase):
+    """Тесты асинхронного API"""
+
+    def test_translate_async(self):
+        """translate_async переводит текст и сохраняет его в общий кеш"""
+        service = FakeService()
+        translator = self.make_translator({'google': service})
+
+        async def main():
+            first = await translator.translate_async('Привет')
+            second = await translator.translate_async('Привет')
+            return first, second
+
+        first, second = asyncio.run(main())
+        self.assertEqual((first.translated, second.translated), ('EN:Привет', 'EN:Привет'))
+        self.assertEqual(service.calls, 1)
+        self.assertEqual(translator.translate('Привет').translated, 'EN:Привет')
+        self.assertEqual(translator.get_stats()['cache_hits'], 2)
+
+    def test_batch_async_order_and_concurrency(self):
+        """translate_batch_async сохраняет порядок и не превышает max_concurrency"""
+        service = FakeService(delay=lambda text: 0.05 if text.endswith('0') else 0.01)
+        translator = self.make_translator({'google': service})
+        texts = [f'Текст {i}' for i in range(10)]
+
+        results = asyncio.run(translator.translate_batch_async(texts, max_concurrency=3))
+        self.assertEqual([result.translated for result in results], ['EN:' + text for text in texts])
+        self.assertLessEqual(service.max_active, 3)
+        self.assertGreater(service.max_active, 1)
+
+    def test_timeout_not_cached(self):
+        """Перевод, прерванный по timeout, не попадает в кеш; следующий запрос обращается к сервису"""
+        service = FakeService(delay=0.2)
+        translator = self.make_translator({'google': service})
+
+        with self.assertRaises(asyncio.TimeoutError):
+            asyncio.run(translator.translate_async('Привет', timeout=0.05))
+
+        service.delay = 0.0
+        self.assertEqual(asyncio.run(translator.translate_async('Привет')).service, 'google')
+        self.assertEqual(translator.get_stats()['cache_hits'], 0)
+
+    def test_batch_cancel_stops_pending(self):
+        """Отмена пакета отменяет переводы, еще не отправленные сервису"""
+        service = FakeService(delay=0.2)
+        translator = self.make_translator({'google': service})
+        texts = [f'Текст {i}' for i in range(6)]
+
+        async def main():
+            with self.assertRaises(asyncio.TimeoutError):
+                await asyncio.wait_for(translator.translate_batch_async(texts, max_concurrency=2), 0.05)
+            await asyncio.sleep(0.5)
+
+        asyncio.run(main())
+        self.assertEqual(service.calls, 2)
+
+
+class TestFallback(TranslatorTestCase):
+    """Тесты результата без перевода"""
+
+    def test_fallback_returns_input_unchanged(self):
+        """Если все сервисы недоступны, текст возвращается без изменений, включая пробелы"""
+        translator = self.make_translator({'google': FakeService(fail=True)})
+        text = 'Привет   мир\n'
+
+        result = translator.translate(text)
+        self.assertEqual((result.service, result.translated), ('fallback', text))
+
+        results = translator.translate_batch([text, '  Пока  '], show_progress=False)
+        self.assertEqual([result.translated for result in results], [text, '  Пока  '])
+
+    def test_edges_restored_after_translation(self):
+        """Снятые при нормализации края возвращаются в перевод"""
+        translator = self.make_translator()
+        self.assertEqual(translator.translate('  Привет\n').translated, '  EN:Привет\n')
+
+    def test_internal_whitespace_sent_to_service(self):
+        """Сервис получает текст с исходными отступами, варианты пробелов делят запись кеша"""
+        service = FakeService()
+        translator = self.make_translator({'google': service})
+        self.assertEqual(translator.translate('line1\n\n  line2').translated, 'EN:line1\n\n  line2')
+        self.assertEqual(service.texts, ['line1\n\n  line2'])
+
+        translator.translate('Привет мир')
+        self.assertEqual(translator.translate('Привет  мир').translated, 'EN:Привет мир')
+        self.assertEqual(service.calls, 2)
+        self.assertEqual(translator.get_stats()['normalized_hits'], 1)
+
+
+class TestTranslationMemoryAutoAccept(TranslatorTestCase):
+    """Тесты автоматического принятия совпадений из памяти переводов"""
+
+    def test_changed_number_not_accepted(self):
+        """Сегмент с другим числом не принимается вместо перевода"""
+        service = FakeService()
+        translator = self.make_translator({'google': service},
+                                          translation_memory=TranslationMemoryConfig(auto_accept=0.8, persist=False))
+        translator.translate('Заказ 12345 отправлен')
+
+        result = translator.translate('Заказ 12346 отправлен')
+        self.assertEqual((result.service, result.translated), ('google', 'EN:Заказ 12346 отправлен'))
+
+        result = translator.translate('заказ 12345 отправлен')
+        self.assertEqual((result.service, result.translated), ('tm_google', 'EN:Заказ 12345 отправлен'))
+        self.assertEqual(service.calls, 2)
+
+
+class TestSegmentation(TranslatorTestCase):
+    """Тесты разбиения длинных текстов по ограничению сервиса"""
+
+    TEXT = ' '.join(f'Предложение номер {i}.' for i in range(60))
+
+    def test_whole_text_for_large_limit(self):
+        """Текст в пределах ограничения первого сервиса не делится из-за меньшего ограничения следующего"""
+        services = {'google': FakeService('G:'), 'mymemory': FakeService('M:')}
+        translator = self.make_translator(services)
+
+        result = translator.translate(self.TEXT)
+        self.assertEqual(result.translated, 'G:' + self.TEXT)
+        self.assertEqual((services['google'].calls, services['mymemory'].calls), (1, 0))
+        self.assertEqual(translator.get_stats()['segmented_requests'], 0)
+
+    def test_split_for_smaller_limit(self):
+        """Сервис с меньшим ограничением получает текст частями"""
+        services = {'google': FakeService('G:', fail=True), 'mymemory': FakeService('M:')}
+        translator = self.make_translator(services)
+
+        result = translator.translate(self.TEXT)
+        self.assertEqual(result.service, 'mymemory')
+        self.assertGreater(services['mymemory'].calls, 1)
+        self.assertTrue(all(len(text) <= 500 for text in services['mymemory'].texts))
+        self.assertEqual(translator.get_stats()['segmented_requests'], 1)
+
+    def test_async_split(self):
+        """translate_async делит текст так же, как translate, и собирает части по порядку"""
+        services = {'google': FakeService('G:', fail=True), 'mymemory': FakeService('M:', delay=0.05)}
+        translator = self.make_translator(services)
+
+        result = asyncio.run(translator.translate_async(self.TEXT))
+        self.assertEqual(result.service, 'mymemory')
+        self.assertTrue(all(len(text) <= 500 for text in services['mymemory'].texts))
+        self.assertEqual(result.translated.replace('M:', ''), self.TEXT)
+        self.assertEqual(translator.get_stats()['segmented_requests'], 1)
+
+
+class TestMultiTarget(TranslatorTestCase):
+    """Тесты перевода на несколько языков"""
+
+    def test_microsoft_language_codes(self):
+        """Запрос к Microsoft использует коды языков Microsoft, а не Google"""
+        requested = []
+
+        def multi(service, text, codes):
+            requested.extend(codes)
+            return {code: f'{code}:{text}' for code in codes}
+
+        translator = self.make_translator({'microsoft': FakeService()})
+        with mock.patch.dict(NATIVE_MULTI_TARGET_TRANSLATORS, {'microsoft': multi}):
+            results = translator.translate_multi('Привет', ['chinese', 'german'])
+
+        self.assertEqual(requested, ['zh-hans', 'de'])
+        self.assertEqual({target: result.translated for target, result in results.items()},
+                         {'chinese': 'zh-hans:Привет', 'german': 'de:Привет'})
+
+
+class TestHedging(TranslatorTestCase):
+    """Тесты хеджирования запросов на запасной сервис"""
+
+    def test_slow_primary_loses_to_backup(self):
+        """Медленный основной сервис проигрывает запасному, хеджирование учитывается в статистике"""
+        services = {'google': FakeService(delay=0.5), 'libre': FakeService('LB:')}
+        translator = self.make_translator(services, hedging=HedgingConfig(delay=0.05))
+
+        result = translator.translate('Привет')
+        self.assertEqual((result.service, result.translated), ('libre', 'LB:Привет'))
+        self.assertEqual(services['libre'].calls, 1)
+
+        stats = translator.get_stats()['hedging']
+        self.assertEqual((stats['candidates'], stats['hedged_requests'], stats['hedge_wins']), (1, 1, 1))
+        self.assertAlmostEqual(stats['hedge_rate'], 100.0)
+
+    def test_open_backup_not_hedged(self):
+        """Запрос не дублируется в сервис с разомкнутым предохранителем"""
+        services = {'google': FakeService(delay=0.2), 'libre': FakeService('LB:')}
+        translator = self.make_translator(services, hedging=HedgingConfig(delay=0.05),
+                                          circuit_breaker=CircuitBreakerConfig(failure_threshold=1, cooldown=60))
+        translator._breakers['libre'].record_failure(RuntimeError('down'))
+
+        self.assertEqual(translator.translate('Привет').service, 'google')
+        self.assertEqual(services['libre'].calls, 0)
+        self.assertEqual(translator.get_stats()['hedging']['hedged_requests'], 0)
+
+
+class TestBreakerTrialSlot(TranslatorTestCase):
+    """Тесты возврата слота пробного запроса полуоткрытого предохранителя"""
+
+    def make_half_open(self, translator, service_name):
+        breaker = translator._breakers[service_name]
+        breaker.record_failure(RuntimeError('down'))
+        time.sleep(0.06)
+        self.assertEqual(breaker.state, HALF_OPEN)
+        return breaker
+
+    def test_async_cancel_releases_slot(self):
+        """Отмена translate_async по timeout во время пробного запроса возвращает слот"""
+        translator = self.make_translator({'google': FakeService(delay=0.3)},
+                                          circuit_breaker=CircuitBreakerConfig(failure_threshold=1, cooldown=0.05))
+        breaker = self.make_half_open(translator, 'google')
+
+        with self.assertRaises(asyncio.TimeoutError):
+            asyncio.run(translator.translate_async('Привет', timeout=0.05))
+
+        self.assertEqual(breaker.state, HALF_OPEN)
+        self.assertTrue(breaker.allow_request())
+
+    def test_batch_rate_limit_releases_slot(self):
+        """Пачка, пропущенная из-за лимита запросов, возвращает слот пробного запроса"""
+        services = {'libre': FakeService('LB:'), 'google': FakeService()}
+        translator = self.make_translator(services,
+                                          api_keys={'libre': 'breaker-slot-test'},
+                                          rate_limits={'libre': RateLimit(rate=0.001, burst=1)},
+                                          circuit_breaker=CircuitBreakerConfig(failure_threshold=1, cooldown=0.05))
+        breaker = self.make_half_open(translator, 'libre')
+        translator._rate_limiters['libre'].try_acquire()
+
+        batch = lambda service, texts: [service.translate(text) for text in texts]
+        with mock.patch.dict(NATIVE_BATCH_TRANSLATORS, {'libre': batch}):
+            results = translator.translate_batch(['Раз', 'Два'], show_progress=False)
+
+        self.assertEqual([result.service for result in results], ['google', 'google'])
+        self.assertEqual(services['libre'].calls, 0)
+        self.assertTrue(breaker.allow_request())
+
+    def test_retries_count_as_one_failure(self):
+        """Повторные попытки одного запроса дают предохранителю один отказ"""
+        service = FakeService(fail=ConnectionError('обрыв соединения'))
+        translator = self.make_translator({'google': service},
+                                          retry=RetryConfig(max_attempts=3, base_delay=0.0, jitter=0.0),
+                                          circuit_breaker=CircuitBreakerConfig(failure_threshold=3, cooldown=60))
+        breaker = translator._breakers['google']
+
+        for _ in range(2):
+            self.assertEqual(translator.translate('Привет').service, 'fallback')
+        self.assertEqual(service.calls, 6)
+        self.assertEqual(breaker.state, CLOSED)
+
+        translator.translate('Привет')
+        self.assertEqual(breaker.state, OPEN)
+
+
+class TestRateLimitDeadline(TranslatorTestCase):
+    """Тесты ожидания маркера лимита запросов в пределах срока"""
+
+    def make_limited(self, api_key):
+        """Единственный сервис, маркер которого появится только через ~1000с"""
+        service = FakeService('LB:')
+        translator = self.make_translator({'libre': service}, api_keys={'libre': api_key},
+                                          rate_limits={'libre': RateLimit(rate=0.001, burst=1)})
+        translator._rate_limiters['libre'].try_acquire()
+        return translator, service
+
+    def test_async_wait_bounded_by_timeout(self):
+        """translate_async не ждет маркер, который не появится до срока"""
+        translator, service = self.make_limited('async-deadline-test')
+
+        start = time.monotonic()
+        result = asyncio.run(translator.translate_async('Привет', timeout=0.5))
+        self.assertEqual(result.service, 'fallback')
+        self.assertLess(time.monotonic() - start, 0.4)
+        self.assertEqual(service.calls, 0)
+
+    def test_batch_chunk_not_sent_without_token(self):
+        """Пачка без маркера не отправляется, если маркер не появится до срока"""
+        translator, service = self.make_limited('chunk-deadline-test')
+        batches = []
+
+        def batch(service, texts):
+            batches.append(list(texts))
+            return [service.prefix + text for text in texts]
+
+        with mock.patch.dict(NATIVE_BATCH_TRANSLATORS, {'libre': batch}):
+            results = translator.translate_batch(['Раз', 'Два'], show_progress=False, timeout=0.5)
+
+        self.assertEqual([result.service for result in results], ['fallback', 'fallback'])
+        self.assertEqual((batches, service.calls), ([], 0))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Unit тесты для хеджирования запросов
+"""
+
+import unittest
+
+from translatecore.hedging import HedgingConfig, LatencyTracker
+
+
+class TestLatencyTracker(unittest.TestCase):
+    """Тесты замеров задержек"""
+
+    def test_percentile(self):
+        """Перцентиль считается по скользящему окну"""
+        tracker = LatencyTracker(window=100)
+        for i in range(1, 101):
+            tracker.record('google', i / 100)
+        self.assertAlmostEqual(tracker.percentile('google', 95), 0.95)
+        self.assertAlmostEqual(tracker.percentile('google', 50), 0.5)
+        self.assertIsNone(tracker.percentile('deepl', 95))
+
+    def test_window(self):
+        """Старые замеры вытесняются"""
+        tracker = LatencyTracker(window=3)
+        for seconds in (10.0, 0.1, 0.2, 0.3):
+            tracker.record('google', seconds)
+        self.assertEqual(tracker.count('google'), 3)
+        self.assertAlmostEqual(tracker.percentile('google', 100), 0.3)
+
+    def test_hedge_delay(self):
+        """Задержка: фиксированная, по умолчанию до min_samples замеров, затем перцентиль"""
+        tracker = LatencyTracker()
+        config = HedgingConfig(min_samples=5, default_delay=2.0, min_delay=0.05)
+        self.assertEqual(tracker.hedge_delay('google', config), 2.0)
+
+        for _ in range(5):
+            tracker.record('google', 0.3)
+        self.assertAlmostEqual(tracker.hedge_delay('google', config), 0.3)
+        self.assertEqual(tracker.hedge_delay('google', HedgingConfig(delay=0.01)), 0.05)
+
+    def test_stats(self):
+        """Статистика содержит p50 и p95 по сервисам"""
+        tracker = LatencyTracker()
+        tracker.record('google', 0.2)
+        stats = tracker.get_stats()
+        self.assertEqual(stats['google']['samples'], 1)
+        self.assertAlmostEqual(stats['google']['p95'], 0.2)
+
+
+if __name__ == '__main__':
+    unittest.main()
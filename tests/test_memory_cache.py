@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Unit тесты для ограниченного кеша переводов в памяти
+"""
+
+import time
+import unittest
+
+from translatecore.memory_cache import MemoryCache, MemoryCacheConfig
+
+
+class TestMemoryCache(unittest.TestCase):
+    """Тесты для вытеснения записей из кеша в памяти"""
+
+    def test_lru_eviction_by_entries(self):
+        """Вытесняется давно не использованная запись"""
+        cache = MemoryCache(MemoryCacheConfig(max_entries=2))
+        cache.set('a', 'A')
+        cache.set('b', 'B')
+        cache.get('a')
+        cache.set('c', 'C')
+
+        self.assertIn('a', cache)
+        self.assertNotIn('b', cache)
+        self.assertEqual(cache.get_stats()['evictions'], 1)
+
+    def test_eviction_by_bytes(self):
+        """Объем кеша не превышает лимит в байтах"""
+        cache = MemoryCache(MemoryCacheConfig(max_entries=None, max_bytes=2000))
+        for i in range(100):
+            cache.set(f'key {i}', 'x' * 100)
+
+        self.assertLessEqual(cache.get_stats()['bytes'], 2000)
+        self.assertIn('key 99', cache)
+
+    def test_ttl_expiration(self):
+        """Просроченная запись считается промахом"""
+        cache = MemoryCache(MemoryCacheConfig(ttl=0.01))
+        cache.set('a', 'A')
+        time.sleep(0.02)
+
+        self.assertIsNone(cache.get('a'))
+        self.assertEqual(cache.get_stats()['expirations'], 1)
+
+    def test_cost_policy_keeps_expensive_entries(self):
+        """Политика 'cost' вытесняет дешевые записи раньше дорогих"""
+        cache = MemoryCache(MemoryCacheConfig(max_entries=2, policy='cost'))
+        cache.set('paid', 'DeepL', cost=10.0)
+        cache.set('free', 'Google', cost=1.0)
+        cache.set('new', 'Google', cost=1.0)
+
+        self.assertIn('paid', cache)
+        self.assertNotIn('free', cache)
+
+
+if __name__ == '__main__':
+    unittest.main()
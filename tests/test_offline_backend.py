@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Unit тесты для жизненного цикла оффлайн бэкенда
+"""
+
+import unittest
+
+from translatecore.offline_backend import OfflineBackendManager, OfflineBackendConfig
+
+
+class FakeOfflineTranslator:
+    """Оффлайн переводчик без Argos и Docker"""
+
+    def __init__(self):
+        self.warm_ups = 0
+        self.refreshes = 0
+        self.closed = False
+        self.docker_started = False
+        self.docker_stopped = False
+
+    def warm_up(self, text):
+        self.warm_ups += 1
+        return True
+
+    def refresh_methods(self):
+        self.refreshes += 1
+        return ['argos']
+
+    def check_health(self):
+        return {'argos': True}
+
+    def close(self):
+        self.closed = True
+
+    def stop_docker_libretranslate(self):
+        self.docker_stopped = True
+
+
+class TestOfflineBackendManager(unittest.TestCase):
+    """Тесты для запуска, восстановления и остановки бэкенда"""
+
+    def setUp(self):
+        self.created = []
+
+        def factory():
+            translator = FakeOfflineTranslator()
+            self.created.append(translator)
+            return translator
+
+        self.factory = factory
+
+    def test_single_instance_with_warm_up(self):
+        """Переводчик создается и прогревается один раз"""
+        backend = OfflineBackendManager(self.factory)
+        first = backend.start()
+
+        self.assertIs(backend.get(), first)
+        self.assertIs(backend.start(), first)
+        self.assertEqual(len(self.created), 1)
+        self.assertEqual(first.warm_ups, 1)
+        self.assertTrue(backend.health()['warmed_up'])
+
+    def test_recovery_after_consecutive_failures(self):
+        """После серии ошибок методы определяются заново без пересоздания"""
+        backend = OfflineBackendManager(self.factory, OfflineBackendConfig(max_failures=2))
+        translator = backend.start()
+
+        self.assertFalse(backend.report_failure(RuntimeError('a')))
+        backend.report_success()
+        self.assertFalse(backend.report_failure(RuntimeError('b')))
+        self.assertTrue(backend.report_failure(RuntimeError('c')))
+
+        self.assertEqual(translator.refreshes, 1)
+        self.assertEqual(len(self.created), 1)
+        health = backend.health()
+        self.assertEqual((health['failures'], health['recoveries']), (3, 1))
+        self.assertTrue(health['healthy'])
+
+    def test_shutdown_stops_own_docker(self):
+        """Остановка закрывает переводчик и контейнер, запущенный бэкендом"""
+        with OfflineBackendManager(self.factory, OfflineBackendConfig(warm_up=False)) as backend:
+            translator = backend.get()
+            translator.docker_started = True
+
+        self.assertTrue(translator.closed)
+        self.assertTrue(translator.docker_stopped)
+        self.assertEqual(translator.warm_ups, 0)
+        self.assertFalse(backend.health()['running'])
+
+
+if __name__ == '__main__':
+    unittest.main()
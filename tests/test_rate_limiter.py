@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Unit тесты для ограничения частоты запросов
+"""
+
+import asyncio
+import time
+import unittest
+
+from translatecore.rate_limiter import RateLimit, TokenBucket, get_rate_limiter, rate_limit_from_settings
+
+
+class TestTokenBucket(unittest.TestCase):
+    """Тесты маркерной корзины"""
+
+    def test_burst(self):
+        """Запас позволяет burst запросов подряд"""
+        bucket = TokenBucket(RateLimit(rate=1, burst=3))
+        self.assertTrue(all(bucket.try_acquire() for _ in range(3)))
+        self.assertFalse(bucket.try_acquire())
+        self.assertEqual(bucket.get_stats()['rejected'], 1)
+
+    def test_refill(self):
+        """Маркеры пополняются со скоростью rate"""
+        bucket = TokenBucket(RateLimit(rate=50, burst=1))
+        self.assertTrue(bucket.try_acquire())
+        self.assertFalse(bucket.try_acquire())
+        self.assertGreater(bucket.wait_time(), 0)
+        time.sleep(0.03)
+        self.assertTrue(bucket.try_acquire())
+
+    def test_acquire_timeout(self):
+        """acquire() не ждет дольше timeout"""
+        bucket = TokenBucket(RateLimit(rate=0.1, burst=1))
+        bucket.try_acquire()
+        self.assertFalse(bucket.acquire(timeout=0.01))
+
+    def test_acquire_async(self):
+        """acquire_async() дожидается маркера, но не дольше timeout"""
+        bucket = TokenBucket(RateLimit(rate=50, burst=1))
+        bucket.try_acquire()
+        self.assertTrue(asyncio.run(bucket.acquire_async(timeout=1.0)))
+        self.assertFalse(asyncio.run(bucket.acquire_async(timeout=0.001)))
+
+
+class TestRateLimiterRegistry(unittest.TestCase):
+    """Тесты общих корзин и настроек"""
+
+    def test_shared_per_key(self):
+        """Переводчики с одним ключом делят корзину, с разными - нет"""
+        limit = RateLimit(rate=1, burst=1)
+        first = get_rate_limiter('test-deepl', 'key-a', limit)
+        self.assertIs(get_rate_limiter('test-deepl', 'key-a', limit), first)
+        self.assertIsNot(get_rate_limiter('test-deepl', 'key-b', limit), first)
+
+    def test_conflicting_limit_keeps_bucket(self):
+        """Другой лимит для того же ключа не заменяет корзину и не сбрасывает ее запас"""
+        first = get_rate_limiter('test-libre', 'key-a', RateLimit(rate=1, burst=1))
+        self.assertTrue(first.try_acquire())
+        with self.assertLogs('translatecore.rate_limit', level='WARNING'):
+            second = get_rate_limiter('test-libre', 'key-a', RateLimit(rate=10, burst=5))
+        self.assertIs(second, first)
+        self.assertFalse(second.try_acquire())
+
+    def test_from_settings(self):
+        """Лимит читается из 'rate_limit' и 'burst'"""
+        self.assertIsNone(rate_limit_from_settings({'max_concurrency': 2}))
+        self.assertEqual(rate_limit_from_settings({'rate_limit': 2, 'burst': 5}), RateLimit(rate=2.0, burst=5))
+        self.assertEqual(rate_limit_from_settings({'rate_limit': 0.5}).burst, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Unit тесты для повторных запросов и срока перевода
+"""
+
+import time
+import unittest
+
+import requests
+from deep_translator.exceptions import TooManyRequests, AuthorizationException, LanguageNotSupportedException
+
+from translatecore.retry_policy import (RetryConfig, Deadline, DeadlineExceeded,
+                                        is_retryable, backoff_delay)
+
+
+def http_error(status):
+    response = requests.Response()
+    response.status_code = status
+    return requests.HTTPError(f"HTTP {status}", response=response)
+
+
+class TestRetryPolicy(unittest.TestCase):
+    """Тесты классификации ошибок и задержек"""
+
+    def test_transient_errors(self):
+        """429, 5xx, таймауты и обрывы соединения повторяются"""
+        self.assertTrue(is_retryable(TooManyRequests()))
+        self.assertTrue(is_retryable(http_error(429)))
+        self.assertTrue(is_retryable(http_error(503)))
+        self.assertTrue(is_retryable(requests.Timeout()))
+        self.assertTrue(is_retryable(requests.ConnectionError()))
+
+    def test_permanent_errors(self):
+        """Ошибки авторизации, 4xx и истекший срок не повторяются"""
+        self.assertFalse(is_retryable(AuthorizationException('key')))
+        self.assertFalse(is_retryable(http_error(401)))
+        self.assertFalse(is_retryable(http_error(400)))
+        self.assertFalse(is_retryable(LanguageNotSupportedException('xx')))
+        self.assertFalse(is_retryable(DeadlineExceeded()))
+        self.assertFalse(is_retryable(ValueError()))
+
+    def test_backoff(self):
+        """Задержка растет экспоненциально и ограничена max_delay"""
+        config = RetryConfig(base_delay=0.1, max_delay=1.0, jitter=0)
+        self.assertAlmostEqual(backoff_delay(0, config), 0.1)
+        self.assertAlmostEqual(backoff_delay(2, config), 0.4)
+        self.assertAlmostEqual(backoff_delay(10, config), 1.0)
+
+    def test_jitter(self):
+        """Разброс не выходит за долю jitter"""
+        config = RetryConfig(base_delay=1.0, jitter=0.5)
+        for _ in range(50):
+            self.assertTrue(0.5 <= backoff_delay(0, config) <= 1.0)
+
+
+class TestDeadline(unittest.TestCase):
+    """Тесты общего срока"""
+
+    def test_remaining(self):
+        """Остаток уменьшается и не уходит ниже нуля"""
+        deadline = Deadline(0.05)
+        self.assertGreater(deadline.remaining(), 0)
+        deadline.check()
+        time.sleep(0.06)
+        self.assertEqual(deadline.remaining(), 0)
+        self.assertTrue(deadline.expired())
+        with self.assertRaises(DeadlineExceeded):
+            deadline.check()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Unit тесты для адаптивного порядка сервисов
+"""
+
+import unittest
+
+from translatecore.service_router import AdaptiveRouter, RouterConfig
+
+PAIR = 'russian-english'
+
+
+class TestAdaptiveRouter(unittest.TestCase):
+    """Тесты порядка сервисов по задержкам и ошибкам"""
+
+    def setUp(self):
+        self.router = AdaptiveRouter(RouterConfig(min_samples=2, probe_interval=3600))
+
+    def record(self, service, latency, times=3):
+        for _ in range(times):
+            self.router.record_success(service, PAIR, latency)
+
+    def test_cold_start_keeps_order(self):
+        """Без замеров сохраняется исходный порядок"""
+        services = ['google', 'libre', 'mymemory']
+        self.assertEqual(self.router.order(services, PAIR), services)
+
+    def test_faster_service_first(self):
+        """Более быстрый сервис поднимается в начало цепочки"""
+        self.record('google', 1.0)
+        self.record('libre', 0.1)
+        self.assertEqual(self.router.order(['google', 'libre'], PAIR), ['libre', 'google'])
+
+    def test_errors_demote(self):
+        """Ошибки ухудшают оценку сервиса"""
+        self.record('google', 0.1)
+        self.record('libre', 0.2)
+        for _ in range(5):
+            self.router.record_failure('google', PAIR)
+        self.assertEqual(self.router.order(['google', 'libre'], PAIR), ['libre', 'google'])
+
+    def test_pairs_are_separate(self):
+        """Показатели ведутся отдельно для каждой языковой пары"""
+        self.record('google', 1.0)
+        self.record('libre', 0.1)
+        self.assertEqual(self.router.order(['google', 'libre'], 'english-german'), ['google', 'libre'])
+
+    def test_constraints(self):
+        """Сервисы из first и платные при paid_last не перемещаются"""
+        router = AdaptiveRouter(RouterConfig(min_samples=1, first=['offline'], paid_last=True,
+                                             probe_interval=3600), paid_services=['deepl'])
+        router.record_success('offline', PAIR, 5.0)
+        router.record_success('deepl', PAIR, 0.01)
+        router.record_success('google', PAIR, 1.0)
+        router.record_success('libre', PAIR, 0.5)
+        self.assertEqual(router.order(['offline', 'deepl', 'google', 'libre'], PAIR),
+                         ['offline', 'libre', 'google', 'deepl'])
+
+    def test_probe_demoted_service(self):
+        """Пониженный сервис получает пробный запрос после probe_interval"""
+        router = AdaptiveRouter(RouterConfig(min_samples=1, probe_interval=0))
+        router.record_success('google', PAIR, 0.1)
+        router.record_success('libre', PAIR, 1.0)
+        self.assertEqual(router.order(['google', 'libre'], PAIR)[0], 'libre')
+        self.assertEqual(router.get_stats(PAIR)['probes'], 1)
+
+    def test_probe_unmeasured_service(self):
+        """Сервис без замеров пробуется, как только лидер цепочки измерен"""
+        self.record('google', 0.1)
+        self.assertEqual(self.router.order(['google', 'libre'], PAIR), ['libre', 'google'])
+        self.assertEqual(self.router.order(['google', 'libre'], PAIR), ['google', 'libre'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Unit тесты для объединения одновременных запросов
+"""
+
+import asyncio
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from translatecore.single_flight import SingleFlight
+
+
+class TestSingleFlight(unittest.TestCase):
+    """Тесты потокового и асинхронного API"""
+
+    def setUp(self):
+        self.flight = SingleFlight()
+        self.calls = 0
+        self.calls_lock = threading.Lock()
+
+    def slow_translate(self, value='перевод', delay=0.2):
+        with self.calls_lock:
+            self.calls += 1
+        time.sleep(delay)
+        return value
+
+    def test_concurrent_calls_coalesced(self):
+        """Одновременные вызовы с одним ключом выполняют функцию один раз"""
+        with ThreadPoolExecutor(max_workers=10) as executor:
+            results = list(executor.map(lambda _: self.flight.do('key', self.slow_translate), range(10)))
+        self.assertEqual(self.calls, 1)
+        self.assertEqual({value for value, _ in results}, {'перевод'})
+        self.assertEqual(sum(shared for _, shared in results), 9)
+        self.assertEqual(self.flight.in_flight(), 0)
+
+    def test_different_keys_not_coalesced(self):
+        """Вызовы с разными ключами выполняются отдельно"""
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            list(executor.map(lambda key: self.flight.do(key, self.slow_translate), ['a', 'b', 'c']))
+        self.assertEqual(self.calls, 3)
+
+    def test_sequential_calls_not_coalesced(self):
+        """Завершенный вызов не отдает результат следующим"""
+        self.assertEqual(self.flight.do('key', lambda: 1), (1, False))
+        self.assertEqual(self.flight.do('key', lambda: 2), (2, False))
+
+    def test_error_shared(self):
+        """Ошибка первого вызова передается ожидающим"""
+        def failing():
+            time.sleep(0.1)
+            raise RuntimeError('сервис недоступен')
+
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            futures = [executor.submit(self.flight.do, 'key', failing) for _ in range(3)]
+        for future in futures:
+            with self.assertRaises(RuntimeError):
+                future.result()
+        self.assertEqual(self.flight.in_flight(), 0)
+
+    def test_waiter_timeout(self):
+        """Ожидающий вызов прерывается по timeout, первый завершается"""
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            leader = executor.submit(self.flight.do, 'key', lambda: self.slow_translate(delay=0.3))
+            time.sleep(0.05)
+            with self.assertRaises(TimeoutError):
+                self.flight.do('key', self.slow_translate, timeout=0.05)
+            self.assertEqual(leader.result(), ('перевод', False))
+        self.assertEqual(self.calls, 1)
+
+    def test_async_coalesced(self):
+        """Одновременные корутины с одним ключом выполняют перевод один раз"""
+        async def translate():
+            self.calls += 1
+            await asyncio.sleep(0.1)
+            return 'перевод'
+
+        async def main():
+            return await asyncio.gather(*(self.flight.do_async('key', translate) for _ in range(5)))
+
+        results = asyncio.run(main())
+        self.assertEqual(self.calls, 1)
+        self.assertEqual([shared for _, shared in results], [False, True, True, True, True])
+
+    def test_async_cancel_one_waiter(self):
+        """Отмена одного ожидающего не прерывает перевод для остальных"""
+        async def translate():
+            await asyncio.sleep(0.1)
+            return 'перевод'
+
+        async def main():
+            first = asyncio.ensure_future(self.flight.do_async('key', translate))
+            second = asyncio.ensure_future(self.flight.do_async('key', translate))
+            await asyncio.sleep(0.01)
+            first.cancel()
+            return await second
+
+        self.assertEqual(asyncio.run(main()), ('перевод', True))
+
+    def test_async_cancel_all_waiters(self):
+        """Перевод отменяется, когда отменены все ожидающие"""
+        started = []
+        finished = []
+
+        async def translate():
+            started.append(True)
+            await asyncio.sleep(0.2)
+            finished.append(True)
+
+        async def main():
+            with self.assertRaises(asyncio.TimeoutError):
+                await asyncio.wait_for(self.flight.do_async('key', translate), 0.05)
+            await asyncio.sleep(0.3)
+
+        asyncio.run(main())
+        self.assertEqual(started, [True])
+        self.assertEqual(finished, [])
+        self.assertEqual(self.flight.in_flight(), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Unit тесты для нормализации текста перед поиском в кеше
+"""
+
+import unicodedata
+import unittest
+
+from translatecore.text_normalization import normalize_text
+
+
+class TestTextNormalization(unittest.TestCase):
+    """Тесты для нормализации и восстановления оформления"""
+
+    def test_variants_share_key(self):
+        """Варианты пробелов и пунктуации дают один ключ кеша"""
+        variants = ['Hello world', ' Hello world ', 'Hello  world\n', 'Hello world!', 'Hello\tworld...']
+        self.assertEqual({normalize_text(text).key for text in variants}, {'Hello world'})
+
+    def test_unicode_forms_share_core(self):
+        """NFC и NFD формы одной строки совпадают"""
+        text = 'Ёлка и йод'
+        self.assertEqual(normalize_text(unicodedata.normalize('NFD', text)).core, text)
+
+    def test_restore_edges(self):
+        """Снятые пробелы и пунктуация возвращаются вокруг перевода"""
+        normalized = normalize_text('  Привет, мир!\n')
+        self.assertEqual(normalized.core, 'Привет, мир')
+        self.assertEqual(normalized.restore('Hello, world'), '  Hello, world!\n')
+
+    def test_brackets_and_quotes_kept(self):
+        """Скобки и кавычки по краям остаются в тексте для перевода"""
+        self.assertEqual(normalize_text('(1) Item').core, '(1) Item')
+        self.assertEqual(normalize_text(' «Привет» ').core, '«Привет»')
+        self.assertEqual(normalize_text('(Привет, мир!)').core, '(Привет, мир!)')
+
+    def test_placeholders_kept(self):
+        """Подчеркивания плейсхолдеров кода не снимаются"""
+        text = '__CODE_PLACEHOLDER_0__ текст __CODE_PLACEHOLDER_1__'
+        self.assertEqual(normalize_text(text).core, text)
+        self.assertEqual(normalize_text(f' {text}.').core, text)
+
+    def test_line_breaks_kept(self):
+        """Переводы строк в ключе не схлопываются"""
+        self.assertEqual(normalize_text('Первая  строка \n  вторая').key, 'Первая строка\nвторая')
+
+    def test_internal_whitespace_kept_in_core(self):
+        """Пробелы и отступы внутри текста остаются в тексте для перевода"""
+        self.assertEqual(normalize_text('line1\n\n  line2').core, 'line1\n\n  line2')
+        self.assertEqual(normalize_text(' a\t b ').core, 'a\t b')
+
+    def test_punctuation_only_untouched(self):
+        """Текст из одной пунктуации не меняется"""
+        self.assertEqual(normalize_text(' ... ').core, ' ... ')
+
+
+if __name__ == '__main__':
+    unittest.main()
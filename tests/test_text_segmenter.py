@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Unit тесты для разбиения длинных текстов
+"""
+
+import unittest
+
+from translatecore.text_segmenter import SegmentationConfig, split_text, join_segments
+
+
+def reassemble(segments):
+    return ''.join(part + separator for part, separator in segments)
+
+
+class TestTextSegmenter(unittest.TestCase):
+    """Тесты разбиения и обратной сборки"""
+
+    def test_short_text_not_split(self):
+        """Текст в пределах ограничения остается одной частью"""
+        self.assertEqual(split_text('Привет, мир.', 100), [('Привет, мир.', '')])
+
+    def test_round_trip(self):
+        """Части с разделителями восстанавливают исходный текст"""
+        text = "Первый абзац. Второе предложение!\n\nВторой абзац?\nСтрока  с  пробелами…  Конец"
+        for max_chars in (1, 5, 12, 20, 40, len(text)):
+            segments = split_text(text, max_chars)
+            self.assertEqual(reassemble(segments), text)
+            self.assertTrue(all(len(part) <= max_chars for part, _ in segments))
+
+    def test_paragraph_boundaries(self):
+        """Абзацы, укладывающиеся в ограничение, не режутся"""
+        text = "Абзац один. Еще.\n\nАбзац два. Еще.\n\nАбзац три."
+        segments = split_text(text, 20)
+        self.assertEqual([part for part, _ in segments], ["Абзац один. Еще.", "Абзац два. Еще.", "Абзац три."])
+        self.assertEqual(segments[0][1], '\n\n')
+
+    def test_sentence_boundaries(self):
+        """Длинный абзац делится по предложениям, соседние предложения объединяются"""
+        text = "Раз. Два. Три. Четыре."
+        segments = split_text(text, 10)
+        self.assertEqual([part for part, _ in segments], ["Раз. Два.", "Три.", "Четыре."])
+
+    def test_long_word(self):
+        """Слово длиннее ограничения режется по символам"""
+        segments = split_text('а' * 25, 10)
+        self.assertEqual([len(part) for part, _ in segments], [10, 10, 5])
+
+    def test_join_segments(self):
+        """Переведенные части собираются с исходными разделителями"""
+        segments = split_text("Раз.\n\nДва.", 5)
+        self.assertEqual(join_segments(['One.', 'Two.'], segments), "One.\n\nTwo.")
+
+    def test_invalid_arguments(self):
+        """Неверное ограничение и уровень кеширования отклоняются"""
+        with self.assertRaises(ValueError):
+            split_text('текст', 0)
+        with self.assertRaises(ValueError):
+            SegmentationConfig(cache_level='paragraphs')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Unit тесты для многоуровневого кеша переводов
+"""
+
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+from translatecore.cache_snapshot import compile_snapshot, CacheSnapshot
+from translatecore.cache_store import SQLiteCacheStore, make_cache_key, pack_value
+from translatecore.memory_cache import MemoryCacheConfig
+from translatecore.tiered_cache import TieredCache
+
+
+class TestTieredCache(unittest.TestCase):
+    """Тесты для уровней L1/L2 и статистики попаданий"""
+
+    def setUp(self):
+        self.test_dir = Path(tempfile.mkdtemp())
+        self.store = SQLiteCacheStore(str(self.test_dir / 'cache.db'))
+        self.key = make_cache_key('Привет', 'russian', 'english', 'enhanced')
+
+    def tearDown(self):
+        self.store.close()
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def test_set_writes_both_tiers_once(self):
+        """Запись попадает в L1 и один раз в L2 в упакованном виде"""
+        cache = TieredCache(self.store, compression='zlib')
+        cache.set(self.key, {'translated': 'Hello', 'service': 'google'})
+
+        self.assertEqual(cache.get(self.key)['translated'], 'Hello')
+        self.assertEqual(self.store.get(self.key), pack_value({'translated': 'Hello', 'service': 'google'}))
+        self.assertEqual(self.store.count(), 1)
+        stats = cache.get_stats()
+        self.assertEqual((stats['l1_hits'], stats['l2_hits'], stats['writes']), (1, 0, 1))
+
+    def test_l2_hit_promotes_to_l1(self):
+        """Запись из хранилища поднимается в память"""
+        self.store.set(self.key, pack_value({'translated': 'Hello'}))
+        cache = TieredCache(self.store)
+
+        self.assertEqual(cache.get(self.key)['translated'], 'Hello')
+        self.assertEqual(cache.get(self.key)['translated'], 'Hello')
+        self.assertIsNone(cache.get(make_cache_key('Пока', 'russian', 'english', 'enhanced')))
+
+        stats = cache.get_stats()
+        self.assertEqual((stats['l1_hits'], stats['l2_hits'], stats['misses']), (1, 1, 1))
+        self.assertEqual(stats['l1']['entries'], 1)
+
+    def test_snapshot_checked_before_store(self):
+        """Снапшот проверяется раньше хранилища"""
+        path = str(self.test_dir / 'cache.snapshot')
+        compile_snapshot([(self.key, pack_value({'translated': 'Hi'}))], path)
+        with CacheSnapshot(path) as snapshot:
+            cache = TieredCache(self.store, snapshot=snapshot)
+            self.assertEqual(cache.get(self.key)['translated'], 'Hi')
+            self.assertEqual(cache.get_stats()['snapshot_hits'], 1)
+
+    def test_snapshot_not_shadowing_new_writes(self):
+        """Запись, обновленная после сборки снапшота, читается из L2 после вытеснения из L1"""
+        path = str(self.test_dir / 'cache.snapshot')
+        other = make_cache_key('Пока', 'russian', 'english', 'enhanced')
+        compile_snapshot([(self.key, pack_value({'translated': 'Hi'})),
+                          (other, pack_value({'translated': 'Bye'}))], path)
+        with CacheSnapshot(path) as snapshot:
+            cache = TieredCache(self.store, MemoryCacheConfig(max_entries=1), snapshot=snapshot)
+            cache.set(self.key, {'translated': 'Hello'})
+            cache.get(other)
+
+            self.assertEqual(cache.get(self.key)['translated'], 'Hello')
+            self.assertEqual(cache.get_stats()['l2_hits'], 1)
+
+            cache.clear('enhanced|')
+            self.assertIsNone(cache.get(other))
+
+    def test_l1_eviction_falls_back_to_l2(self):
+        """Вытесненная из памяти запись читается из хранилища"""
+        cache = TieredCache(self.store, MemoryCacheConfig(max_entries=1))
+        other = make_cache_key('Пока', 'russian', 'english', 'enhanced')
+        cache.set(self.key, {'translated': 'Hello'})
+        cache.set(other, {'translated': 'Bye'})
+
+        self.assertEqual(cache.get(self.key)['translated'], 'Hello')
+        self.assertEqual(cache.get_stats()['l2_hits'], 1)
+
+    def test_clear_by_prefix(self):
+        """Очистка удаляет записи префикса из хранилища и сбрасывает память"""
+        cache = TieredCache(self.store)
+        cache.set(self.key, {'translated': 'Hello'})
+        cache.set(make_cache_key('Привет', 'russian', 'english', 'offline'), {'translated': 'Hello'})
+        cache.clear('enhanced|')
+
+        self.assertIsNone(cache.get(self.key))
+        self.assertEqual(cache.count(), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Unit тесты для нечеткой памяти переводов
+"""
+
+import unittest
+
+from translatecore.translation_memory import TranslationMemory, TranslationMemoryConfig
+
+
+class TestTranslationMemory(unittest.TestCase):
+    """Тесты для поиска похожих сегментов"""
+
+    def setUp(self):
+        self.memory = TranslationMemory(TranslationMemoryConfig(threshold=0.7))
+        self.memory.add('Сохранить изменения в файле', 'Save changes to file', 'google')
+        self.memory.add('Удалено 5 файлов из папки', 'Deleted 5 files from folder', 'deepl')
+        self.memory.add('Открыть настройки пользователя', 'Open user settings', 'google')
+        for i in range(200):
+            self.memory.add(f'Служебная строка номер {i} для заполнения', f'Filler {i}')
+
+    def test_near_duplicate_found(self):
+        """Лишнее слово и другая пунктуация не мешают найти сегмент"""
+        match = self.memory.lookup('Сохранить все изменения в файле!')
+        self.assertIsNotNone(match)
+        self.assertEqual(match.translated, 'Save changes to file')
+        self.assertEqual(match.service, 'google')
+        self.assertLess(match.score, 1.0)
+
+    def test_changed_number_uses_skeleton(self):
+        """Сегмент с другим числом находится, но сходство ниже 1"""
+        match = self.memory.lookup('удалено 12 файлов из папки.')
+        self.assertEqual(match.source, 'Удалено 5 файлов из папки')
+        self.assertLess(match.score, 1.0)
+        self.assertFalse(match.same_numbers)
+        self.assertTrue(self.memory.lookup('Удалено 5 файлов из папки!').same_numbers)
+
+    def test_threshold(self):
+        """Непохожий текст не возвращается, порог можно переопределить"""
+        self.assertIsNone(self.memory.lookup('Совершенно другой текст о погоде'))
+        self.assertIsNone(self.memory.lookup('Открыть профиль пользователя'))
+        self.assertIsNotNone(self.memory.lookup('Открыть профиль пользователя', threshold=0.5))
+
+    def test_zero_threshold_not_replaced(self):
+        """Явный порог 0 не подменяется порогом из настроек"""
+        self.assertIsNotNone(self.memory.lookup('Совершенно другой текст о файлах', threshold=0.0))
+
+    def test_update_and_stats(self):
+        """Повторное добавление обновляет перевод, статистика считает попадания"""
+        self.memory.add('Открыть настройки пользователя', 'Open the user settings', 'deepl')
+        self.assertEqual(len(self.memory), 203)
+        self.assertEqual(self.memory.lookup('Открыть настройки пользователя').translated,
+                         'Open the user settings')
+        stats = self.memory.get_stats()
+        self.assertEqual(stats['lookups'], 1)
+        self.assertEqual(stats['hits'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()